@@ -4,11 +4,7 @@ This module contains the main API router that includes all endpoint routers.
 """
 
 from fastapi import APIRouter
-try:
-    from app.api.endpoints import students, questions, answers, ai, auth
-except ImportError:
-    # Fallback for direct execution
-    from .endpoints import students, questions, answers, ai, auth
+from app.api.endpoints import students, questions, answers, ai, auth, changes
 
 # Create main API router
 api_router = APIRouter()
@@ -44,3 +40,8 @@ api_router.include_router(
     tags=["authentication"]
 )
 
+api_router.include_router(
+    changes.router,
+    prefix="/changes",
+    tags=["changes"]
+)
@@ -0,0 +1,53 @@
+"""
+Response caching for the teacher read endpoints.
+This module declares which routes are cached, their version keys, and the writes that invalidate them.
+"""
+
+from typing import Any
+
+from ..utils.response_cache import ResponseCache, CacheRule
+from ..utils.versions import question_list_version, question_answers_version
+
+# Invalidation tags
+QUESTION_LIST_TAG = "questions"
+
+
+def question_answers_tag(question_id: Any) -> str:
+    """Invalidation tag of a question's answer view."""
+    return f"answers:{question_id}"
+
+
+# Cached routes; the versions are those behind the ETags of the same endpoints
+CACHE_RULES = [
+    CacheRule(
+        r"/api/v1/questions/",
+        version=lambda params: question_list_version.value,
+        tags=lambda params: [QUESTION_LIST_TAG]
+    ),
+    CacheRule(
+        r"/api/v1/questions/(?P<question_id>\d+)/answers",
+        version=lambda params: question_answers_version.value(int(params["question_id"])),
+        tags=lambda params: [question_answers_tag(int(params["question_id"]))]
+    ),
+]
+
+
+class CacheInvalidator:
+    """Drops exactly the cached responses a write makes stale; its methods are domain event handlers."""
+
+    def __init__(self, cache: ResponseCache):
+        """
+        Initialize the invalidator.
+
+        Args:
+            cache: Response cache serving the rules above
+        """
+        self.cache = cache
+
+    def on_question_created(self, **payload: Any) -> None:
+        """Drop the cached question list."""
+        self.cache.invalidate(QUESTION_LIST_TAG)
+
+    def on_question_changed(self, question_id: int, **payload: Any) -> None:
+        """Drop the cached question list and the question's answer view."""
+        self.cache.invalidate(QUESTION_LIST_TAG, question_answers_tag(question_id))
@@ -0,0 +1,246 @@
+"""
+Application-scoped dependencies.
+This module builds the repositories and services once per process and exposes them to the endpoints.
+"""
+
+from typing import Callable, Dict
+
+from ..config.ai_config import get_ai_config
+from ..config.http_config import get_http_config
+from ..config.sync_config import get_sync_config
+from ..database.repositories.answer_repository import AnswerRepository
+from ..database.repositories.change_repository import ChangeRepository
+from ..database.repositories.question_repository import QuestionRepository
+from ..services.ai_service import AISmartSearchService, AISummarizationService, create_upstream_guard
+from ..services.answer_feed_service import AnswerFeedService
+from ..services.answer_service import AnswerService
+from ..services.batch_summary_service import BatchSummaryService
+from ..services.change_service import ChangeService
+from ..services.question_search_service import QuestionSearchService
+from ..services.question_service import QuestionService
+from ..services.question_status_feed_service import QuestionStatusFeedService
+from ..services.question_summary_service import QuestionSummaryService
+from ..services.student_service import StudentService
+from ..services.summary_job_service import SummaryJobService
+from ..utils.broker import EventBroker
+from ..utils.events import EventBus, events, QUESTION_CREATED, QUESTION_CLOSED, QUESTION_DELETED, ANSWER_SUBMITTED
+from ..utils.resilience import UpstreamGuard
+from ..utils.response_cache import ResponseCache
+from .caching import CacheInvalidator
+
+
+class ServiceContainer:
+    """One shared object graph for the whole process.
+
+    Repositories and services hold no per-request state (the database session
+    is passed to every call), so a single instance of each serves all requests.
+    The container also holds the process-wide caches and brokers, so there is
+    one place to find, inspect or reset them.
+    """
+
+    def __init__(self, student_service: StudentService = None):
+        """
+        Build the repositories and services.
+
+        Args:
+            student_service: Student service instance (optional, creates one reading the default roster)
+        """
+        # Repositories
+        self.question_repo = QuestionRepository()
+        self.answer_repo = AnswerRepository()
+        self.change_repo = ChangeRepository()
+
+        # Services
+        self.student_service = student_service or StudentService()
+        self.question_service = QuestionService(self.question_repo, self.answer_repo)
+        self.question_search_service = QuestionSearchService(self.question_repo)
+        self.answer_service = AnswerService(self.answer_repo, self.question_service, self.student_service)
+        self.change_service = ChangeService(
+            self.change_repo,
+            retention=get_sync_config().CHANGES_RETENTION,
+            max_age_hours=get_sync_config().CHANGES_MAX_AGE_HOURS,
+            compact_interval=get_sync_config().CHANGES_COMPACT_INTERVAL
+        )
+
+        # AI services, with their result caches, shared upstream guard and worker pools
+        self.upstream_guard = create_upstream_guard(get_ai_config())
+        self.summarization_service = AISummarizationService(upstream=self.upstream_guard)
+        self.smart_search_service = AISmartSearchService(upstream=self.upstream_guard)
+        self.summary_job_service = SummaryJobService(
+            self.summarization_service,
+            max_workers=get_ai_config().AI_JOB_WORKERS,
+            max_pending=get_ai_config().AI_JOB_MAX_PENDING
+        )
+        self.question_summary_service = QuestionSummaryService(
+            self.summarization_service,
+            question_repo=self.question_repo,
+            answer_repo=self.answer_repo,
+            student_service=self.student_service,
+            job_service=self.summary_job_service
+        )
+        self.batch_summary_service = BatchSummaryService(
+            self.question_summary_service,
+            question_repo=self.question_repo,
+            max_concurrency=get_ai_config().AI_BATCH_CONCURRENCY,
+            max_questions=get_ai_config().AI_BATCH_MAX_QUESTIONS
+        )
+
+        # Shared caches and brokers
+        http_config = get_http_config()
+        self.response_cache = ResponseCache(
+            max_bytes=http_config.RESPONSE_CACHE_MAX_BYTES,
+            max_entry_bytes=http_config.RESPONSE_CACHE_MAX_ENTRY_BYTES
+        )
+        self.cache_invalidator = CacheInvalidator(self.response_cache)
+        self.answer_feed = AnswerFeedService(
+            EventBroker(max_queue=http_config.STREAM_QUEUE_SIZE, history_size=http_config.STREAM_HISTORY_SIZE),
+            answer_repo=self.answer_repo
+        )
+        # A question only ever sends one event to its students: tiny queues and history
+        self.question_status_feed = QuestionStatusFeedService(
+            EventBroker(max_queue=8, history_size=4, max_topics=http_config.STREAM_MAX_CHANNELS)
+        )
+
+    def subscribe(self, bus: EventBus) -> None:
+        """
+        Register the services' handlers for the domain events.
+
+        Args:
+            bus: Event bus the services publish to
+        """
+        # Writes drop exactly the cached responses they make stale
+        bus.subscribe(QUESTION_CREATED, self.cache_invalidator.on_question_created)
+        for event in (QUESTION_CLOSED, QUESTION_DELETED, ANSWER_SUBMITTED):
+            bus.subscribe(event, self.cache_invalidator.on_question_changed)
+
+        # Live feeds for teachers and waiting students
+        bus.subscribe(ANSWER_SUBMITTED, self.answer_feed.on_answer_submitted)
+        bus.subscribe(QUESTION_CLOSED, self.answer_feed.on_question_closed)
+        bus.subscribe(QUESTION_DELETED, self.answer_feed.on_question_deleted)
+        bus.subscribe(QUESTION_CLOSED, self.question_status_feed.on_question_closed)
+        bus.subscribe(QUESTION_DELETED, self.question_status_feed.on_question_deleted)
+
+        # The write counter driving change log compaction counts every write
+        for event in (QUESTION_CREATED, QUESTION_CLOSED, QUESTION_DELETED, ANSWER_SUBMITTED):
+            bus.subscribe(event, self.change_service.on_write)
+
+        # Precompute the default summary as soon as a question's answers are frozen
+        if get_ai_config().AI_PRECOMPUTE_ON_CLOSE:
+            bus.subscribe(QUESTION_CLOSED, self.question_summary_service.precompute_summary)
+        # Stored summaries and summary jobs go with their question
+        bus.subscribe(QUESTION_DELETED, self.question_summary_service.forget_question)
+
+    def warm_up_tasks(self, session_factory: Callable) -> Dict[str, Callable[[], int]]:
+        """
+        Get the preloads that fill the caches the first requests after a start would miss.
+
+        Args:
+            session_factory: Creates a database session; each task opens its own, so they can run in parallel
+
+        Returns:
+            Task callables by name, each returning the number of items loaded
+        """
+        def with_session(preload: Callable) -> Callable[[], int]:
+            def task() -> int:
+                db = session_factory()
+                try:
+                    return preload(db)
+                finally:
+                    db.close()
+            return task
+
+        return {
+            "roster": self.student_service.preload_roster,
+            "open_questions": with_session(self.question_service.preload_open_questions),
+            "search_index": with_session(self.question_search_service.preload),
+        }
+
+    def reset(self) -> None:
+        """Drop cached responses and data, end every stream and close the upstream circuit, e.g. when the database is replaced."""
+        self.response_cache.clear()
+        self.question_service.clear_cache()
+        self.question_search_service.clear_cache()
+        self.summarization_service.clear_cache()
+        self.smart_search_service.clear_cache()
+        self.answer_feed.broker.reset()
+        self.question_status_feed.broker.reset()
+        self.upstream_guard.reset()
+
+
+container = ServiceContainer()
+container.subscribe(events)
+
+
+def get_container() -> ServiceContainer:
+    """Get the application's service container."""
+    return container
+
+
+def get_question_service() -> QuestionService:
+    """Get question service instance."""
+    return container.question_service
+
+
+def get_answer_service() -> AnswerService:
+    """Get answer service instance."""
+    return container.answer_service
+
+
+def get_student_service() -> StudentService:
+    """Get student service instance."""
+    return container.student_service
+
+
+def get_change_service() -> ChangeService:
+    """Get change service instance."""
+    return container.change_service
+
+
+def get_question_search_service() -> QuestionSearchService:
+    """Get question search service instance."""
+    return container.question_search_service
+
+
+def get_summarization_service() -> AISummarizationService:
+    """Get AI summarization service instance."""
+    return container.summarization_service
+
+
+def get_smart_search_service() -> AISmartSearchService:
+    """Get AI smart search service instance."""
+    return container.smart_search_service
+
+
+def get_summary_job_service() -> SummaryJobService:
+    """Get summary job service instance."""
+    return container.summary_job_service
+
+
+def get_question_summary_service() -> QuestionSummaryService:
+    """Get question summary service instance."""
+    return container.question_summary_service
+
+
+def get_batch_summary_service() -> BatchSummaryService:
+    """Get batch summary service instance."""
+    return container.batch_summary_service
+
+
+def get_upstream_guard() -> UpstreamGuard:
+    """Get the resilience guard shared by the AI services."""
+    return container.upstream_guard
+
+
+def get_response_cache() -> ResponseCache:
+    """Get response cache instance."""
+    return container.response_cache
+
+
+def get_answer_feed_service() -> AnswerFeedService:
+    """Get answer feed service instance."""
+    return container.answer_feed
+
+
+def get_question_status_feed_service() -> QuestionStatusFeedService:
+    """Get question status feed service instance."""
+    return container.question_status_feed
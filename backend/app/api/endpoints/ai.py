@@ -1,17 +1,45 @@
-from fastapi import APIRouter, HTTPException
-from ...models.ai_models import SummarizationRequest, SummarizationResponse, SmartSearchRequest, SmartSearchResponse
+import json
+import threading
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from ...config.ai_config import get_ai_config
+from ...database.config import get_db
+from ...models.ai_models import (
+    SummarizationRequest, SummarizationResponse, SmartSearchRequest, SmartSearchResponse,
+    AIStatsResponse, SummaryJobResponse, QuestionSummarizationRequest, QuestionSummaryResponse,
+    QuestionSearchResponse, BatchSummarizationRequest, BatchSmartSearchRequest, BatchSmartSearchResponse,
+    BatchSmartSearchResult
+)
 from ...services.ai_service import AISummarizationService, AISmartSearchService
-from ...utils.error_handler import handle_unexpected_error
+from ...services.summary_job_service import SummaryJobService
+from ...services.question_summary_service import QuestionSummaryService
+from ...services.batch_summary_service import BatchSummaryService
+from ...services.question_search_service import QuestionSearchService
+from ...utils.error_handler import handle_unexpected_error, handle_too_many_requests, handle_service_unavailable
+from ...utils.resilience import BulkheadFullError, CircuitOpenError
+from ...utils.sse import format_sse, format_sse_comment, SSE_HEADERS
+from ..dependencies import (
+    get_batch_summary_service, get_question_search_service, get_question_summary_service,
+    get_smart_search_service, get_summarization_service, get_summary_job_service
+)
 
 router = APIRouter()
-summarization_service = AISummarizationService()
-smart_search_service = AISmartSearchService()
 
 @router.post("/summarize", response_model=SummarizationResponse)
-async def summarize_answers(request: SummarizationRequest) -> SummarizationResponse:
+async def summarize_answers(
+    request: SummarizationRequest,
+    db: Session = Depends(get_db),
+    service: AISummarizationService = Depends(get_summarization_service)
+) -> SummarizationResponse:
     """
     Generate an AI-powered summary of student answers.
     
+    With incremental=true, the stored summary of the question is updated with only
+    the answers added or changed since it was made.
+    
     Args:
         request (SummarizationRequest): The request containing question context and student answers
         
@@ -22,13 +50,256 @@ async def summarize_answers(request: SummarizationRequest) -> SummarizationRespo
         HTTPException: If summarization fails
     """
     try:
-        summary = summarization_service.generate_summary(request)
+        # Run in the threadpool so concurrent identical requests can be coalesced
+        if request.incremental:
+            summary = await run_in_threadpool(service.generate_incremental_summary, db, request)
+        else:
+            summary = await run_in_threadpool(service.generate_summary, request)
         return SummarizationResponse(summary=summary)
+    except BulkheadFullError as e:
+        raise handle_too_many_requests(str(e))
+    except CircuitOpenError as e:
+        raise handle_service_unavailable(str(e))
+    except Exception as e:
+        raise handle_unexpected_error("generate summary", e)
+
+@router.post("/summarize/stream")
+async def summarize_answers_stream(
+    request: SummarizationRequest,
+    http_request: Request,
+    service: AISummarizationService = Depends(get_summarization_service)
+) -> StreamingResponse:
+    """
+    Stream an AI-powered summary of student answers as Server-Sent Events.
+    
+    Emits a 'delta' event per generated chunk, then a 'done' event with the full summary,
+    or an 'error' event if generation fails mid-stream. The upstream generation is
+    cancelled when the client disconnects.
+    
+    Args:
+        request (SummarizationRequest): The request containing question context and student answers
+        http_request (Request): The incoming HTTP request, used to detect client disconnects
+        
+    Returns:
+        StreamingResponse: text/event-stream of summary chunks
+        
+    Raises:
+        HTTPException: If the request is invalid (500), no upstream slot frees up (429)
+            or the provider is unavailable (503)
+    """
+    cancel_event = threading.Event()
+    try:
+        # In the threadpool: admission may wait for an upstream slot
+        chunks = await run_in_threadpool(service.stream_summary, request, cancel_event)
+    except BulkheadFullError as e:
+        raise handle_too_many_requests(str(e))
+    except CircuitOpenError as e:
+        raise handle_service_unavailable(str(e))
     except Exception as e:
         raise handle_unexpected_error("generate summary", e)
+    
+    async def event_stream():
+        parts = []
+        try:
+            # Flush headers immediately so the client sees the stream open
+            yield format_sse_comment("stream-open")
+            async for delta in iterate_in_threadpool(chunks):
+                if await http_request.is_disconnected():
+                    break
+                parts.append(delta)
+                yield format_sse({"delta": delta}, event="delta")
+            else:
+                yield format_sse({"summary": "".join(parts).strip()}, event="done")
+        except ValueError as e:
+            yield format_sse({"detail": f"Failed to generate summary: {str(e)}"}, event="error")
+        finally:
+            # Stops the upstream read loop and closes its connection, giving back its slot
+            cancel_event.set()
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+        
+@router.post("/questions/{question_id}/summarize", response_model=QuestionSummaryResponse)
+async def summarize_question(
+    request: QuestionSummarizationRequest,
+    question_id: int = Path(..., description="ID of the question to summarize"),
+    db: Session = Depends(get_db),
+    service: QuestionSummaryService = Depends(get_question_summary_service)
+) -> QuestionSummaryResponse:
+    """
+    Generate an AI-powered summary of a question's answers, loaded server-side.
+    
+    The request body carries only the instructions; the answers are read from the database.
+    
+    Args:
+        request (QuestionSummarizationRequest): Summary instructions and incremental flag
+        question_id: ID of the question to summarize
+        
+    Returns:
+        QuestionSummaryResponse: The generated summary and the number of answers it covers
+        
+    Raises:
+        HTTPException: If the question is not found, has no answers, or summarization fails
+    """
+    try:
+        result = await run_in_threadpool(
+            service.summarize_question, db, question_id, request.summary_instructions, request.incremental
+        )
+        return QuestionSummaryResponse(**result)
+    except HTTPException as e:
+        raise e
+    except BulkheadFullError as e:
+        raise handle_too_many_requests(str(e))
+    except CircuitOpenError as e:
+        raise handle_service_unavailable(str(e))
+    except Exception as e:
+        raise handle_unexpected_error("generate summary", e)
+
+@router.get("/questions/{question_id}/summary", response_model=QuestionSummaryResponse)
+async def get_question_summary(
+    question_id: int = Path(..., description="ID of the question to summarize"),
+    summary_instructions: Optional[str] = Query(None, description="Instructions for how to summarize (defaults to the configured instructions)"),
+    db: Session = Depends(get_db),
+    service: QuestionSummaryService = Depends(get_question_summary_service)
+) -> QuestionSummaryResponse:
+    """
+    Get the stored summary of a question's answers.
+    
+    Summaries precomputed when the question closed are served without calling the
+    AI provider. A summary is only regenerated when answers changed since it was
+    stored (the question was reopened) or for instructions not summarized before.
+    
+    Args:
+        question_id: ID of the question to summarize
+        summary_instructions: Optional instructions; the default instructions match the precomputed summary
+        
+    Returns:
+        QuestionSummaryResponse: The summary and the number of answers it covers
+        
+    Raises:
+        HTTPException: If the question is not found, has no answers, or summarization fails
+    """
+    instructions = summary_instructions or get_ai_config().AI_DEFAULT_SUMMARY_INSTRUCTIONS
+    try:
+        result = await run_in_threadpool(service.summarize_question, db, question_id, instructions, True)
+        return QuestionSummaryResponse(**result)
+    except HTTPException as e:
+        raise e
+    except BulkheadFullError as e:
+        raise handle_too_many_requests(str(e))
+    except CircuitOpenError as e:
+        raise handle_service_unavailable(str(e))
+    except Exception as e:
+        raise handle_unexpected_error("get summary", e)
+
+@router.post("/summarize/batch")
+async def summarize_batch(
+    request: BatchSummarizationRequest,
+    http_request: Request,
+    db: Session = Depends(get_db),
+    service: BatchSummaryService = Depends(get_batch_summary_service)
+) -> StreamingResponse:
+    """
+    Summarize many questions' stored answers, streaming each result as NDJSON when it completes.
+    
+    Questions are summarized on a bounded pool, each through the incremental path, so
+    stored summaries of unchanged answers are reused without calling the AI provider.
+    Every line is a JSON object: one per question with status 'completed' (summary,
+    answer_count) or 'failed' (status_code, error), then a final line with status 'done'
+    and the totals. Questions not yet started are cancelled when the client disconnects.
+    
+    Args:
+        request (BatchSummarizationRequest): Question IDs or status filter, instructions and concurrency
+        http_request (Request): The incoming HTTP request, used to detect client disconnects
+        
+    Returns:
+        StreamingResponse: application/x-ndjson of per-question results
+        
+    Raises:
+        HTTPException: If the status filter is invalid or the batch is too large
+    """
+    instructions = request.summary_instructions or get_ai_config().AI_DEFAULT_SUMMARY_INSTRUCTIONS
+    if not instructions.strip():
+        raise HTTPException(status_code=400, detail="Summary instructions cannot be empty")
+    try:
+        question_ids = service.resolve_question_ids(db, request.question_ids, request.status)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise handle_unexpected_error("resolve batch questions", e)
+    
+    async def result_stream():
+        counts = {service.COMPLETED: 0, service.FAILED: 0}
+        results = service.summarize_many(question_ids, instructions, request.max_concurrency)
+        try:
+            async for result in results:
+                counts[result["status"]] += 1
+                yield json.dumps(result) + "\n"
+                if await http_request.is_disconnected():
+                    return
+            yield json.dumps({"status": "done", "total": len(question_ids), **counts}) + "\n"
+        finally:
+            # Cancels the questions not started yet
+            await results.aclose()
+    
+    return StreamingResponse(result_stream(), media_type="application/x-ndjson")
+
+@router.post("/summarize/jobs", response_model=SummaryJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_summary_job(
+    request: SummarizationRequest,
+    db: Session = Depends(get_db),
+    service: SummaryJobService = Depends(get_summary_job_service)
+) -> SummaryJobResponse:
+    """
+    Queue a background summarization job and return its ID immediately.
+    
+    An identical request that is already queued, running or completed returns the existing job.
+    
+    Args:
+        request (SummarizationRequest): The request containing question context and student answers
+        
+    Returns:
+        SummaryJobResponse: The queued (or existing) job
+        
+    Raises:
+        HTTPException: If the job queue is full
+    """
+    try:
+        return SummaryJobResponse(**service.submit(db, request))
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise handle_unexpected_error("queue summary job", e)
+
+@router.get("/summarize/jobs/{job_id}", response_model=SummaryJobResponse)
+async def get_summary_job(
+    job_id: str = Path(..., description="ID of the summary job"),
+    db: Session = Depends(get_db),
+    service: SummaryJobService = Depends(get_summary_job_service)
+) -> SummaryJobResponse:
+    """
+    Get the status and result of a background summarization job.
+    
+    Args:
+        job_id: ID of the summary job
+        
+    Returns:
+        SummaryJobResponse: The job status, and the summary once completed
+        
+    Raises:
+        HTTPException: If the job is not found
+    """
+    try:
+        return SummaryJobResponse(**service.get_job(db, job_id))
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise handle_unexpected_error("retrieve summary job", e)
         
 @router.post("/smart-search", response_model=SmartSearchResponse)
-async def smart_search(request: SmartSearchRequest) -> SmartSearchResponse:
+async def smart_search(
+    request: SmartSearchRequest,
+    service: AISmartSearchService = Depends(get_smart_search_service)
+) -> SmartSearchResponse:
     """
     Perform a semantic search to find questions matching a natural language query.
     
@@ -41,8 +312,105 @@ async def smart_search(request: SmartSearchRequest) -> SmartSearchResponse:
     Raises:
         HTTPException: If the search fails
     """
+    # Cache hits are answered on the event loop, without a threadpool hop
+    cached = service.get_cached_results(request)
+    if cached is not None:
+        return SmartSearchResponse(matching_question_ids=cached)
     try:
-        matching_ids = smart_search_service.find_relevant_questions(request)
+        matching_ids = await run_in_threadpool(service.find_relevant_questions, request, False)
         return SmartSearchResponse(matching_question_ids=matching_ids)
+    except BulkheadFullError as e:
+        raise handle_too_many_requests(str(e))
+    except CircuitOpenError as e:
+        raise handle_service_unavailable(str(e))
+    except Exception as e:
+        raise handle_unexpected_error("perform smart search", e)
+
+@router.post("/smart-search/batch", response_model=BatchSmartSearchResponse)
+async def smart_search_batch(
+    request: BatchSmartSearchRequest,
+    service: AISmartSearchService = Depends(get_smart_search_service)
+) -> BatchSmartSearchResponse:
+    """
+    Find the questions matching each of several queries against one question set.
+    
+    All queries are answered together: one combined prompt for the queries not already
+    cached, or one vectorized pass over the TF-IDF index with the local provider.
+    
+    Args:
+        request (BatchSmartSearchRequest): The queries and the questions to search through
+        
+    Returns:
+        BatchSmartSearchResponse: The matching question IDs of every query, in request order
+        
+    Raises:
+        HTTPException: If the search fails
+    """
+    try:
+        matches = await run_in_threadpool(service.find_relevant_questions_batch, request)
+        return BatchSmartSearchResponse(results=[
+            BatchSmartSearchResult(query=query, matching_question_ids=ids)
+            for query, ids in zip(request.queries, matches)
+        ])
+    except BulkheadFullError as e:
+        raise handle_too_many_requests(str(e))
+    except CircuitOpenError as e:
+        raise handle_service_unavailable(str(e))
     except Exception as e:
         raise handle_unexpected_error("perform smart search", e)
+
+@router.get("/search", response_model=QuestionSearchResponse)
+async def search_questions(
+    q: str = Query(..., min_length=1, description="Natural language search query"),
+    status_filter: Optional[str] = Query(
+        None,
+        description="Filter questions by status (open, closed, or absent for all)",
+        alias="status"
+    ),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of results"),
+    db: Session = Depends(get_db),
+    service: QuestionSearchService = Depends(get_question_search_service)
+) -> QuestionSearchResponse:
+    """
+    Search the stored questions with a query only; the question bank is resolved server-side.
+    
+    Args:
+        q: Natural language search query
+        status_filter: Optional filter for question status (open, closed, or absent for all)
+        limit: Maximum number of results
+        
+    Returns:
+        QuestionSearchResponse: Ranked question IDs with scores
+    """
+    try:
+        is_closed = None
+        if status_filter == "open":
+            is_closed = False
+        elif status_filter == "closed":
+            is_closed = True
+        
+        results = service.search(db, q, is_closed, limit)
+        return QuestionSearchResponse(
+            query=q,
+            results=results,
+            matching_question_ids=[result["id"] for result in results]
+        )
+    except Exception as e:
+        raise handle_unexpected_error("search questions", e)
+
+@router.get("/stats", response_model=AIStatsResponse)
+async def get_ai_stats(
+    summarization: AISummarizationService = Depends(get_summarization_service),
+    smart_search: AISmartSearchService = Depends(get_smart_search_service)
+) -> AIStatsResponse:
+    """
+    Get prompt token counters for the AI services.
+    
+    Returns:
+        AIStatsResponse: Request counts, prompt tokens, recent usage and upstream health
+    """
+    return AIStatsResponse(
+        summarization=summarization.get_stats(),
+        smart_search=smart_search.get_stats(),
+        upstream=summarization.upstream.stats()
+    )
@@ -3,48 +3,28 @@ Answers API endpoints.
 This module handles all answer-related API operations.
 """
 
+import asyncio
 from typing import Dict, Any, Optional
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status, Body
+from fastapi import APIRouter, Depends, HTTPException, Header, Path, Query, status, Body
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 
-try:
-    from app.database.config import get_db
-    from app.services.answer_service import AnswerService
-    from app.services.question_service import QuestionService
-    from app.services.student_service import StudentService
-    from app.database.repositories.answer_repository import AnswerRepository
-    from app.database.repositories.question_repository import QuestionRepository
-    from app.utils.error_handler import handle_not_found_exception, handle_unexpected_error
-except ImportError:
-    # Fallback for direct execution
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-    from app.database.config import get_db
-    from app.services.answer_service import AnswerService
-    from app.services.question_service import QuestionService
-    from app.services.student_service import StudentService
-    from app.database.repositories.answer_repository import AnswerRepository
-    from app.database.repositories.question_repository import QuestionRepository
-    from app.utils.error_handler import handle_not_found_exception, handle_unexpected_error
+from app.database.config import get_db
+from app.services.answer_service import AnswerService
+from app.services.question_service import QuestionService
+from app.services.student_service import StudentService
+from app.api.dependencies import (
+    get_answer_service, get_question_service, get_question_status_feed_service, get_student_service
+)
+from app.utils.error_handler import handle_not_found_exception, handle_unexpected_error
+from app.utils.sse import IDLE_SSE_HEADERS, format_sse, format_sse_comment
+from app.services.question_status_feed_service import QuestionStatusFeedService, QUESTION_CLOSED_EVENT, TERMINAL_EVENTS
+from app.config.http_config import get_http_config
 
 # Create router for answers endpoints
 router = APIRouter()
 
-# Dependency to get services
-def get_answer_service() -> AnswerService:
-    """Get answer service instance."""
-    return AnswerService(AnswerRepository(), get_question_service())
-
-def get_question_service() -> QuestionService:
-    """Get question service instance."""
-    return QuestionService(QuestionRepository())
-
-def get_student_service() -> StudentService:
-    """Get student service instance."""
-    return StudentService()
-
 # Request body models
 class QuestionAccess(BaseModel):
     student_id: str = Field(..., description="Student ID")
@@ -106,6 +86,72 @@ async def get_question_by_code(
         # Handle unexpected errors
         raise handle_unexpected_error("retrieve question", e)
 
+@router.get("/question/{access_code}/events")
+async def stream_question_status(
+    access_code: str = Path(..., description="Question access code"),
+    last_event_id: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    question_service: QuestionService = Depends(get_question_service),
+    feed: QuestionStatusFeedService = Depends(get_question_status_feed_service)
+) -> StreamingResponse:
+    """
+    Stream a question's status to waiting students as Server-Sent Events.
+    
+    The stream opens with a 'ready' event and stays idle, apart from keep-alive
+    comments, until the question closes or is deleted; it then sends 'question.closed'
+    or 'question.deleted' and ends. A question that is already closed gets its
+    'question.closed' event at once. Streams hold no database connection and are
+    sent uncompressed, so thousands of idle students cost little on one worker.
+    
+    Args:
+        access_code: Question access code (from URL path)
+        last_event_id: Event ID sent by a reconnecting EventSource
+        
+    Returns:
+        StreamingResponse: text/event-stream of status events
+        
+    Raises:
+        HTTPException: If question not found
+    """
+    cursor = int(last_event_id) if last_event_id is not None and last_event_id.strip().isdigit() else None
+    # Subscribe before reading the status, so a close in between is still delivered
+    subscription = feed.subscribe(access_code, cursor)
+    try:
+        question = question_service.get_question_by_code(db, access_code)
+    except Exception:
+        subscription.close()
+        raise
+    finally:
+        # The stream never touches the database; release the connection instead of holding it open
+        db.close()
+    if not question:
+        subscription.close()
+        raise handle_not_found_exception("Question", access_code)
+    keepalive = get_http_config().STREAM_KEEPALIVE_SECONDS
+    
+    async def event_stream():
+        try:
+            status_data = {"access_code": access_code, "question_id": question.get("id")}
+            if question.get("is_closed"):
+                yield format_sse(status_data, event=QUESTION_CLOSED_EVENT, event_id=str(subscription.cursor))
+                return
+            yield format_sse({**status_data, "is_closed": False}, event="ready", event_id=str(subscription.cursor))
+            while True:
+                try:
+                    message = await subscription.get(timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield format_sse_comment("keep-alive")
+                    continue
+                if message is None:
+                    break
+                yield format_sse(message.data, event=message.event, event_id=str(message.seq))
+                if message.event in TERMINAL_EVENTS:
+                    break
+        finally:
+            subscription.close()
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=IDLE_SSE_HEADERS)
+
 @router.post("/submit", status_code=status.HTTP_200_OK) 
 async def submit_answer(
     submission: AnswerSubmission,
@@ -0,0 +1,44 @@
+"""
+Change feed API endpoints.
+This module lets clients sync incrementally instead of reloading whole lists.
+"""
+
+from typing import Dict, Any
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database.config import get_db
+from app.services.change_service import ChangeService
+from app.config.sync_config import get_sync_config
+from app.api.dependencies import get_change_service
+from app.utils.json_response import FastJSONResponse
+
+# Create router for change feed endpoints
+router = APIRouter()
+
+@router.get("/")
+async def get_changes(
+    since: int = Query(0, ge=0, description="Sequence number of the last change applied (0 for none)"),
+    limit: int = Query(100, ge=1, le=get_sync_config().CHANGES_MAX_PAGE_SIZE, description="Maximum number of changes"),
+    db: Session = Depends(get_db),
+    service: ChangeService = Depends(get_change_service)
+) -> Dict[str, Any]:
+    """
+    Get the question and answer changes after a cursor, oldest first.
+    
+    Each change carries the entity's new state (null for deletes), so clients apply
+    it as an upsert or removal. Pass next_since as the following cursor while
+    has_more is true.
+    
+    Args:
+        since: Sequence number of the last change applied
+        limit: Maximum number of changes to return
+        
+    Returns:
+        Changes, next cursor, has_more flag and newest sequence number
+        
+    Raises:
+        HTTPException: 410 Gone if the cursor is too old or unknown; reload the data,
+            then sync from the X-Latest-Seq response header
+    """
+    return FastJSONResponse(service.get_changes(db, since, limit))
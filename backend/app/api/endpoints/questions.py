@@ -3,25 +3,25 @@ Questions API endpoints.
 This module handles all question-related API operations.
 """
 
+import asyncio
 from typing import List, Dict, Any, Optional
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status, Body
+from fastapi import APIRouter, Depends, HTTPException, Header, Path, Query, status, Body
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 
-try:
-    from app.database.config import get_db
-    from app.services.question_service import QuestionService
-    from app.database.repositories.question_repository import QuestionRepository
-    from app.utils.error_handler import handle_unexpected_error, handle_service_error, handle_conflict_exception
-except ImportError:
-    # Fallback for direct execution
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-    from app.database.config import get_db
-    from app.services.question_service import QuestionService
-    from app.database.repositories.question_repository import QuestionRepository
-    from app.utils.error_handler import handle_unexpected_error, handle_service_error, handle_conflict_exception
+from app.database.config import get_db
+from app.services.question_service import QuestionService
+from app.services.answer_service import AnswerService
+from app.api.dependencies import get_question_service, get_answer_service, get_answer_feed_service
+from app.utils.error_handler import handle_unexpected_error, handle_service_error, handle_conflict_exception
+from app.utils.json_response import FastJSONResponse
+from app.utils.etag import weak_etag, etag_matches, not_modified, with_etag
+from app.utils.versions import question_list_version, question_answers_version
+from app.utils.sse import SSE_HEADERS, format_sse, format_sse_comment
+from app.utils.broker import OVERFLOW_EVENT
+from app.services.answer_feed_service import AnswerFeedService
+from app.config.http_config import get_http_config
 
 # Create router for questions endpoints
 router = APIRouter()
@@ -32,12 +32,6 @@ class QuestionCreate(BaseModel):
     text: str = Field(..., description="Question text")
     access_code: str = Field(..., description="Unique access code for the question")
 
-# Dependency to get question service
-def get_question_service() -> QuestionService:
-    """Get question service instance."""
-    from app.database.repositories.answer_repository import AnswerRepository
-    return QuestionService(QuestionRepository(), AnswerRepository())
-
 # Teacher endpoints
 
 @router.post("/open", status_code=status.HTTP_201_CREATED)
@@ -134,18 +128,28 @@ async def get_questions(
         description="Filter questions by status (open, closed, or absent for all)",
         alias="status"
     ),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     service: QuestionService = Depends(get_question_service)
 ) -> List[Dict[str, Any]]:
     """
     Retrieve a list of questions, optionally filtered by status.
     
+    The response carries a weak ETag; a request with a matching If-None-Match
+    is answered 304 Not Modified without querying the database.
+    
     Args:
         status_filter: Optional filter for question status (open, closed, or absent for all)
+        if_none_match: ETag of the client's copy, if any
         
     Returns:
         List of questions
     """
+    # Read the version before querying, so a concurrent write can only make the tag stale, never the data
+    etag = weak_etag("questions", question_list_version.value, status_filter or "all")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
     try:
         # Convert status string to boolean
         is_closed = None
@@ -154,8 +158,8 @@ async def get_questions(
         elif status_filter == "closed":
             is_closed = True
         
-        # Get questions
-        return service.get_questions(db, is_closed)
+        # Get questions; the service returns JSON primitives, so they are encoded directly
+        return with_etag(FastJSONResponse(service.get_questions(db, is_closed)), etag)
     except Exception as e:
         # Handle unexpected errors
         raise handle_unexpected_error("retrieve questions", e)
@@ -163,15 +167,20 @@ async def get_questions(
 @router.get("/{question_id}/answers", status_code=status.HTTP_200_OK)
 async def get_question_with_answers(
     question_id: int = Path(..., title="Question ID", description="ID of the question to get complete info for"),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     question_service: QuestionService = Depends(get_question_service),
-    answer_service=Depends(lambda: get_answer_service())
+    answer_service: AnswerService = Depends(get_answer_service)
 ) -> Dict[str, Any]:
     """
     Get complete question information including all submitted answers.
     
+    The response carries a weak ETag; a request with a matching If-None-Match
+    is answered 304 Not Modified without querying the database.
+    
     Args:
         question_id: ID of the question to get complete info for
+        if_none_match: ETag of the client's copy, if any
         
     Returns:
         Dictionary containing question details and all answers
@@ -179,6 +188,10 @@ async def get_question_with_answers(
     Raises:
         HTTPException: If question not found
     """
+    etag = weak_etag("answers", question_id, question_answers_version.value(question_id))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
     try:
         # Get question details
         question = question_service.get_question_by_id(db, question_id)
@@ -186,12 +199,12 @@ async def get_question_with_answers(
         # Get answers for the question
         answers = answer_service.get_answers_for_question(db, question_id)
         
-        # Return complete question info with answers
-        return {
+        # Return complete question info with answers, encoded directly from JSON primitives
+        return with_etag(FastJSONResponse({
             "question": question,
             "answers": answers,
             "answer_count": len(answers)
-        }
+        }), etag)
     except HTTPException as e:
         # Re-raise the exception
         raise e
@@ -199,6 +212,71 @@ async def get_question_with_answers(
         # Handle unexpected errors
         raise handle_unexpected_error("retrieve question with answers", e)
 
+@router.get("/{question_id}/answers/stream")
+async def stream_question_answers(
+    question_id: int = Path(..., title="Question ID", description="ID of the question to watch"),
+    since: Optional[int] = Query(None, description="Event ID to resume after (overrides Last-Event-ID)"),
+    last_event_id: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    service: QuestionService = Depends(get_question_service),
+    feed: AnswerFeedService = Depends(get_answer_feed_service)
+) -> StreamingResponse:
+    """
+    Stream a question's answers as Server-Sent Events while they are submitted.
+    
+    The stream opens with a 'ready' event holding the current answer count, then
+    sends 'answer.created' and 'answer.updated' events with the answer and the new
+    count, and 'question.closed' or 'question.deleted' (which ends the stream).
+    Every event has an ID; reconnecting with it (Last-Event-ID or ?since=) replays
+    the events missed meanwhile. A 'reset' event means they are no longer available
+    and the client should refetch the answer list. A client that falls too far behind
+    gets an 'overflow' event and the stream ends; it should reconnect from that ID.
+    
+    Args:
+        question_id: ID of the question to watch
+        since: Event ID to resume after
+        last_event_id: Event ID sent by a reconnecting EventSource
+        
+    Returns:
+        StreamingResponse: text/event-stream of answer events
+        
+    Raises:
+        HTTPException: If question not found
+    """
+    question = service.get_question_by_id(db, question_id)
+    if since is None and last_event_id is not None and last_event_id.strip().isdigit():
+        since = int(last_event_id)
+    # Subscribe before counting, so an answer committed in between is both counted and pushed
+    subscription = feed.subscribe(question_id, since)
+    answer_count = feed.answer_repo.count_by_question_id(db, question_id)
+    # The stream never touches the database; release the connection instead of holding it open
+    db.close()
+    keepalive = get_http_config().STREAM_KEEPALIVE_SECONDS
+    
+    async def event_stream():
+        try:
+            yield format_sse({
+                "question_id": question_id,
+                "is_closed": question.get("is_closed"),
+                "answer_count": answer_count
+            }, event="ready", event_id=str(subscription.cursor))
+            while True:
+                try:
+                    message = await subscription.get(timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield format_sse_comment("keep-alive")
+                    continue
+                if message is None:
+                    break
+                yield format_sse(message.data, event=message.event, event_id=str(message.seq))
+                if message.event == OVERFLOW_EVENT:
+                    break
+        finally:
+            # Runs when the client disconnects too, releasing the subscriber's queue
+            subscription.close()
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
 @router.delete("/{question_id}", status_code=status.HTTP_200_OK)
 async def delete_question(
     question_id: int = Path(..., title="Question ID", description="ID of the question to delete"),
@@ -233,11 +311,3 @@ async def delete_question(
     except Exception as e:
         # Handle unexpected errors
         raise handle_unexpected_error("delete question", e)
-
-# Import here to avoid circular imports
-def get_answer_service():
-    """Get answer service instance."""
-    from app.services.answer_service import AnswerService
-    from app.database.repositories.answer_repository import AnswerRepository
-    from app.services.student_service import StudentService
-    return AnswerService(AnswerRepository(), get_question_service(), StudentService())
@@ -3,31 +3,28 @@ Students API endpoints.
 This module handles all student-related API operations.
 """
 
-from typing import List
-from fastapi import APIRouter, Depends
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, Response
 
-try:
-    from app.models.student import Student, StudentCreate, StudentUpdate
-    from app.services.student_service import StudentService
-except ImportError:
-    # Fallback for direct execution
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-    from app.models.student import Student, StudentCreate, StudentUpdate
-    from app.services.student_service import StudentService
+from app.models.student import Student, StudentCreate, StudentUpdate
+from app.services.student_service import StudentService
+from app.api.dependencies import get_student_service
+from app.utils.etag import weak_etag, etag_matches, not_modified, with_etag
 
 # Create router for students endpoints
 router = APIRouter()
 
-# Dependency to get student service
-def get_student_service() -> StudentService:
-    """Get student service instance."""
-    return StudentService()
-
 @router.get("/", response_model=List[Student])
-async def get_students(service: StudentService = Depends(get_student_service)):
-    """Get all students."""
+async def get_students(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    service: StudentService = Depends(get_student_service)
+):
+    """Get all students. Answers 304 Not Modified while the roster file is unchanged."""
+    etag = weak_etag("students", service.roster_version())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    with_etag(response, etag)
     return service.get_all_students()
 
 @router.get("/{student_id}", response_model=Student)
@@ -7,9 +7,54 @@ load_dotenv()
 class AIConfig:
     """Configuration for AI services."""
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    # Any OpenAI-compatible chat completions server, e.g. the bundled mock server
+    OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
     OPENAI_TEMPERATURE: float = float(os.getenv("OPENAI_TEMPERATURE", "0.7"))
     OPENAI_MAX_TOKENS: int = int(os.getenv("OPENAI_MAX_TOKENS", "2000"))
+    AI_PROMPT_TOKEN_BUDGET: int = int(os.getenv("AI_PROMPT_TOKEN_BUDGET", "6000"))
+    AI_MAX_ANSWER_TOKENS: int = int(os.getenv("AI_MAX_ANSWER_TOKENS", "60"))
+    AI_SUMMARY_CACHE_SIZE: int = int(os.getenv("AI_SUMMARY_CACHE_SIZE", "128"))
+    AI_SEARCH_CACHE_SIZE: int = int(os.getenv("AI_SEARCH_CACHE_SIZE", "512"))
+    AI_SEARCH_NEGATIVE_TTL_SECONDS: float = float(os.getenv("AI_SEARCH_NEGATIVE_TTL_SECONDS", "60"))
+    
+    # Provider registered in llm_provider.LLM_PROVIDERS: "openai" (any OpenAI-compatible server)
+    # or "local" (offline extractive summarizer and TF-IDF search)
+    AI_PROVIDER: str = os.getenv("AI_PROVIDER", "openai")
+    # Fall back to the local summarizer when the provider is unconfigured, unhealthy or too slow
+    AI_LOCAL_FALLBACK: bool = os.getenv("AI_LOCAL_FALLBACK", "true").lower() == "true"
+    AI_LATENCY_BUDGET_SECONDS: float = float(os.getenv("AI_LATENCY_BUDGET_SECONDS", "15"))
+    
+    # Near-duplicate answer collapsing
+    AI_COLLAPSE_DUPLICATES: bool = os.getenv("AI_COLLAPSE_DUPLICATES", "true").lower() == "true"
+    AI_DUPLICATE_THRESHOLD: float = float(os.getenv("AI_DUPLICATE_THRESHOLD", "0.7"))
+    
+    # Upstream resilience
+    AI_REQUEST_TIMEOUT_SECONDS: float = float(os.getenv("AI_REQUEST_TIMEOUT_SECONDS", "30"))
+    AI_MAX_RETRIES: int = int(os.getenv("AI_MAX_RETRIES", "3"))
+    AI_RETRY_BASE_DELAY: float = float(os.getenv("AI_RETRY_BASE_DELAY", "0.5"))
+    AI_RETRY_MAX_DELAY: float = float(os.getenv("AI_RETRY_MAX_DELAY", "8"))
+    AI_RETRY_AFTER_MAX_SECONDS: float = float(os.getenv("AI_RETRY_AFTER_MAX_SECONDS", "30"))
+    AI_CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("AI_CIRCUIT_FAILURE_THRESHOLD", "5"))
+    AI_CIRCUIT_RESET_SECONDS: float = float(os.getenv("AI_CIRCUIT_RESET_SECONDS", "30"))
+    AI_MAX_IN_FLIGHT: int = int(os.getenv("AI_MAX_IN_FLIGHT", "4"))
+    AI_MAX_QUEUE: int = int(os.getenv("AI_MAX_QUEUE", "16"))
+    AI_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("AI_QUEUE_TIMEOUT_SECONDS", "10"))
+    
+    # Background summarization jobs
+    AI_JOB_WORKERS: int = int(os.getenv("AI_JOB_WORKERS", "2"))
+    AI_JOB_MAX_PENDING: int = int(os.getenv("AI_JOB_MAX_PENDING", "100"))
+    
+    # Batch summarization across many questions
+    AI_BATCH_CONCURRENCY: int = int(os.getenv("AI_BATCH_CONCURRENCY", "4"))
+    AI_BATCH_MAX_QUESTIONS: int = int(os.getenv("AI_BATCH_MAX_QUESTIONS", "500"))
+    
+    # Summary precomputed when a question closes
+    AI_PRECOMPUTE_ON_CLOSE: bool = os.getenv("AI_PRECOMPUTE_ON_CLOSE", "true").lower() == "true"
+    AI_DEFAULT_SUMMARY_INSTRUCTIONS: str = os.getenv(
+        "AI_DEFAULT_SUMMARY_INSTRUCTIONS",
+        "Summarize the main ideas in the answers, how many students gave each kind of answer, and any common misconceptions."
+    )
 
 
 @lru_cache()
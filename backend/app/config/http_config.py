@@ -0,0 +1,42 @@
+from functools import lru_cache
+import os
+from typing import Dict, List
+from dotenv import load_dotenv
+
+load_dotenv()
+
+class HTTPConfig:
+    """Configuration for HTTP response caching, compression and event streams."""
+    # In-process cache of serialized teacher read responses
+    RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    RESPONSE_CACHE_MAX_BYTES: int = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    RESPONSE_CACHE_MAX_ENTRY_BYTES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRY_BYTES", str(4 * 1024 * 1024)))
+
+    # Response compression
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    # Offered encodings, most preferred first; unavailable ones (no brotli/zstandard package) are skipped
+    COMPRESSION_ENCODINGS: str = os.getenv("COMPRESSION_ENCODINGS", "br,zstd,gzip")
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_LEVEL: int = int(os.getenv("COMPRESSION_BROTLI_LEVEL", "5"))
+    COMPRESSION_ZSTD_LEVEL: int = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+
+    # Event streams
+    STREAM_QUEUE_SIZE: int = int(os.getenv("STREAM_QUEUE_SIZE", "100"))  # Pending events before a slow client is dropped
+    STREAM_HISTORY_SIZE: int = int(os.getenv("STREAM_HISTORY_SIZE", "500"))  # Events kept per stream for resuming
+    STREAM_KEEPALIVE_SECONDS: float = float(os.getenv("STREAM_KEEPALIVE_SECONDS", "15"))
+    STREAM_MAX_CHANNELS: int = int(os.getenv("STREAM_MAX_CHANNELS", "10000"))  # Access codes with a status channel
+
+    def compression_encodings(self) -> List[str]:
+        """Get the configured encodings in order of preference."""
+        return [encoding.strip().lower() for encoding in self.COMPRESSION_ENCODINGS.split(",") if encoding.strip()]
+
+    def compression_levels(self) -> Dict[str, int]:
+        """Get the compression level per encoding."""
+        return {"gzip": self.COMPRESSION_GZIP_LEVEL, "br": self.COMPRESSION_BROTLI_LEVEL, "zstd": self.COMPRESSION_ZSTD_LEVEL}
+
+
+@lru_cache()
+def get_http_config() -> HTTPConfig:
+    """Get HTTP configuration singleton."""
+    return HTTPConfig()
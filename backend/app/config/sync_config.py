@@ -0,0 +1,21 @@
+from functools import lru_cache
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+class SyncConfig:
+    """Configuration for the change feed."""
+    # Changes always kept, newest first; older ones are compacted away
+    CHANGES_RETENTION: int = int(os.getenv("CHANGES_RETENTION", "10000"))
+    # Changes older than this are compacted away even within the retention count (0 disables)
+    CHANGES_MAX_AGE_HOURS: float = float(os.getenv("CHANGES_MAX_AGE_HOURS", "24"))
+    # Writes between compactions
+    CHANGES_COMPACT_INTERVAL: int = int(os.getenv("CHANGES_COMPACT_INTERVAL", "500"))
+    CHANGES_MAX_PAGE_SIZE: int = int(os.getenv("CHANGES_MAX_PAGE_SIZE", "1000"))
+
+
+@lru_cache()
+def get_sync_config() -> SyncConfig:
+    """Get change feed configuration singleton."""
+    return SyncConfig()
@@ -4,8 +4,10 @@ Contains database connection settings and configuration for SQLAlchemy.
 """
 
 import os
+import threading
 from pathlib import Path
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 
@@ -17,6 +19,7 @@ def get_database_path() -> str:
     """
     Get the database file path from environment variable or use default.
     Handles Windows paths with backslashes and spaces properly.
+    Only resolves the path; the directory is created when the engine is.
     
     Returns:
         str: Path to the SQLite database file
@@ -37,7 +40,22 @@ def get_database_path() -> str:
         backend_dir = Path(__file__).parent.parent.parent
         db_path = backend_dir / db_path
     
-    # Always ensure the directory exists
+    return str(db_path.absolute())
+
+def prepare_database_path(database_path: str) -> str:
+    """
+    Make sure the database file's directory exists.
+    
+    Args:
+        database_path: Path returned by get_database_path
+        
+    Returns:
+        str: The path to use, in the temp directory if the configured directory cannot be created
+    """
+    if database_path == ":memory:":
+        return database_path
+    
+    db_path = Path(database_path)
     db_dir = db_path.parent
     try:
         db_dir.mkdir(parents=True, exist_ok=True)
@@ -47,17 +65,9 @@ def get_database_path() -> str:
         temp_dir = Path(tempfile.gettempdir()) / "ort_assignment"
         temp_dir.mkdir(parents=True, exist_ok=True)
         db_path = temp_dir / db_path.name
-        db_dir = temp_dir
         print(f"Warning: Could not create database directory, using temp: {db_path}")
     
-    # Print debug info to help troubleshoot (only in non-CI environments)
-    if not os.getenv("CI") and not os.getenv("GITHUB_ACTIONS"):
-        print(f"Database path: {db_path}")
-        print(f"Database directory: {db_dir}")
-        print(f"Directory exists: {db_dir.exists()}")
-        print(f"Directory is writable: {os.access(db_dir, os.W_OK)}")
-    
-    return str(db_path.absolute())
+    return str(db_path)
 
 def build_database_url(database_path: str) -> str:
     """
@@ -77,34 +87,58 @@ def build_database_url(database_path: str) -> str:
     # Convert Windows backslashes to forward slashes for SQLite URL
     normalized_path = str(Path(database_path)).replace('\\', '/')
     
-    # For absolute paths, use sqlite:/// (three slashes)
-    # For relative paths, use sqlite:/// (three slashes) with leading slash
-    if normalized_path.startswith('/'):
-        return f"sqlite://{normalized_path}"
-    else:
-        return f"sqlite:///{normalized_path}"
-
-# Build database URL from path
-DATABASE_PATH = get_database_path()
-DATABASE_URL = build_database_url(DATABASE_PATH)
-
-# Print debug info (only in non-CI environments)
-if not os.getenv("CI") and not os.getenv("GITHUB_ACTIONS"):
-    print(f"Final database URL: {DATABASE_URL}")
-
-# Create SQLAlchemy engine with optimized settings
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={
-        "check_same_thread": False,
-        "timeout": 20,  # Increase timeout for slow operations
-    } if "sqlite" in DATABASE_URL else {},
-    echo=False,  # Disable echo to improve performance
-    pool_pre_ping=True,  # Verify connections before use
-)
+    # sqlite:/// is followed by the path: "sqlite:///C:/db/app.db" on Windows,
+    # "sqlite:////var/db/app.db" (four slashes) for absolute POSIX paths
+    return f"sqlite:///{normalized_path}"
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_engine() -> Engine:
+    """
+    Get the SQLAlchemy engine, creating it on first use.
+    The engine is built lazily so that importing the application does no file system work.
+    
+    Returns:
+        Engine: The application's database engine
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                database_url = build_database_url(prepare_database_path(get_database_path()))
+                
+                # Create SQLAlchemy engine with optimized settings
+                _engine = create_engine(
+                    database_url,
+                    connect_args={
+                        "check_same_thread": False,
+                        "timeout": 20,  # Increase timeout for slow operations
+                    } if "sqlite" in database_url else {},
+                    echo=False,  # Disable echo to improve performance
+                    pool_pre_ping=True,  # Verify connections before use
+                )
+    return _engine
+
+class _LazySessionMaker(sessionmaker):
+    """Session factory binding its sessions to the engine, which is created by the first session."""
+    
+    def __call__(self, **local_kw):
+        local_kw.setdefault("bind", get_engine())
+        return super().__call__(**local_kw)
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = _LazySessionMaker(autocommit=False, autoflush=False)
+
+def __getattr__(name: str):
+    """Resolve the module's former eager globals (engine, DATABASE_PATH, DATABASE_URL) on access."""
+    if name == "engine":
+        return get_engine()
+    if name == "DATABASE_URL":
+        return str(get_engine().url)
+    if name == "DATABASE_PATH":
+        return get_engine().url.database or ":memory:"
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_db():
@@ -125,21 +159,15 @@ def create_tables():
     Call this function to initialize the database schema.
     """
     # Import all models to ensure they are registered with Base
-    try:
-        from .models.question import Question
-        from .models.answer import Answer
-        from .models.base import Base
-    except ImportError:
-        # Fallback for direct execution
-        import sys
-        import os
-        sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        from .models.question import Question
-        from .models.answer import Answer
-        from .models.base import Base
+    from .models.question import Question
+    from .models.answer import Answer
+    from .models.summary_job import SummaryJob
+    from .models.question_summary import QuestionSummary
+    from .models.change import Change
+    from .models.base import Base
     
     # Now create all tables
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
 
 
 def drop_tables():
@@ -147,14 +175,6 @@ def drop_tables():
     Drop all database tables.
     Use with caution - this will delete all data!
     """
-    # Import Base from models
-    try:
-        from .models.base import Base
-    except ImportError:
-        # Fallback for direct execution
-        import sys
-        import os
-        sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        from .models.base import Base
+    from .models.base import Base
     
-    Base.metadata.drop_all(bind=engine)
+    Base.metadata.drop_all(bind=get_engine())
@@ -6,5 +6,8 @@ This module contains SQLAlchemy ORM models for the application.
 from .base import Base
 from .question import Question
 from .answer import Answer
+from .summary_job import SummaryJob
+from .question_summary import QuestionSummary
+from .change import Change
 
-__all__ = ["Base", "Question", "Answer"]
+__all__ = ["Base", "Question", "Answer", "SummaryJob", "QuestionSummary", "Change"]
@@ -0,0 +1,34 @@
+"""
+Change log database model.
+SQLAlchemy ORM model for the append-only log of question and answer mutations.
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from .base import Base
+from ...utils.timezone import now_israel
+
+
+class Change(Base):
+    """
+    SQLAlchemy model for changes table.
+    
+    One row per created, updated or deleted question or answer, written in the
+    same transaction as the mutation. The sequence number is monotonic and never
+    reused (SQLite AUTOINCREMENT), so clients can sync from the last one they saw.
+    """
+    
+    __tablename__ = "changes"
+    
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String(16), nullable=False)  # question or answer
+    entity_id = Column(Integer, nullable=False)
+    op = Column(String(16), nullable=False)  # created, updated or deleted
+    question_id = Column(Integer, nullable=True, index=True)  # The question itself, or the answer's question
+    data = Column(Text, nullable=True)  # JSON snapshot after the change; null for deletes
+    created_at = Column(DateTime, nullable=False, default=now_israel, index=True)
+    
+    # Never hand out a sequence number twice, even after compaction deletes the newest rows
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    def __repr__(self):
+        return f"<Change(seq={self.seq}, entity='{self.entity}', entity_id={self.entity_id}, op='{self.op}')>"
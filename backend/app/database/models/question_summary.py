@@ -0,0 +1,39 @@
+"""
+Question summary database model.
+SQLAlchemy ORM model for stored AI summaries of a question's answers.
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
+from .base import Base
+from ...utils.timezone import now_israel
+
+
+class QuestionSummary(Base):
+    """
+    SQLAlchemy model for question_summaries table.
+    
+    Stores the latest summary per question and summary instructions, together
+    with a high-water mark of the answers it covers so that later summaries
+    only need to process newer answers.
+    """
+    
+    __tablename__ = "question_summaries"
+    
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False, index=True)
+    instructions_hash = Column(String(64), nullable=False)
+    summary_instructions = Column(Text, nullable=False)
+    summary = Column(Text, nullable=False)
+    answer_count = Column(Integer, nullable=False, default=0)  # Answers covered by the summary
+    last_answer_id = Column(Integer, nullable=True)  # High-water mark: max answer ID covered
+    last_answer_at = Column(DateTime, nullable=True)  # High-water mark: max answer timestamp covered
+    created_at = Column(DateTime, nullable=False, default=now_israel)
+    updated_at = Column(DateTime, nullable=False, default=now_israel, onupdate=now_israel)
+    
+    # One stored summary per question and set of instructions
+    __table_args__ = (
+        UniqueConstraint('question_id', 'instructions_hash', name='uq_question_instructions'),
+    )
+    
+    def __repr__(self):
+        return f"<QuestionSummary(id={self.id}, question_id={self.question_id}, answer_count={self.answer_count}, last_answer_at='{self.last_answer_at}')>"
@@ -0,0 +1,32 @@
+"""
+Summary job database model.
+SQLAlchemy ORM model for background AI summarization jobs.
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from .base import Base
+from ...utils.timezone import now_israel
+
+
+class SummaryJob(Base):
+    """
+    SQLAlchemy model for summary_jobs table.
+    
+    Represents a queued AI summarization request and its outcome.
+    Jobs are persisted so that pending work survives restarts.
+    """
+    
+    __tablename__ = "summary_jobs"
+    
+    id = Column(String(32), primary_key=True)  # UUID hex
+    content_hash = Column(String(64), nullable=False, index=True)  # De-duplicates identical requests
+    question_id = Column(Integer, nullable=True, index=True)
+    status = Column(String(16), nullable=False, default="pending", index=True)  # pending, running, completed, failed
+    request_payload = Column(Text, nullable=False)  # SummarizationRequest as JSON
+    result = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=now_israel)
+    updated_at = Column(DateTime, nullable=False, default=now_israel, onupdate=now_israel)
+    
+    def __repr__(self):
+        return f"<SummaryJob(id='{self.id}', question_id={self.question_id}, status='{self.status}')>"
@@ -6,5 +6,15 @@ This module contains repository classes for database operations.
 from .base import BaseRepository
 from .question_repository import QuestionRepository
 from .answer_repository import AnswerRepository
+from .summary_job_repository import SummaryJobRepository
+from .question_summary_repository import QuestionSummaryRepository
+from .change_repository import ChangeRepository
 
-__all__ = ["BaseRepository", "QuestionRepository", "AnswerRepository"]
+__all__ = [
+    "BaseRepository",
+    "QuestionRepository",
+    "AnswerRepository",
+    "SummaryJobRepository",
+    "QuestionSummaryRepository",
+    "ChangeRepository"
+]
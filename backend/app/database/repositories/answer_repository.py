@@ -3,11 +3,12 @@ Answer repository.
 Handles database operations for answer entities.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from ..models.answer import Answer
 from .base import BaseRepository
+from ...utils.timezone import now_israel
 
 
 class AnswerRepository(BaseRepository[Answer]):
@@ -20,18 +21,20 @@ class AnswerRepository(BaseRepository[Answer]):
     def __init__(self):
         super().__init__(Answer)
     
-    def get_by_question_id(self, db: Session, question_id: int) -> List[Answer]:
+    def get_by_question_id(self, db: Session, question_id: int, columns: Optional[Sequence] = None) -> List[Answer]:
         """
         Get all answers for a specific question.
         
         Args:
             db: Database session
             question_id: Question ID to get answers for
+            columns: Optional model columns to project; rows then hold only these values
             
         Returns:
-            List of answers for the question
+            List of answers (or projected rows) for the question
         """
-        return db.query(self.model).filter(
+        entities = columns or (self.model,)
+        return db.query(*entities).filter(
             self.model.question_id == question_id
         ).order_by(self.model.timestamp.desc()).all()
     
@@ -63,6 +66,19 @@ class AnswerRepository(BaseRepository[Answer]):
         Returns:
             The created/updated answer
         """
+        return self.upsert_with_status(db, answer_data)[0]
+    
+    def upsert_with_status(self, db: Session, answer_data: dict) -> Tuple[Answer, bool]:
+        """
+        Create or update an answer in the database, reporting which one happened.
+        
+        Args:
+            db: Database session
+            answer_data: Dictionary with answer data
+            
+        Returns:
+            The created/updated answer and True if it was created
+        """
         # Try to find existing answer
         existing_answer = self.get_by_question_and_student(
             db, 
@@ -71,14 +87,15 @@ class AnswerRepository(BaseRepository[Answer]):
         )
         
         if existing_answer:
-            # Update existing answer
+            # Update existing answer; the timestamp records the latest submission
             existing_answer.text = answer_data["text"]
+            existing_answer.timestamp = now_israel()
             db.commit()
             db.refresh(existing_answer)
-            return existing_answer
+            return existing_answer, False
         else:
             # Create new answer
-            return self.create(db, answer_data)
+            return self.create(db, answer_data), True
     
     def get_by_student_id(self, db: Session, student_id: str) -> List[Answer]:
         """
@@ -0,0 +1,132 @@
+"""
+Change log repository.
+Handles database operations for the change log, and records question and answer mutations in it.
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import event, func, insert, inspect
+from sqlalchemy.orm import Session
+from ..models.answer import Answer
+from ..models.change import Change
+from ..models.question import Question
+from .base import BaseRepository
+
+# Logged models and their entity names
+TRACKED_ENTITIES = {Question: "question", Answer: "answer"}
+
+
+class ChangeRepository(BaseRepository[Change]):
+    """
+    Repository for change log database operations.
+    
+    Extends BaseRepository with sequence-based reads and compaction.
+    """
+    
+    def __init__(self):
+        super().__init__(Change)
+    
+    def get_since(self, db: Session, since: int, limit: int) -> List[Change]:
+        """
+        Get changes after a sequence number.
+        
+        Args:
+            db: Database session
+            since: Sequence number of the last change the client applied
+            limit: Maximum number of changes to return
+            
+        Returns:
+            Changes in sequence order
+        """
+        return db.query(self.model).filter(
+            self.model.seq > since
+        ).order_by(self.model.seq).limit(limit).all()
+    
+    def get_bounds(self, db: Session) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Get the oldest and newest sequence numbers still in the log.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            (oldest, newest), both None if the log is empty
+        """
+        return tuple(db.query(func.min(self.model.seq), func.max(self.model.seq)).one())
+    
+    def get_last_seq_before(self, db: Session, cutoff: datetime) -> Optional[int]:
+        """
+        Get the newest sequence number written before a time.
+        
+        Args:
+            db: Database session
+            cutoff: Time limit
+            
+        Returns:
+            Sequence number, or None if no change is that old
+        """
+        return db.query(func.max(self.model.seq)).filter(self.model.created_at < cutoff).scalar()
+    
+    def delete_through(self, db: Session, seq: int) -> int:
+        """
+        Delete every change up to and including a sequence number.
+        
+        Args:
+            db: Database session
+            seq: Last sequence number to delete
+            
+        Returns:
+            Number of changes deleted
+        """
+        deleted = db.query(self.model).filter(self.model.seq <= seq).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+
+def snapshot(obj) -> Dict[str, Any]:
+    """
+    Get a JSON-ready copy of a logged entity's columns.
+    
+    Args:
+        obj: Question or answer instance
+        
+    Returns:
+        Column values, with datetimes in ISO format and is_closed as a boolean
+    """
+    data = {}
+    for column in inspect(obj).mapper.column_attrs:
+        value = getattr(obj, column.key)
+        data[column.key] = value.isoformat() if isinstance(value, datetime) else value
+    if isinstance(obj, Question):
+        data["is_closed"] = bool(data["is_closed"])
+    return data
+
+
+def record_changes(session: Session, flush_context) -> None:
+    """
+    Append a change for every question and answer in a flush, in the flush's transaction.
+    
+    Registered as a Session after_flush hook, so a mutation and its change commit or
+    roll back together whichever code path made them. New rows already have their
+    IDs here; updates are logged only if a column value actually changed.
+    """
+    rows = []
+    for objects, op in ((session.new, "created"), (session.dirty, "updated"), (session.deleted, "deleted")):
+        for obj in objects:
+            entity = TRACKED_ENTITIES.get(type(obj))
+            if entity is None or (op == "updated" and not session.is_modified(obj, include_collections=False)):
+                continue
+            rows.append({
+                "entity": entity,
+                "entity_id": obj.id,
+                "op": op,
+                "question_id": obj.id if entity == "question" else obj.question_id,
+                "data": None if op == "deleted" else json.dumps(snapshot(obj), separators=(",", ":"))
+            })
+    if rows:
+        session.connection().execute(insert(Change), rows)
+
+
+if not event.contains(Session, "after_flush", record_changes):
+    event.listen(Session, "after_flush", record_changes)
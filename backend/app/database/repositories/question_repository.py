@@ -37,6 +37,38 @@ class QuestionRepository(BaseRepository[Question]):
             query = query.filter(self.model.is_closed == (1 if is_closed else 0))
         return query.all()
     
+    def get_ids_by_status(self, db: Session, is_closed: Optional[bool] = None) -> List[int]:
+        """
+        Get the IDs of all questions, optionally filtered by closed status.
+        
+        Args:
+            db: Database session
+            is_closed: Optional filter for closed status
+            
+        Returns:
+            List of question IDs in ID order
+        """
+        query = db.query(self.model.id)
+        if is_closed is not None:
+            query = query.filter(self.model.is_closed == (1 if is_closed else 0))
+        return [row.id for row in query.order_by(self.model.id).all()]
+    
+    def get_search_rows(self, db: Session, is_closed: Optional[bool] = None) -> List:
+        """
+        Get the columns needed for search for all questions, optionally filtered by closed status.
+        
+        Args:
+            db: Database session
+            is_closed: Optional filter for closed status
+            
+        Returns:
+            List of (id, title, text, is_closed) rows
+        """
+        query = db.query(self.model.id, self.model.title, self.model.text, self.model.is_closed)
+        if is_closed is not None:
+            query = query.filter(self.model.is_closed == (1 if is_closed else 0))
+        return query.all()
+    
     def get_by_access_code(self, db: Session, access_code: str) -> Optional[Question]:
         """
         Get a question by access code.
@@ -0,0 +1,85 @@
+"""
+Question summary repository.
+Handles database operations for stored question summaries.
+"""
+
+from typing import Optional
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from ..models.question_summary import QuestionSummary
+from .base import BaseRepository
+from ...utils.timezone import now_israel
+
+# Columns identifying a stored summary; the rest are replaced on conflict
+_SUMMARY_KEY = ("question_id", "instructions_hash")
+
+
+class QuestionSummaryRepository(BaseRepository[QuestionSummary]):
+    """
+    Repository for question summary database operations.
+    
+    Extends BaseRepository with summary-specific database operations.
+    """
+    
+    def __init__(self):
+        super().__init__(QuestionSummary)
+    
+    def get_by_question_and_instructions(self, db: Session, question_id: int, instructions_hash: str) -> Optional[QuestionSummary]:
+        """
+        Get the stored summary for a question and set of instructions.
+        
+        Args:
+            db: Database session
+            question_id: Question ID
+            instructions_hash: Hash of the summary instructions
+            
+        Returns:
+            Stored summary if found, None otherwise
+        """
+        return db.query(self.model).filter(
+            self.model.question_id == question_id,
+            self.model.instructions_hash == instructions_hash
+        ).first()
+    
+    def upsert(self, db: Session, summary_data: dict) -> QuestionSummary:
+        """
+        Create or replace the stored summary for a question and set of instructions.
+        
+        A single INSERT ... ON CONFLICT DO UPDATE, so concurrent first summaries
+        for the same question and instructions cannot both insert.
+        
+        Args:
+            db: Database session
+            summary_data: Dictionary with summary data
+            
+        Returns:
+            The created/updated summary
+        """
+        values = {**summary_data, "updated_at": now_israel()}
+        statement = insert(self.model).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(_SUMMARY_KEY),
+            set_={column: statement.excluded[column] for column in values if column not in _SUMMARY_KEY}
+        )
+        db.execute(statement)
+        db.commit()
+        return self.get_by_question_and_instructions(
+            db,
+            summary_data["question_id"],
+            summary_data["instructions_hash"]
+        )
+    
+    def delete_by_question_id(self, db: Session, question_id: int) -> int:
+        """
+        Delete all stored summaries for a question.
+        
+        Args:
+            db: Database session
+            question_id: Question ID
+            
+        Returns:
+            Number of summaries deleted
+        """
+        deleted = db.query(self.model).filter(self.model.question_id == question_id).delete()
+        db.commit()
+        return deleted
@@ -0,0 +1,103 @@
+"""
+Summary job repository.
+Handles database operations for background summarization jobs.
+"""
+
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from ..models.summary_job import SummaryJob
+from .base import BaseRepository
+
+
+class SummaryJobRepository(BaseRepository[SummaryJob]):
+    """
+    Repository for summary job database operations.
+    
+    Extends BaseRepository with job-specific database operations.
+    """
+    
+    def __init__(self):
+        super().__init__(SummaryJob)
+    
+    def get_active_by_content_hash(self, db: Session, content_hash: str) -> Optional[SummaryJob]:
+        """
+        Get the most recent job for a request that has not failed.
+        
+        Args:
+            db: Database session
+            content_hash: Hash of the summarization request
+            
+        Returns:
+            Pending, running or completed job if found, None otherwise
+        """
+        return db.query(self.model).filter(
+            self.model.content_hash == content_hash,
+            self.model.status != "failed"
+        ).order_by(self.model.created_at.desc()).first()
+    
+    def get_by_statuses(self, db: Session, statuses: List[str]) -> List[SummaryJob]:
+        """
+        Get all jobs in any of the given statuses, oldest first.
+        
+        Args:
+            db: Database session
+            statuses: Job statuses to match
+            
+        Returns:
+            List of matching jobs
+        """
+        return db.query(self.model).filter(
+            self.model.status.in_(statuses)
+        ).order_by(self.model.created_at.asc()).all()
+    
+    def count_by_status(self, db: Session, status: str) -> int:
+        """
+        Count jobs in a status.
+        
+        Args:
+            db: Database session
+            status: Job status
+            
+        Returns:
+            Number of jobs in the status
+        """
+        return db.query(self.model).filter(self.model.status == status).count()
+    
+    def update_status(self, db: Session, job_id: str, status: str, result: Optional[str] = None,
+                      error: Optional[str] = None) -> Optional[SummaryJob]:
+        """
+        Update a job's status and outcome.
+        
+        Args:
+            db: Database session
+            job_id: Job ID
+            status: New status
+            result: Summary text for completed jobs
+            error: Error message for failed jobs
+            
+        Returns:
+            Updated job if found, None otherwise
+        """
+        job = self.get(db, job_id)
+        if job:
+            job.status = status
+            job.result = result
+            job.error = error
+            db.commit()
+            db.refresh(job)
+        return job
+    
+    def delete_by_question_id(self, db: Session, question_id: int) -> int:
+        """
+        Delete all jobs for a question, whatever their status.
+        
+        Args:
+            db: Database session
+            question_id: Question ID
+            
+        Returns:
+            Number of jobs deleted
+        """
+        deleted = db.query(self.model).filter(self.model.question_id == question_id).delete()
+        db.commit()
+        return deleted
@@ -3,45 +3,128 @@ Main FastAPI application module.
 This is the entry point for the FastAPI server.
 """
 
+import time
+
+# Measured from before the first import, so the startup report includes them
+_import_started = time.perf_counter()
+
+import asyncio
 import os
+import sys
+from contextlib import asynccontextmanager
+
+# Run as a script (python app/main.py): make the app package importable; imports and `python -m` need nothing
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if __name__ == "__main__" and not __package__ and BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-# Import database configuration with fallback for direct execution
-try:
-    from app.database.config import create_tables
-except ImportError:
-    # Fallback for direct execution
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from app.database.config import create_tables
+from app.api import api_router
+from app.api.caching import CACHE_RULES
+from app.api.dependencies import container
+from app.config.ai_config import get_ai_config
+from app.config.http_config import get_http_config
+from app.database.config import SessionLocal, create_tables
+from app.utils.compression import CompressionMiddleware
+from app.utils.json_response import FastJSONResponse
+from app.utils.response_cache import ResponseCacheMiddleware
+from app.utils.startup import StartupTimer
+from app.utils.warmup import WarmUp
 
-# Create FastAPI application instance
-app = FastAPI(
-    title="ORT Assignment API",
-    description="A simple FastAPI server for the ORT assignment with SQLite database",
-    version="1.0.0"
-)
+startup_timer = StartupTimer(_import_started)
 
-# Initialize database tables on startup
-@app.on_event("startup")
-async def startup_event():
+# Startup, cache warm-up and shutdown, run by the application's lifespan
+async def startup():
     """Initialize database tables on application startup."""
-    # Skip database initialization in testing mode (uses in-memory DB)
-    if os.getenv("TESTING") == "true":
-        print("🧪 Testing mode - skipping database initialization")
-        return
-    
     try:
-        create_tables()  # Create all SQLAlchemy tables from models
+        with startup_timer.phase("database"):
+            create_tables()  # Create all SQLAlchemy tables from models
         print("✅ Database initialized successfully")
     except Exception as e:
         print(f"❌ Database initialization failed: {e}")
         print("💡 Run 'py init_database.py' to set up your database")
         raise
+    
+    # Drop change log entries past their retention
+    with startup_timer.phase("change_log_compaction"):
+        db = SessionLocal()
+        try:
+            compacted = container.change_service.compact(db)
+        finally:
+            db.close()
+    if compacted:
+        print(f"🧹 Compacted {compacted} change log entries")
+    
+    # Resume summary jobs interrupted by the previous shutdown
+    with startup_timer.phase("summary_job_resume"):
+        resumed = container.summary_job_service.resume_pending_jobs()
+    if resumed:
+        print(f"🔁 Resumed {resumed} pending summary jobs")
+    
+    if not get_ai_config().OPENAI_API_KEY:
+        print("Warning: OPENAI_API_KEY not provided. AI services will not work.")
+    print(f"⏱️ {startup_timer.format()}")
+
+async def shutdown():
+    """Stop background workers; unfinished jobs stay persisted for the next start."""
+    container.summary_job_service.shutdown(wait=False)
+
+async def run_warm_up():
+    """Preload the caches the first requests would otherwise miss."""
+    await warm_up.run()
+    print(f"🔥 {warm_up.format()}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start up, warm the caches in the background while serving, and shut down."""
+    # Skip database initialization in testing mode (uses in-memory DB)
+    if os.getenv("TESTING") == "true":
+        print("🧪 Testing mode - skipping database initialization")
+        yield
+        return
+    
+    await startup()
+    # In the background, so /health answers while /ready reports the warm-up
+    warm_up_task = asyncio.create_task(run_warm_up())
+    try:
+        yield
+    finally:
+        warm_up_task.cancel()
+        await shutdown()
+
+# Create FastAPI application instance
+app = FastAPI(
+    title="ORT Assignment API",
+    description="A simple FastAPI server for the ORT assignment with SQLite database",
+    version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
+)
 
-# Add CORS middleware
+# Serve repeated teacher reads from cached response bytes, kept compressed per encoding
+http_config = get_http_config()
+if http_config.RESPONSE_CACHE_ENABLED:
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        cache=container.response_cache,
+        rules=CACHE_RULES,
+        minimum_size=http_config.COMPRESSION_MIN_SIZE,
+        levels=http_config.compression_levels(),
+        encodings=http_config.compression_encodings()
+    )
+
+# Compress everything else; added after the cache so it wraps it and skips its pre-compressed responses
+if http_config.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=http_config.COMPRESSION_MIN_SIZE,
+        levels=http_config.compression_levels(),
+        encodings=http_config.compression_encodings()
+    )
+
+# Add CORS middleware last, so it wraps the response cache and answers each Origin itself
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Allow all origins (frontend domains) - restrict in production
@@ -50,19 +133,13 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all request headers (Content-Type, Authorization, etc.)
 )
 
-# Import routers
-try:
-    from app.api import api_router
-except ImportError:
-    # Fallback for direct execution
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from app.api import api_router
-
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
+# Preloads run by the lifespan after startup; /ready reports not ready until they finish
+warm_up = WarmUp(container.warm_up_tasks(SessionLocal))
+startup_timer.mark("imports")
+
 @app.get("/")
 async def root():
     """Root endpoint that returns a welcome message."""
@@ -73,15 +150,35 @@ async def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "service": "ort-assignment-api"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness check: 503 until the startup warm-up has filled the caches, then 200, with the warm-up timings."""
+    status = warm_up.status()
+    return FastJSONResponse(
+        {"status": "ready" if status["ready"] else "warming_up", **status},
+        status_code=200 if status["ready"] else 503
+    )
+
+@app.get("/startup")
+async def startup_report():
+    """Startup timing report: milliseconds spent importing the application and in each startup step."""
+    return startup_timer.report()
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Response cache counters: entries, size, hits, misses and hit rate."""
+    return container.response_cache.stats()
+
 def run_dev():
     """Run the FastAPI server in development mode with auto-reload."""
     import uvicorn
     uvicorn.run(
         "app.main:app",  # Module path to FastAPI app instance
+        app_dir=BACKEND_DIR,  # Import it from the backend directory, whatever the working directory
         host="0.0.0.0",  # Listen on all network interfaces
         port=8000,  # Default port for API
         reload=True,  # Auto-reload on code changes
-        reload_dirs=["app"]  # Watch only app directory for changes
+        reload_dirs=[os.path.join(BACKEND_DIR, "app")]  # Watch only app directory for changes
     )
 
 # def run_prod():
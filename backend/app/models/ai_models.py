@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
 
 class SummarizationContext(BaseModel):
@@ -13,17 +13,48 @@ class StudentAnswer(BaseModel):
     student_name: str = Field(..., description="Name of the student")
     answer_text: str = Field(..., description="Text of the student's answer")
     submitted_at: str = Field(..., description="Timestamp when answer was submitted")
+    answer_id: Optional[int] = Field(None, description="ID of the answer, if known")
 
 class SummarizationRequest(BaseModel):
     """Request model for summarization endpoint."""
     context: SummarizationContext = Field(..., description="Context for the summarization")
     student_answers: List[StudentAnswer] = Field(..., description="List of student answers to summarize")
+    incremental: bool = Field(False, description="Update the stored summary with only the answers added or changed since it was made")
+    provider: Optional[str] = Field(None, description="'local' for the offline extractive summarizer; defaults to the configured provider")
 
 class SummarizationResponse(BaseModel):
     """Response model for summarization endpoint."""
     summary: str = Field(..., description="Generated summary of student answers")
     error: Optional[str] = Field(None, description="Error message if summarization failed")
 
+class QuestionSummarizationRequest(BaseModel):
+    """Request model for summarizing a question's stored answers."""
+    summary_instructions: str = Field(..., description="Instructions for how to summarize")
+    incremental: bool = Field(True, description="Update the stored summary with only new or changed answers")
+
+class QuestionSummaryResponse(BaseModel):
+    """Response model for summarizing a question's stored answers."""
+    question_id: int = Field(..., description="ID of the summarized question")
+    summary: str = Field(..., description="Generated summary of student answers")
+    answer_count: int = Field(..., description="Number of answers covered by the summary")
+
+class BatchSummarizationRequest(BaseModel):
+    """Request model for summarizing many questions' stored answers."""
+    question_ids: Optional[List[int]] = Field(None, description="Questions to summarize; when omitted, questions are selected by status")
+    status: str = Field("closed", description="Status filter used when no question IDs are given: open, closed or all")
+    summary_instructions: Optional[str] = Field(None, description="Instructions for how to summarize (defaults to the configured instructions)")
+    max_concurrency: Optional[int] = Field(None, ge=1, description="Questions summarized at the same time, up to the configured limit")
+
+class SummaryJobResponse(BaseModel):
+    """Response model for background summarization jobs."""
+    job_id: str = Field(..., description="ID of the job")
+    question_id: Optional[int] = Field(None, description="ID of the summarized question")
+    status: str = Field(..., description="Job status: pending, running, completed or failed")
+    summary: Optional[str] = Field(None, description="Generated summary once the job is completed")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
+    created_at: Optional[str] = Field(None, description="Timestamp when the job was created")
+    updated_at: Optional[str] = Field(None, description="Timestamp of the last status change")
+
 class QuestionItem(BaseModel):
     """Question item for smart search."""
     id: int = Field(..., description="ID of the question")
@@ -38,3 +69,57 @@ class SmartSearchResponse(BaseModel):
     """Response model for smart search endpoint."""
     matching_question_ids: List[int] = Field(..., description="IDs of questions matching the search query")
     error: Optional[str] = Field(None, description="Error message if search failed")
+
+class BatchSmartSearchRequest(BaseModel):
+    """Request model for the batch smart search endpoint."""
+    queries: List[str] = Field(..., min_length=1, max_length=50, description="Natural language search queries")
+    available_questions: List[QuestionItem] = Field(..., description="List of questions to search through")
+    provider: Optional[str] = Field(None, description="'local' ranks with the TF-IDF index instead of the AI provider; defaults to the configured provider")
+    limit: int = Field(3, ge=1, le=50, description="Maximum number of matches per query with the local index")
+
+class BatchSmartSearchResult(BaseModel):
+    """Matches of one query in a batch smart search."""
+    query: str = Field(..., description="The search query")
+    matching_question_ids: List[int] = Field(..., description="IDs of questions matching the query")
+
+class BatchSmartSearchResponse(BaseModel):
+    """Response model for the batch smart search endpoint."""
+    results: List[BatchSmartSearchResult] = Field(..., description="Matches per query, in request order")
+
+class PromptUsage(BaseModel):
+    """Token usage of a single prompt sent to the AI provider."""
+    operation: str = Field("", description="AI operation that built the prompt")
+    prompt_tokens: int = Field(..., description="Number of prompt tokens sent")
+    token_budget: int = Field(..., description="Prompt token budget in effect")
+    items_total: int = Field(..., description="Number of answers or questions in the request")
+    items_sent: int = Field(..., description="Number of rows included in the prompt")
+    truncated: bool = Field(False, description="Whether answers were shortened or sampled to fit the budget")
+    rows_total: Optional[int] = Field(None, description="Number of rows after collapsing near-duplicate answers")
+    compression_ratio: float = Field(1.0, description="Answers per row after collapsing near-duplicate answers")
+
+class AIServiceStats(BaseModel):
+    """Usage counters for an AI service."""
+    requests: int = Field(..., description="Number of prompts sent")
+    prompt_tokens_total: int = Field(..., description="Total prompt tokens sent")
+    upstream_calls: int = Field(..., description="Number of upstream API calls made")
+    coalesced_requests: int = Field(..., description="Requests that shared an identical in-flight upstream call")
+    local_summaries: int = Field(0, description="Summaries produced by the local summarizer, by choice or as a fallback")
+    cache: Optional[Dict[str, Any]] = Field(None, description="Result cache counters")
+    recent: List[PromptUsage] = Field(..., description="Most recent prompt usage records")
+
+class AIStatsResponse(BaseModel):
+    """Response model for AI stats endpoint."""
+    summarization: AIServiceStats = Field(..., description="Summarization service counters")
+    smart_search: AIServiceStats = Field(..., description="Smart search service counters")
+    upstream: Dict[str, Any] = Field(..., description="Circuit state, retries and concurrency of upstream calls")
+
+class QuestionSearchResult(BaseModel):
+    """A ranked question in a query-only search."""
+    id: int = Field(..., description="ID of the question")
+    score: float = Field(..., description="Relevance score between 0 and 1")
+
+class QuestionSearchResponse(BaseModel):
+    """Response model for query-only search endpoint."""
+    query: str = Field(..., description="The search query")
+    results: List[QuestionSearchResult] = Field(..., description="Matching questions, best first")
+    matching_question_ids: List[int] = Field(..., description="IDs of the matching questions, best first")
@@ -1,27 +1,155 @@
-import json
 import os
-import requests
-from typing import List, Optional, Dict, Any
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 from ..config.ai_config import get_ai_config
-from ..models.ai_models import SummarizationRequest, StudentAnswer, SmartSearchRequest
+from ..models.ai_models import (
+    SummarizationRequest, StudentAnswer, SmartSearchRequest, BatchSmartSearchRequest, QuestionItem, PromptUsage, AIServiceStats
+)
+from ..utils.cache import LRUCache
+from ..utils.single_flight import SingleFlight
+from ..utils.hashing import content_hash
+from ..utils.timezone import parse_timestamp
+from ..utils.versions import question_set_version
+from ..database.repositories.question_summary_repository import QuestionSummaryRepository
+from ..utils.resilience import (
+    UpstreamGuard, RetryPolicy, CircuitBreaker, Bulkhead, CircuitOpenError, ProviderNotConfiguredError
+)
+from .prompt_builder import PromptBuilder
+from .llm_provider import LocalProvider, create_provider
+from .answer_dedup import AnswerDeduplicator
+from .local_summarizer import LocalSummarizer
+from .search_index import QuestionSearchIndex, normalize_query
+
+LOCAL_PROVIDER = LocalProvider.name
+
+# Matches returned for a single query by the local index, as many as the search prompt asks for
+LOCAL_SEARCH_LIMIT = 3
+
+# Upstream failures that make the local summarizer answer instead
+_FALLBACK_ERRORS = (CircuitOpenError, ProviderNotConfiguredError, FutureTimeoutError)
+
+
+def create_upstream_guard(config) -> UpstreamGuard:
+    """
+    Build the resilience guard around calls to the provider.
+    
+    Args:
+        config: AI configuration
+        
+    Returns:
+        Guard with the configured retry policy, circuit breaker and bulkhead
+    """
+    return UpstreamGuard(
+        retry_policy=RetryPolicy(
+            max_attempts=config.AI_MAX_RETRIES + 1,
+            base_delay=config.AI_RETRY_BASE_DELAY,
+            max_delay=config.AI_RETRY_MAX_DELAY,
+            max_retry_after=config.AI_RETRY_AFTER_MAX_SECONDS
+        ),
+        circuit_breaker=CircuitBreaker(
+            failure_threshold=config.AI_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=config.AI_CIRCUIT_RESET_SECONDS
+        ),
+        bulkhead=Bulkhead(
+            max_in_flight=config.AI_MAX_IN_FLIGHT,
+            max_queue=config.AI_MAX_QUEUE,
+            queue_timeout=config.AI_QUEUE_TIMEOUT_SECONDS
+        )
+    )
+
 
 class AIBaseService:
     """Base class for AI services."""
     
-    def __init__(self):
-        """Initialize the service."""
+    def __init__(self, upstream: UpstreamGuard = None):
+        """Initialize the service.
+        
+        Args:
+            upstream: Resilience guard shared with the other AI services (optional, creates one if not provided)
+        """
         self.config = get_ai_config()
         
-        # Validate configuration
-        if not self.config.OPENAI_API_KEY:
-            print("Warning: OPENAI_API_KEY not provided. AI services will not work.")
+        self.prompt_builder = PromptBuilder(
+            token_budget=self.config.AI_PROMPT_TOKEN_BUDGET,
+            max_answer_tokens=self.config.AI_MAX_ANSWER_TOKENS,
+            model=self.config.OPENAI_MODEL,
+            deduplicator=AnswerDeduplicator(threshold=self.config.AI_DUPLICATE_THRESHOLD)
+            if self.config.AI_COLLAPSE_DUPLICATES else None
+        )
+        
+        # Provider selected by AI_PROVIDER
+        self.provider = create_provider(self.config)
+        
+        # Identical concurrent upstream requests share one call
+        self._single_flight = SingleFlight()
+        
+        # Retries, circuit breaker and concurrency limit shared with the other AI services
+        self.upstream = upstream or create_upstream_guard(self.config)
+        
+        # Prompt token accounting
+        self._usage_lock = threading.Lock()
+        self._recent_usage = deque(maxlen=50)
+        self._requests = 0
+        self._prompt_tokens_total = 0
+        self._local_summaries = 0
+    
+    def _record_usage(self, operation: str, usage: PromptUsage) -> None:
+        """Record the prompt token count of a request.
+        
+        Args:
+            operation: Name of the AI operation
+            usage: Prompt usage returned by the prompt builder
+        """
+        usage.operation = operation
+        with self._usage_lock:
+            self._requests += 1
+            self._prompt_tokens_total += usage.prompt_tokens
+            self._recent_usage.append(usage)
+        print(
+            f"AI {operation}: {usage.prompt_tokens} prompt tokens "
+            f"({usage.items_sent}/{usage.items_total} items, {usage.compression_ratio}x collapse, "
+            f"budget {usage.token_budget})"
+        )
+    
+    def get_stats(self) -> AIServiceStats:
+        """Get the prompt token counters of this service."""
+        with self._usage_lock:
+            requests_count = self._requests
+            prompt_tokens_total = self._prompt_tokens_total
+            local_summaries = self._local_summaries
+            recent = list(self._recent_usage)
+        flights = self._single_flight.stats()
+        return AIServiceStats(
+            requests=requests_count,
+            prompt_tokens_total=prompt_tokens_total,
+            upstream_calls=flights["executions"],
+            coalesced_requests=flights["coalesced"],
+            local_summaries=local_summaries,
+            cache=self._cache_stats(),
+            recent=recent
+        )
+    
+    def _cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get the counters of the service's result cache, if it has one."""
+        return None
+    
             
-    def _make_openai_request(self, messages: List[dict], json_response: bool = False) -> Any:
-        """Make a direct HTTP request to OpenAI API.
+    def _make_openai_request(self, messages: List[dict], json_response: bool = False,
+                             operation: Optional[str] = None, usage: Optional[PromptUsage] = None) -> Any:
+        """Make a request to the provider, coalescing identical concurrent requests.
+        
+        Concurrent callers with the same request content share one in-flight
+        upstream call and all receive its result. The prompt usage is recorded
+        once that call completes, by the caller that made it, so failed calls
+        and coalesced callers are not counted.
         
         Args:
             messages: List of message objects for the API
             json_response: Whether to expect and parse a JSON response
+            operation: Name of the AI operation, for the usage counters
+            usage: Prompt usage returned by the prompt builder
             
         Returns:
             str or dict: The API response content, parsed as JSON if json_response=True
@@ -29,105 +157,199 @@ class AIBaseService:
         Raises:
             ValueError: If the API request fails
         """
-        if not self.config.OPENAI_API_KEY:
-            raise ValueError("OPENAI_API_KEY environment variable is required")
+        key = content_hash({"messages": messages, "json_response": json_response})
         
-        url = "https://api.openai.com/v1/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {self.config.OPENAI_API_KEY}",
-            "Content-Type": "application/json"
-        }
+        def lead() -> Any:
+            result = self.upstream.call(lambda: self._send_openai_request(messages, json_response))
+            if usage is not None:
+                self._record_usage(operation, usage)
+            return result
         
-        data = {
-            "model": self.config.OPENAI_MODEL,
-            "messages": messages,
-            "temperature": self.config.OPENAI_TEMPERATURE,
-            "max_tokens": self.config.OPENAI_MAX_TOKENS
-        }
+        return self._single_flight.do(key, lead)
+    
+    def _send_openai_request(self, messages: List[dict], json_response: bool = False) -> Any:
+        """Make a single request attempt to the configured provider.
         
-        # For JSON responses, add the response format parameter
-        if json_response:
-            data["response_format"] = {"type": "json_object"}
-            data["temperature"] = 0.3  # Lower temperature for more deterministic results
-            data["max_tokens"] = 500   # Smaller response size needed
+        Args:
+            messages: List of message objects for the API
+            json_response: Whether to expect and parse a JSON response
+            
+        Returns:
+            str or dict: The API response content, parsed as JSON if json_response=True
+            
+        Raises:
+            ValueError: If the API request fails
+        """
+        return self.provider.complete(messages, json_response)
+    
+    def _stream_openai_request(self, messages: List[dict], cancel_event: Optional[threading.Event] = None) -> Iterator[str]:
+        """Open a streamed request to the configured provider, to iterate for content tokens as they arrive.
         
-        try:
-            response = requests.post(url, headers=headers, json=data, timeout=30)
-            response.raise_for_status()
+        Admission and opening happen here, before the caller starts a response,
+        so a full queue or an open circuit can still be reported as an HTTP error.
+        The stream holds an upstream slot until it is exhausted or closed. Opening
+        the stream is retried; failures after the first token are not.
+        
+        Args:
+            messages: List of message objects for the API
+            cancel_event: Optional event that stops the stream and closes the upstream connection
             
-            result = response.json()
-            if not result.get("choices") or not result["choices"][0].get("message", {}).get("content"):
-                raise ValueError("Empty response from OpenAI API")
-                
-            content = result["choices"][0]["message"]["content"].strip()
+        Returns:
+            Iterator[str]: Content deltas in generation order
             
-            # Parse JSON if requested
-            if json_response:
-                try:
-                    return json.loads(content)
-                except json.JSONDecodeError as e:
-                    raise ValueError(f"Failed to parse JSON response: {str(e)}")
+        Raises:
+            BulkheadFullError: If no upstream slot frees up in time
+            CircuitOpenError: If the provider is considered unhealthy
+            ValueError: If the API request fails
+        """
+        return self.upstream.open_stream(
+            lambda: self.provider.open_stream(messages),
+            lambda stream: self.provider.iter_stream(stream, cancel_event)
+        )
             
-            return content
             
-        except requests.exceptions.RequestException as e:
-            raise ValueError(f"OpenAI API request failed: {str(e)}")
-        except (KeyError, IndexError) as e:
-            raise ValueError(f"Invalid response format from OpenAI API: {str(e)}")
-
-
 class AISummarizationService(AIBaseService):
     """Service for AI-powered summarization of student answers."""
+    
+    def __init__(self, summary_repo: QuestionSummaryRepository = None, upstream: UpstreamGuard = None):
+        """Initialize the service and its summary cache.
+        
+        Args:
+            summary_repo: Stored summary repository (optional, creates one if not provided)
+            upstream: Resilience guard shared with the other AI services (optional, creates one if not provided)
+        """
+        super().__init__(upstream)
+        self.summary_cache = LRUCache(max_entries=self.config.AI_SUMMARY_CACHE_SIZE)
+        self.summary_repo = summary_repo or QuestionSummaryRepository()
+        self.local_summarizer = LocalSummarizer(deduplicator=self.prompt_builder.deduplicator)
+        
+        # Upstream calls run here when a latency budget applies, so the caller can stop
+        # waiting while the call finishes in the background and fills the cache
+        self._budget_executor = ThreadPoolExecutor(
+            max_workers=self.config.AI_MAX_IN_FLIGHT + self.config.AI_MAX_QUEUE,
+            thread_name_prefix="ai-upstream"
+        )
+        
+        # Identical concurrent updates of a stored summary share one update and its write
+        self._stored_summary_flight = SingleFlight()
+    
+    def _cache_stats(self) -> Optional[Dict[str, Any]]:
+        return self.summary_cache.stats()
+    
+    def clear_cache(self) -> None:
+        """Drop the cached summaries, e.g. when the database is replaced."""
+        self.summary_cache.clear()
+    
+    def _validate_request(self, request: SummarizationRequest) -> None:
+        """Validate a summarization request.
+        
+        Raises:
+            ValueError: If there are no answers or no instructions
+        """
+        if not request.student_answers:
+            raise ValueError("No student answers provided for summarization")
+        
+        if not request.context.summary_instructions.strip():
+            raise ValueError("Summary instructions cannot be empty")
 
+    def _format_incremental_system_prompt(self) -> str:
+        """Format the system prompt for updating an existing summary."""
+        return """You are an advanced educational analysis assistant. You maintain a running summary of student answers
+        to a single question. You are given the previous summary and only the answers that were added or changed since
+        it was written. Produce the complete updated summary, strictly following the provided summary instructions.
+        Changed answers replace what the same student said before. The answers are given one per line in the form 'name|answer';
+        near-identical answers share one line whose name part reads 'N students (names)', so weigh them by N.
+        
+        Your output MUST be ONLY the summary text. Do NOT include any introductory phrases or any surrounding JSON/Markdown blocks."""
+    
     def _format_system_prompt(self) -> str:
         """Format the system prompt for the AI."""
         return """You are an advanced educational analysis assistant. Your sole task is to analyze a set of student answers 
-        to a single question and generate a comprehensive summary strictly following the provided 'summary_instructions'.
+        to a single question and generate a comprehensive summary strictly following the provided summary instructions.
+        The answers are given one per line in the form 'name|answer'; near-identical answers share one line whose
+        name part reads 'N students (names)', so weigh them by N when counting how common an idea is.
         
         Your output MUST be ONLY the summary text. Do NOT include any introductory phrases like "Based on the data..." 
         or "Here is the summary," or any surrounding JSON/Markdown blocks."""
 
-    def _format_user_prompt(self, request: SummarizationRequest) -> str:
-        """Format the user prompt with the request data."""
-        # Convert request to dict and format it as JSON
-        data = {
-            "context": {
-                "question_id": request.context.question_id,
-                "question_text": request.context.question_text,
-                "summary_instructions": request.context.summary_instructions
-            },
-            "student_answers": [
-                {
-                    "student_id": answer.student_id,
-                    "student_name": answer.student_name,
-                    "answer_text": answer.answer_text,
-                    "submitted_at": answer.submitted_at
-                }
-                for answer in request.student_answers
-            ]
-        }
-        return json.dumps(data, indent=2)
-
-    def generate_summary(self, request: SummarizationRequest) -> str:
-        """Generate a summary of student answers based on the provided instructions."""
-        try:
-            # Validate request
-            if not request.student_answers:
-                raise ValueError("No student answers provided for summarization")
-            
-            if not request.context.summary_instructions.strip():
-                raise ValueError("Summary instructions cannot be empty")
-            
-            # Prepare messages for the API
-            messages = [
-                {"role": "system", "content": self._format_system_prompt()},
-                {"role": "user", "content": self._format_user_prompt(request)}
-            ]
+    def _use_local_provider(self, request: SummarizationRequest) -> bool:
+        """Check whether the request asks for, or the configuration selects, the local summarizer."""
+        return (request.provider or self.config.AI_PROVIDER) == LOCAL_PROVIDER
+    
+    def _local_summary(self, request: SummarizationRequest, reason: str) -> str:
+        """Summarize the request with the local extractive summarizer.
+        
+        Args:
+            request: The summarization request
+            reason: Why the local summarizer is used, for the log
             
-            # Make the API request
-            summary = self._make_openai_request(messages)
-            return summary
+        Returns:
+            str: The extractive summary
+        """
+        with self._usage_lock:
+            self._local_summaries += 1
+        print(f"AI summarize: local summary of {len(request.student_answers)} answers ({reason})")
+        return self.local_summarizer.summarize(request.student_answers)
+    
+    def _request_within_budget(self, messages: List[dict], cache_key: str,
+                               operation: str, usage: PromptUsage) -> str:
+        """Call the provider, giving up waiting once the latency budget is spent.
+        
+        A call that outlives the budget keeps running and caches its summary for later requests.
+        
+        Raises:
+            concurrent.futures.TimeoutError: If the latency budget is exceeded
+        """
+        budget = self.config.AI_LATENCY_BUDGET_SECONDS
+        if not self.config.AI_LOCAL_FALLBACK or budget <= 0:
+            return self._make_openai_request(messages, operation=operation, usage=usage)
+        
+        future = self._budget_executor.submit(self._make_openai_request, messages, operation=operation, usage=usage)
+        future.add_done_callback(
+            lambda done: self.summary_cache.set(cache_key, done.result()) if done.exception() is None else None
+        )
+        return future.result(timeout=budget)
+    
+    def _summarize(self, request: SummarizationRequest) -> Tuple[str, str]:
+        """Generate a summary with the provider, or locally when selected or as a fallback.
+        
+        Returns:
+            tuple: The summary and the provider that produced it
             
+        Raises:
+            ValueError: If the request is invalid or the provider fails without a fallback
+        """
+        self._validate_request(request)
+        if self._use_local_provider(request):
+            return self._local_summary(request, "local provider"), LOCAL_PROVIDER
+        
+        # Prepare compact, budget-limited messages for the API
+        messages, usage = self.prompt_builder.build_summary_messages(self._format_system_prompt(), request)
+        
+        # Serve identical prompts from the cache
+        cache_key = content_hash(messages)
+        cached = self.summary_cache.get(cache_key)
+        if cached is not None:
+            return cached, self.config.AI_PROVIDER
+        
+        try:
+            summary = self._request_within_budget(messages, cache_key, "summarize", usage)
+        except _FALLBACK_ERRORS as e:
+            if not self.config.AI_LOCAL_FALLBACK:
+                raise
+            return self._local_summary(request, type(e).__name__), LOCAL_PROVIDER
+        
+        self.summary_cache.set(cache_key, summary)
+        return summary, self.config.AI_PROVIDER
+    
+    def generate_summary(self, request: SummarizationRequest) -> str:
+        """Generate a summary of student answers based on the provided instructions.
+        
+        With provider 'local', or when the provider is unconfigured, its circuit is open or
+        the latency budget is exceeded, the local extractive summarizer answers instead.
+        """
+        try:
+            return self._summarize(request)[0]
         except ValueError as e:
             # Re-raise validation errors as-is
             print(f"Validation error: {str(e)}")
@@ -137,45 +359,255 @@ class AISummarizationService(AIBaseService):
             print(f"Error generating summary: {str(e)}")
             print(f"Error type: {type(e).__name__}")
             raise ValueError(f"Failed to generate summary: {str(e)}")
+    
+    def generate_incremental_summary(self, db, request: SummarizationRequest) -> str:
+        """Update the stored summary of a question with only the answers added or changed since it was made.
+        
+        The first call summarizes every answer. Later calls send the previous summary plus
+        the answers above its high-water mark, so upstream cost grows with the delta.
+        Concurrent identical requests, such as a view racing the precompute job of a
+        just-closed question, wait for one update, which alone stores the summary.
+        
+        Args:
+            db: Database session
+            request: The summarization request with the question's current answers
+            
+        Returns:
+            str: The updated summary
+            
+        Raises:
+            ValueError: If the request is invalid or summarization fails
+        """
+        self._validate_request(request)
+        key = content_hash(request.model_dump(mode="json"))
+        return self._stored_summary_flight.do(key, lambda: self._update_stored_summary(db, request))
+    
+    def _update_stored_summary(self, db, request: SummarizationRequest) -> str:
+        """Generate the updated summary of a question and store it, in the caller's session.
+        
+        Args:
+            db: Database session
+            request: The validated summarization request
+            
+        Returns:
+            str: The updated summary
+            
+        Raises:
+            ValueError: If summarization fails
+        """
+        context = request.context
+        instructions_hash = content_hash(context.summary_instructions.strip())
+        stored = self.summary_repo.get_by_question_and_instructions(db, context.question_id, instructions_hash)
+        answers = request.student_answers
+        
+        if stored is None:
+            try:
+                summary, provider = self._summarize(request)
+            except ValueError:
+                raise
+            except Exception as e:
+                raise ValueError(f"Failed to generate summary: {str(e)}")
+            if provider == LOCAL_PROVIDER:
+                # Local summaries are not stored, so the provider's summary replaces them later
+                return summary
+        else:
+            delta = [answer for answer in answers if self._is_after_watermark(answer, stored)]
+            if not delta:
+                return stored.summary
+            if self._use_local_provider(request):
+                return self._local_summary(request, "local provider")
+            
+            try:
+                messages, usage = self.prompt_builder.build_incremental_summary_messages(
+                    self._format_incremental_system_prompt(), context, stored.summary, delta, len(answers)
+                )
+                summary = self._request_within_budget(messages, content_hash(messages), "summarize-incremental", usage)
+            except _FALLBACK_ERRORS as e:
+                if not self.config.AI_LOCAL_FALLBACK:
+                    raise ValueError(f"Failed to generate summary: {str(e)}")
+                return self._local_summary(request, type(e).__name__)
+            except ValueError:
+                raise
+            except Exception as e:
+                raise ValueError(f"Failed to generate summary: {str(e)}")
+        
+        timestamps = [ts for ts in (parse_timestamp(a.submitted_at) for a in answers) if ts is not None]
+        answer_ids = [a.answer_id for a in answers if a.answer_id is not None]
+        self.summary_repo.upsert(db, {
+            "question_id": context.question_id,
+            "instructions_hash": instructions_hash,
+            "summary_instructions": context.summary_instructions,
+            "summary": summary,
+            "answer_count": len(answers),
+            "last_answer_id": max(answer_ids) if answer_ids else None,
+            "last_answer_at": max(timestamps) if timestamps else None
+        })
+        return summary
+    
+    @staticmethod
+    def _is_after_watermark(answer: StudentAnswer, stored) -> bool:
+        """Check whether an answer was added or changed after the stored summary's high-water mark."""
+        if answer.answer_id is not None and stored.last_answer_id is not None and answer.answer_id > stored.last_answer_id:
+            return True
+        submitted_at = parse_timestamp(answer.submitted_at)
+        if submitted_at is None or stored.last_answer_at is None:
+            return True
+        return submitted_at > stored.last_answer_at
+    
+    def stream_summary(self, request: SummarizationRequest, cancel_event: Optional[threading.Event] = None) -> Iterator[str]:
+        """Stream a summary of student answers token by token.
+        
+        The request is validated, admitted and the upstream stream opened eagerly,
+        so that errors surface before the stream starts.
+        The completed text is written to the summary cache; cancelled streams are not cached.
+        
+        Args:
+            request: The summarization request
+            cancel_event: Optional event that cancels the upstream generation
+            
+        Returns:
+            Iterator[str]: Summary text deltas
+            
+        Raises:
+            BulkheadFullError: If no upstream slot frees up in time
+            CircuitOpenError: If the provider is unavailable and local fallback is off
+            ValueError: If the request is invalid
+        """
+        self._validate_request(request)
+        if self._use_local_provider(request):
+            return iter([self._local_summary(request, "local provider")])
+        
+        messages, usage = self.prompt_builder.build_summary_messages(self._format_system_prompt(), request)
+        cache_key = content_hash(messages)
+        
+        cached = self.summary_cache.get(cache_key)
+        if cached is not None:
+            return iter([cached])
+        
+        try:
+            deltas = self._stream_openai_request(messages, cancel_event)
+        except (CircuitOpenError, ProviderNotConfiguredError) as e:
+            if not self.config.AI_LOCAL_FALLBACK:
+                raise
+            return iter([self._local_summary(request, type(e).__name__)])
+        self._record_usage("summarize-stream", usage)
+        
+        def generate() -> Iterator[str]:
+            parts = []
+            try:
+                for delta in deltas:
+                    parts.append(delta)
+                    yield delta
+            finally:
+                close = getattr(deltas, "close", None)
+                if close is not None:
+                    close()
+            
+            if cancel_event is None or not cancel_event.is_set():
+                self.summary_cache.set(cache_key, "".join(parts).strip())
+        
+        return generate()
             
             
 class AISmartSearchService(AIBaseService):
     """Service for AI-powered semantic search of questions."""
     
+    def __init__(self, upstream: UpstreamGuard = None):
+        """Initialize the service and its result cache.
+        
+        Args:
+            upstream: Resilience guard shared with the other AI services (optional, creates one if not provided)
+        """
+        super().__init__(upstream)
+        self.search_cache = LRUCache(max_entries=self.config.AI_SEARCH_CACHE_SIZE)
+    
+    def _cache_stats(self) -> Optional[Dict[str, Any]]:
+        return self.search_cache.stats()
+    
+    def clear_cache(self) -> None:
+        """Drop the cached search results, e.g. when the database is replaced."""
+        self.search_cache.clear()
+    
+    @staticmethod
+    def _question_set_fingerprint(questions: List[QuestionItem]) -> int:
+        """Fingerprint a question list for result cache keys."""
+        return hash(tuple((question.id, question.text) for question in questions))
+    
+    @staticmethod
+    def _search_cache_key(query: str, fingerprint: int) -> Tuple[int, str, int]:
+        """Build the result cache key of a search.
+        
+        The question-set version retires every entry when a question is created, closed
+        or deleted; the fingerprint keeps results for different question lists apart.
+        """
+        return question_set_version.value, normalize_query(query), fingerprint
+    
+    def _cache_result(self, cache_key: Tuple[int, str, int], matching_ids: List[int]) -> None:
+        """Cache the result of a search; misses expire sooner, as a later call may still find matches."""
+        self.search_cache.set(
+            cache_key, tuple(matching_ids),
+            ttl_seconds=None if matching_ids else self.config.AI_SEARCH_NEGATIVE_TTL_SECONDS
+        )
+    
+    def get_cached_results(self, request: SmartSearchRequest) -> Optional[List[int]]:
+        """Get the cached result of a search without calling the provider.
+        
+        Args:
+            request (SmartSearchRequest): The request containing the search query and available questions
+            
+        Returns:
+            Optional[List[int]]: Matching question IDs, or None on a cache miss
+        """
+        if not request.available_questions or not request.query.strip():
+            return None
+        fingerprint = self._question_set_fingerprint(request.available_questions)
+        cached = self.search_cache.get(self._search_cache_key(request.query, fingerprint))
+        return list(cached) if cached is not None else None
+    
     def _format_system_prompt(self) -> str:
         """Format the system prompt for the AI."""
         return """You are an intelligent search agent specialized in semantic matching of educational questions.
-        Your task is to match a 'query' to the most relevant questions from the 'available_questions' list.
+        Your task is to match a query to the most relevant questions from the list of available questions,
+        which are given one per line in the form 'id|text'.
         
         You MUST only return a single JSON object containing one key: 'matching_question_ids', which holds a list of 
         the integer IDs of the relevant questions. If no questions are relevant, return an empty list.
         
-        Based on the semantic relevance of the 'query' to the 'text' of each question, identify the IDs of 
+        Based on the semantic relevance of the query to the text of each question, identify the IDs of 
         the top 1-3 matching questions. Strictly output the result as a single JSON object.
         
         Example Format:
         {"matching_question_ids": [102, 103, 105]}
         """
     
-    def _format_user_prompt(self, request: SmartSearchRequest) -> str:
-        """Format the user prompt with the request data."""
-        data = {
-            "query": request.query,
-            "available_questions": [
-                {
-                    "id": question.id,
-                    "text": question.text
-                }
-                for question in request.available_questions
-            ]
-        }
-        return json.dumps(data, indent=2)
-        
-    def find_relevant_questions(self, request: SmartSearchRequest) -> List[int]:
+    def _format_batch_system_prompt(self) -> str:
+        """Format the system prompt for answering several queries at once."""
+        return """You are an intelligent search agent specialized in semantic matching of educational questions.
+        Your task is to match each of several queries, given one per line in the form 'q<number>|query',
+        to the most relevant questions from the list of available questions, which are given one per
+        line in the form 'id|text'.
+        
+        You MUST only return a single JSON object containing one key: 'results', which maps every query
+        label (such as "q1") to a list of the integer IDs of the questions relevant to that query.
+        If no questions are relevant to a query, map it to an empty list.
+        
+        Based on the semantic relevance of each query to the text of each question, identify the IDs of
+        the top 1-3 matching questions per query. Strictly output the result as a single JSON object.
+        
+        Example Format:
+        {"results": {"q1": [102, 103], "q2": [], "q3": [105]}}
+        """
+    
+    def find_relevant_questions(self, request: SmartSearchRequest, check_cache: bool = True) -> List[int]:
         """Find questions that are semantically relevant to the search query.
         
+        Results are cached per normalized query and question set; queries without
+        matches are cached too, for AI_SEARCH_NEGATIVE_TTL_SECONDS. With the local
+        provider, the questions are ranked with the TF-IDF index instead.
+        
         Args:
             request (SmartSearchRequest): The request containing the search query and available questions
+            check_cache: Whether to look up the cache first (False when the caller already did)
             
         Returns:
             List[int]: List of question IDs that match the search query
@@ -190,15 +622,22 @@ class AISmartSearchService(AIBaseService):
                 
             if not request.query.strip():
                 raise ValueError("Search query cannot be empty")
+            
+            cache_key = self._search_cache_key(request.query, self._question_set_fingerprint(request.available_questions))
+            if check_cache:
+                cached = self.search_cache.get(cache_key)
+                if cached is not None:
+                    return list(cached)
+            
+            if self.config.AI_PROVIDER == LOCAL_PROVIDER:
+                index = QuestionSearchIndex(request.available_questions)
+                return [question_id for question_id, _ in index.search(request.query, LOCAL_SEARCH_LIMIT)]
                 
-            # Prepare messages for the API
-            messages = [
-                {"role": "system", "content": self._format_system_prompt()},
-                {"role": "user", "content": self._format_user_prompt(request)}
-            ]
+            # Prepare compact, budget-limited messages for the API
+            messages, usage = self.prompt_builder.build_search_messages(self._format_system_prompt(), request)
             
             # Make the API request with JSON response
-            result = self._make_openai_request(messages, json_response=True)
+            result = self._make_openai_request(messages, json_response=True, operation="smart-search", usage=usage)
             
             # Extract and validate matching question IDs
             matching_ids = result.get("matching_question_ids", [])
@@ -209,6 +648,7 @@ class AISmartSearchService(AIBaseService):
             valid_ids = set(q.id for q in request.available_questions)
             matching_ids = [id for id in matching_ids if isinstance(id, int) and id in valid_ids]
             
+            self._cache_result(cache_key, matching_ids)
             return matching_ids
             
         except ValueError as e:
@@ -219,4 +659,79 @@ class AISmartSearchService(AIBaseService):
             # Log the error and raise it for handling in the endpoint
             print(f"Error finding relevant questions: {str(e)}")
             print(f"Error type: {type(e).__name__}")
-            raise ValueError(f"Failed to find relevant questions: {str(e)}")
\ No newline at end of file
+            raise ValueError(f"Failed to find relevant questions: {str(e)}")
+    
+    def find_relevant_questions_batch(self, request: BatchSmartSearchRequest) -> List[List[int]]:
+        """Find the questions relevant to each of several queries in one pass.
+        
+        With the local provider, all queries are scored against the question set with a
+        single TF-IDF matrix product. Otherwise the queries missing from the result cache
+        are answered by one combined prompt, and their results are cached per query.
+        
+        Args:
+            request (BatchSmartSearchRequest): The queries and the questions to search through
+            
+        Returns:
+            List[List[int]]: Matching question IDs for each query, in request order
+            
+        Raises:
+            ValueError: If a query is empty or the search fails
+        """
+        try:
+            if any(not query.strip() for query in request.queries):
+                raise ValueError("Search queries cannot be empty")
+            
+            if not request.available_questions:
+                return [[] for _ in request.queries]
+            
+            if (request.provider or self.config.AI_PROVIDER) == LOCAL_PROVIDER:
+                index = QuestionSearchIndex(request.available_questions)
+                return [
+                    [question_id for question_id, _ in matches]
+                    for matches in index.search_many(request.queries, request.limit)
+                ]
+            
+            # Equivalent queries share one cache entry and one prompt line
+            fingerprint = self._question_set_fingerprint(request.available_questions)
+            keys = [self._search_cache_key(query, fingerprint) for query in request.queries]
+            results: Dict[Tuple[int, str, int], List[int]] = {}
+            pending: Dict[Tuple[int, str, int], str] = {}
+            for query, key in zip(request.queries, keys):
+                if key in results or key in pending:
+                    continue
+                cached = self.search_cache.get(key)
+                if cached is not None:
+                    results[key] = list(cached)
+                else:
+                    pending[key] = query
+            
+            if pending:
+                messages, usage = self.prompt_builder.build_batch_search_messages(
+                    self._format_batch_system_prompt(), list(pending.values()), request.available_questions
+                )
+                result = self._make_openai_request(
+                    messages, json_response=True, operation="smart-search-batch", usage=usage
+                )
+                
+                matches = result.get("results", {})
+                if not isinstance(matches, dict):
+                    raise ValueError("Invalid response format: results must be an object")
+                
+                valid_ids = set(q.id for q in request.available_questions)
+                for number, key in enumerate(pending, start=1):
+                    matching_ids = matches.get(f"q{number}", [])
+                    if not isinstance(matching_ids, list):
+                        raise ValueError(f"Invalid response format: results for q{number} must be a list")
+                    matching_ids = [id for id in matching_ids if isinstance(id, int) and id in valid_ids]
+                    self._cache_result(key, matching_ids)
+                    results[key] = matching_ids
+            
+            return [list(results[key]) for key in keys]
+            
+        except ValueError as e:
+            print(f"Validation error: {str(e)}")
+            raise
+        except Exception as e:
+            print(f"Error finding relevant questions: {str(e)}")
+            print(f"Error type: {type(e).__name__}")
+            raise ValueError(f"Failed to find relevant questions: {str(e)}")
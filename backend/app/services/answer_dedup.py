@@ -0,0 +1,206 @@
+"""
+Near-duplicate answer collapsing.
+This module groups near-identical student answers with MinHash/LSH before summarization.
+"""
+
+import re
+import unicodedata
+import zlib
+from collections import Counter, defaultdict
+from typing import TYPE_CHECKING, Dict, List, Sequence, Set
+
+from ..models.ai_models import StudentAnswer
+
+_NON_WORD_PATTERN = re.compile(r"[^\w\s]", re.UNICODE)
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_NUMBER_PATTERN = re.compile(r"\d+")
+
+if TYPE_CHECKING:
+    # NumPy is imported when answers are first grouped, keeping it out of the application's startup
+    import numpy as np
+
+# Mersenne prime 2^31 - 1 keeps (a * x + b) within uint64 for 31-bit x
+_PRIME = (1 << 31) - 1
+
+
+def normalize_answer(text: str) -> str:
+    """
+    Normalize an answer for duplicate detection.
+
+    Applies Unicode NFKC, case folding, punctuation removal and whitespace collapsing,
+    so that "Photosynthesis!" and "photosynthesis." normalize to the same text.
+
+    Args:
+        text: Raw answer text
+
+    Returns:
+        Normalized text
+    """
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    text = _NON_WORD_PATTERN.sub(" ", text)
+    return _WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """
+    Get the character shingles of a normalized text.
+
+    Args:
+        text: Normalized text
+        size: Shingle length
+
+    Returns:
+        Set of shingles; short texts yield themselves
+    """
+    padded = f" {text} "
+    if len(padded) <= size:
+        return {padded}
+    return {padded[i:i + size] for i in range(len(padded) - size + 1)}
+
+
+def jaccard(first: Set[str], second: Set[str]) -> float:
+    """Jaccard similarity of two sets."""
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+class AnswerGroup:
+    """A group of near-identical answers with one representative text."""
+
+    def __init__(self, representative: str, answers: List[StudentAnswer]):
+        """
+        Initialize the group.
+
+        Args:
+            representative: Answer text sent to the model for the whole group
+            answers: Answers in the group, in submission order
+        """
+        self.representative = representative
+        self.answers = answers
+
+    @property
+    def count(self) -> int:
+        """Number of answers in the group."""
+        return len(self.answers)
+
+    @property
+    def student_names(self) -> List[str]:
+        """Names of the students whose answers are in the group."""
+        return [answer.student_name for answer in self.answers]
+
+
+class _UnionFind:
+    """Disjoint sets over integer indices."""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, first: int, second: int) -> None:
+        root_first, root_second = self.find(first), self.find(second)
+        if root_first != root_second:
+            self.parent[max(root_first, root_second)] = min(root_first, root_second)
+
+
+class AnswerDeduplicator:
+    """Groups near-duplicate answers in near-linear time with MinHash and LSH banding."""
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = 64, bands: int = 16, seed: int = 7):
+        """
+        Initialize the deduplicator.
+
+        Args:
+            threshold: Minimum shingle Jaccard similarity for two answers to be grouped
+            num_perm: Number of MinHash permutations; must be divisible by bands
+            bands: Number of LSH bands
+            seed: Seed for the hash permutations, fixed so grouping is deterministic
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.num_perm = num_perm
+        self.seed = seed
+        # Hash permutations, drawn on first use so that building a deduplicator does not load NumPy
+        self._permutations = None
+
+    def _signature(self, shingle_set: Set[str]) -> "np.ndarray":
+        """Compute the MinHash signature of a shingle set."""
+        import numpy as np
+        if self._permutations is None:
+            rng = np.random.default_rng(self.seed)
+            self._permutations = (
+                np.uint64(_PRIME),
+                rng.integers(1, _PRIME, size=self.num_perm, dtype=np.uint64),
+                rng.integers(0, _PRIME, size=self.num_perm, dtype=np.uint64)
+            )
+        prime, a, b = self._permutations
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) & 0x7FFFFFFF for s in shingle_set),
+            dtype=np.uint64,
+            count=len(shingle_set)
+        )
+        return ((np.outer(hashes, a) + b) % prime).min(axis=0)
+
+    def _similar(self, first_text: str, second_text: str, first: Set[str], second: Set[str]) -> bool:
+        """Check a candidate pair; answers citing different numbers are never merged."""
+        if _NUMBER_PATTERN.findall(first_text) != _NUMBER_PATTERN.findall(second_text):
+            return False
+        return jaccard(first, second) >= self.threshold
+
+    def group(self, answers: Sequence[StudentAnswer]) -> List[AnswerGroup]:
+        """
+        Group near-identical answers.
+
+        Answers with the same normalized text are grouped directly; distinct texts are
+        compared only when their MinHash signatures collide in an LSH band, and are
+        grouped if their shingle Jaccard similarity reaches the threshold and they
+        contain the same numbers.
+
+        Args:
+            answers: Student answers
+
+        Returns:
+            Groups ordered by size (largest first), then by first appearance
+        """
+        # Exact duplicates after normalization share one entry
+        by_text: Dict[str, List[int]] = defaultdict(list)
+        for index, answer in enumerate(answers):
+            by_text[normalize_answer(answer.answer_text)].append(index)
+        texts = list(by_text)
+
+        shingle_sets = [shingles(text) for text in texts]
+        union_find = _UnionFind(len(texts))
+        buckets: Dict[tuple, List[int]] = defaultdict(list)
+        for index, shingle_set in enumerate(shingle_sets):
+            signature = self._signature(shingle_set)
+            for band in range(self.bands):
+                key = (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                for other in buckets[key]:
+                    if union_find.find(other) != union_find.find(index) and \
+                            self._similar(texts[other], texts[index], shingle_sets[other], shingle_set):
+                        union_find.union(other, index)
+                buckets[key].append(index)
+
+        members: Dict[int, List[int]] = defaultdict(list)
+        for text_index, text in enumerate(texts):
+            members[union_find.find(text_index)].extend(by_text[text])
+
+        groups = []
+        for answer_indices in members.values():
+            answer_indices.sort()
+            grouped = [answers[i] for i in answer_indices]
+            # Most common original wording represents the group; Counter keeps first-seen order for ties
+            wording = Counter(answer.answer_text.strip() for answer in grouped)
+            representative = wording.most_common(1)[0][0]
+            groups.append((answer_indices[0], AnswerGroup(representative, grouped)))
+
+        groups.sort(key=lambda item: (-item[1].count, item[0]))
+        return [group for _, group in groups]
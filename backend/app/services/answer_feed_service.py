@@ -0,0 +1,77 @@
+"""
+Answer feed service layer.
+This module pushes committed answers and live answer counts to teachers watching a question.
+"""
+
+from typing import Any, Dict, Optional
+
+from ..database.repositories.answer_repository import AnswerRepository
+from ..utils.broker import EventBroker, Subscription
+
+# Feed event names
+ANSWER_CREATED_EVENT = "answer.created"
+ANSWER_UPDATED_EVENT = "answer.updated"
+QUESTION_CLOSED_EVENT = "question.closed"
+QUESTION_DELETED_EVENT = "question.deleted"
+
+
+class AnswerFeedService:
+    """Service class for the per-question answer feed.
+
+    Its handlers republish the domain events on a broker topic per question.
+    Nothing is published, and no count is queried, for questions that no one
+    has watched.
+    """
+
+    def __init__(self, broker: EventBroker, answer_repo: AnswerRepository = None):
+        """
+        Initializes the feed.
+
+        Args:
+            broker: Broker fanning events out to the open streams
+            answer_repo: Answer repository instance (optional, creates one if not provided)
+        """
+        self.broker = broker
+        self.answer_repo = answer_repo or AnswerRepository()
+
+    @staticmethod
+    def topic(question_id: int) -> tuple:
+        """Broker topic of a question's feed."""
+        return ("answers", question_id)
+
+    def subscribe(self, question_id: int, cursor: Optional[int] = None) -> Subscription:
+        """
+        Open a subscription to a question's feed on the running event loop.
+
+        Args:
+            question_id: Question ID
+            cursor: Last event ID the client saw, to replay what it missed
+
+        Returns:
+            The subscription
+        """
+        return self.broker.subscribe(self.topic(question_id), cursor)
+
+    def on_answer_submitted(self, db, question_id: int, answer: Optional[Dict[str, Any]] = None,
+                            created: bool = True, **payload: Any) -> None:
+        """Publish a committed answer with the question's new answer count."""
+        topic = self.topic(question_id)
+        if answer is None or not self.broker.has_topic(topic):
+            return
+        self.broker.publish(topic, ANSWER_CREATED_EVENT if created else ANSWER_UPDATED_EVENT, {
+            "answer": answer,
+            "answer_count": self.answer_repo.count_by_question_id(db, question_id)
+        })
+
+    def on_question_closed(self, question_id: int, **payload: Any) -> None:
+        """Tell watchers that the question no longer accepts answers."""
+        topic = self.topic(question_id)
+        if self.broker.has_topic(topic):
+            self.broker.publish(topic, QUESTION_CLOSED_EVENT, {"question_id": question_id})
+
+    def on_question_deleted(self, question_id: int, **payload: Any) -> None:
+        """Tell watchers that the question is gone and end their streams."""
+        topic = self.topic(question_id)
+        if self.broker.has_topic(topic):
+            self.broker.publish(topic, QUESTION_DELETED_EVENT, {"question_id": question_id})
+            self.broker.close_topic(topic)
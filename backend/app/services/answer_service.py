@@ -6,18 +6,14 @@ This module handles business logic for answer operations.
 from typing import List, Dict, Any, Optional
 from fastapi import HTTPException
 
-try:
-    from app.database.repositories.answer_repository import AnswerRepository
-    from .question_service import QuestionService
-    from .student_service import StudentService
-except ImportError:
-    # Fallback for direct execution
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from app.database.repositories.answer_repository import AnswerRepository
-    from .question_service import QuestionService
-    from .student_service import StudentService
+from app.database.repositories.answer_repository import AnswerRepository
+from app.database.models.answer import Answer
+from .question_service import QuestionService
+from .student_service import StudentService
+from app.utils.events import events, ANSWER_SUBMITTED
+
+# Columns of the teacher's answer list; rows are read without building ORM objects
+ANSWER_LIST_COLUMNS = (Answer.id, Answer.question_id, Answer.student_id, Answer.text, Answer.timestamp)
 
 
 class AnswerService:
@@ -40,7 +36,8 @@ class AnswerService:
         """
         Core Logic: Handles the submission/update flow.
         Checks if the question is open and the student ID is valid, then calls the repository
-        to UPSERT (Update or Insert) the answer based on the unique constraint (question_id, student_id).
+        to UPSERT (Update or Insert) the answer based on the unique constraint (question_id, student_id)
+        and publishes an answer.submitted event carrying the answer and whether it was created.
         
         Args:
             db: Database session
@@ -84,8 +81,13 @@ class AnswerService:
         }
         
         # Create or update answer
-        answer = self.answer_repo.upsert(db, answer_data)
-        return self._answer_to_dict(answer)
+        answer, created = self.answer_repo.upsert_with_status(db, answer_data)
+        answer_dict = self._answer_to_dict(answer)
+        events.publish(
+            ANSWER_SUBMITTED, db=db, question_id=answer.question_id, student_id=student_id,
+            answer=answer_dict, created=created
+        )
+        return answer_dict
     
     def get_answers_for_question(self, db, question_id: int) -> List[Dict[str, Any]]:
         """
@@ -104,9 +106,10 @@ class AnswerService:
         # Check if question exists
         self.question_service.get_question_by_id(db, question_id)
         
-        # Get answers for question
-        answers = self.answer_repo.get_by_question_id(db, question_id)
-        return [self._answer_to_dict(answer) for answer in answers]
+        # Get answers for question, resolving student names from one roster read
+        answers = self.answer_repo.get_by_question_id(db, question_id, columns=ANSWER_LIST_COLUMNS)
+        student_names = {s.get("id"): s.get("name") for s in self.student_service.get_all_students()}
+        return [self._answer_to_dict(answer, student_names) for answer in answers]
     
     def get_answer_by_access_code_and_student(self, db, access_code: str, student_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -123,27 +126,31 @@ class AnswerService:
         answer = self.answer_repo.get_by_access_code_and_student(db, access_code, student_id)
         return self._answer_to_dict(answer) if answer else None
     
-    def _answer_to_dict(self, answer) -> Dict[str, Any]:
+    def _answer_to_dict(self, answer, student_names: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """
         Convert SQLAlchemy answer object to dictionary.
         
         Args:
-            answer: SQLAlchemy answer object
+            answer: SQLAlchemy answer object, or a row with the same columns
+            student_names: Optional student ID to name map, used instead of a roster lookup
             
         Returns:
-            Answer dictionary with student name included
+            Answer dictionary with student name included, holding only JSON primitives
         """
         if not answer:
             return None
         
         # Get student name
         student_name = None
-        try:
-            student = self.student_service.get_student_by_id(answer.student_id)
-            student_name = student.get("name") if student else None
-        except HTTPException:
-            # If student not found, keep name as None
-            student_name = None
+        if student_names is not None:
+            student_name = student_names.get(answer.student_id)
+        else:
+            try:
+                student = self.student_service.get_student_by_id(answer.student_id)
+                student_name = student.get("name") if student else None
+            except HTTPException:
+                # If student not found, keep name as None
+                student_name = None
         
         return {
             "id": answer.id,
@@ -0,0 +1,142 @@
+"""
+Batch summary service layer.
+This module summarizes many questions concurrently on a bounded pool and yields each result as it completes.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from ..database.repositories.question_repository import QuestionRepository
+from ..utils.resilience import BulkheadFullError, CircuitOpenError
+from .question_summary_service import QuestionSummaryService
+
+# Question status filters accepted when no question IDs are given
+STATUS_FILTERS = {"open": False, "closed": True, "all": None}
+
+
+class BatchSummaryService:
+    """Service class for summarizing many questions in one request."""
+
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+    def __init__(self, question_summary_service: QuestionSummaryService, question_repo: QuestionRepository = None,
+                 session_factory=None, max_concurrency: int = 4, max_questions: int = 500):
+        """
+        Initializes the batch service.
+
+        Args:
+            question_summary_service: Service that summarizes one question's stored answers
+            question_repo: Question repository instance (optional, creates one if not provided)
+            session_factory: Callable returning a new database session for worker threads
+            max_concurrency: Maximum number of questions summarized at the same time
+            max_questions: Maximum number of questions in one batch
+        """
+        if session_factory is None:
+            from ..database.config import SessionLocal
+            session_factory = SessionLocal
+
+        self.question_summary_service = question_summary_service
+        self.question_repo = question_repo or QuestionRepository()
+        self.session_factory = session_factory
+        self.max_concurrency = max_concurrency
+        self.max_questions = max_questions
+
+    def resolve_question_ids(self, db, question_ids: Optional[List[int]] = None, status_filter: str = "closed") -> List[int]:
+        """
+        Gets the questions to summarize.
+
+        Args:
+            db: Database session
+            question_ids: Explicit question IDs; duplicates are dropped, unknown IDs are kept and fail individually
+            status_filter: Used when no IDs are given: open, closed or all
+
+        Returns:
+            Question IDs in request (or ID) order
+
+        Raises:
+            HTTPException: If the filter is invalid or the batch is too large
+        """
+        if question_ids is not None:
+            ids = list(dict.fromkeys(question_ids))
+        else:
+            if status_filter not in STATUS_FILTERS:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid status '{status_filter}', expected one of: {', '.join(STATUS_FILTERS)}"
+                )
+            ids = self.question_repo.get_ids_by_status(db, STATUS_FILTERS[status_filter])
+
+        if len(ids) > self.max_questions:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Too many questions in one batch ({len(ids)}), the maximum is {self.max_questions}"
+            )
+        return ids
+
+    def summarize_one(self, question_id: int, summary_instructions: str) -> Dict[str, Any]:
+        """
+        Summarizes one question on its own database session, turning failures into a result.
+
+        Runs the incremental path, so a stored summary whose answers have not changed
+        is returned without calling the AI provider.
+
+        Args:
+            question_id: Question ID
+            summary_instructions: Instructions for how to summarize
+
+        Returns:
+            Result dictionary with the question ID and status, and the summary or error
+        """
+        db = self.session_factory()
+        try:
+            result = self.question_summary_service.summarize_question(db, question_id, summary_instructions, True)
+            return {"status": self.COMPLETED, **result}
+        except HTTPException as e:
+            return self._failure(question_id, e.status_code, e.detail)
+        except BulkheadFullError as e:
+            return self._failure(question_id, 429, str(e))
+        except CircuitOpenError as e:
+            return self._failure(question_id, 503, str(e))
+        except Exception as e:
+            print(f"Batch summary failed for question {question_id}: {str(e)}")
+            return self._failure(question_id, 500, f"Failed to generate summary: {str(e)}")
+        finally:
+            db.close()
+
+    async def summarize_many(self, question_ids: List[int], summary_instructions: str,
+                             max_concurrency: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Summarizes questions concurrently, yielding each result as soon as it completes.
+
+        Questions not yet started are cancelled when the consumer stops iterating,
+        for example because the client disconnected.
+
+        Args:
+            question_ids: Question IDs
+            summary_instructions: Instructions for how to summarize
+            max_concurrency: Optional lower concurrency limit for this batch
+
+        Yields:
+            Result dictionaries in completion order
+        """
+        limit = min(max_concurrency or self.max_concurrency, self.max_concurrency)
+        semaphore = asyncio.Semaphore(max(1, limit))
+
+        async def run(question_id: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await run_in_threadpool(self.summarize_one, question_id, summary_instructions)
+
+        tasks = [asyncio.ensure_future(run(question_id)) for question_id in question_ids]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @classmethod
+    def _failure(cls, question_id: int, status_code: int, detail: str) -> Dict[str, Any]:
+        return {"question_id": question_id, "status": cls.FAILED, "status_code": status_code, "error": detail}
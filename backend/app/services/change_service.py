@@ -0,0 +1,129 @@
+"""
+Change feed service layer.
+This module serves the change log to clients syncing incrementally and compacts old entries.
+"""
+
+import json
+import threading
+from datetime import timedelta
+from typing import Any, Dict, Optional
+from fastapi import HTTPException
+
+from ..database.repositories.change_repository import ChangeRepository
+from ..utils.timezone import now_israel
+
+
+class ChangeService:
+    """Service class for the change feed."""
+    
+    def __init__(self, change_repo: ChangeRepository = None, retention: int = 10000,
+                 max_age_hours: float = 24.0, compact_interval: int = 500):
+        """
+        Initializes the service.
+        
+        Args:
+            change_repo: Change repository instance (optional, creates one if not provided)
+            retention: Number of newest changes always kept by compaction
+            max_age_hours: Age after which changes are compacted even within the retention count (0 disables)
+            compact_interval: Writes between compactions triggered by on_write
+        """
+        self.change_repo = change_repo or ChangeRepository()
+        self.retention = retention
+        self.max_age_hours = max_age_hours
+        self.compact_interval = compact_interval
+        self._lock = threading.Lock()
+        self._writes = 0
+    
+    def get_changes(self, db, since: int, limit: int) -> Dict[str, Any]:
+        """
+        Gets the changes after a cursor.
+        
+        Args:
+            db: Database session
+            since: Sequence number of the last change the client applied (0 for none)
+            limit: Maximum number of changes to return
+            
+        Returns:
+            Dictionary with the changes, the cursor to pass next, whether more
+            changes are waiting and the newest sequence number
+            
+        Raises:
+            HTTPException: 410 if changes after the cursor were compacted away, or the
+                cursor is ahead of the log (e.g. the database was reset); the client
+                must reload its lists and continue from X-Latest-Seq
+        """
+        oldest, newest = self.change_repo.get_bounds(db)
+        latest = newest or 0
+        if since > latest or (oldest is not None and since < oldest - 1):
+            raise HTTPException(
+                status_code=410,
+                detail="Change cursor is no longer valid, reload the data and sync from X-Latest-Seq",
+                headers={"X-Latest-Seq": str(latest)}
+            )
+        
+        changes = self.change_repo.get_since(db, since, limit + 1)
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        return {
+            "changes": [self._change_to_dict(change) for change in changes],
+            "next_since": changes[-1].seq if changes else since,
+            "has_more": has_more,
+            "latest_seq": latest
+        }
+    
+    def compact(self, db) -> int:
+        """
+        Deletes changes beyond the retention count or older than the maximum age.
+        The newest change is always kept, so the log still knows its position.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            Number of changes deleted
+        """
+        oldest, newest = self.change_repo.get_bounds(db)
+        if newest is None:
+            return 0
+        
+        horizon = newest - self.retention
+        if self.max_age_hours > 0:
+            cutoff = now_israel() - timedelta(hours=self.max_age_hours)
+            horizon = max(horizon, self.change_repo.get_last_seq_before(db, cutoff) or 0)
+        horizon = min(horizon, newest - 1)
+        if horizon < oldest:
+            return 0
+        return self.change_repo.delete_through(db, horizon)
+    
+    def on_write(self, db, **payload: Any) -> None:
+        """Counts a committed write and compacts every compact_interval writes."""
+        with self._lock:
+            self._writes += 1
+            due = self._writes % self.compact_interval == 0
+        if due:
+            try:
+                deleted = self.compact(db)
+                if deleted:
+                    print(f"Compacted {deleted} changes")
+            except Exception as e:
+                print(f"Change log compaction failed: {str(e)}")
+    
+    def _change_to_dict(self, change) -> Dict[str, Any]:
+        """
+        Convert SQLAlchemy change object to dictionary.
+        
+        Args:
+            change: SQLAlchemy change object
+            
+        Returns:
+            Change dictionary with the entity snapshot decoded
+        """
+        return {
+            "seq": change.seq,
+            "entity": change.entity,
+            "entity_id": change.entity_id,
+            "op": change.op,
+            "question_id": change.question_id,
+            "data": json.loads(change.data) if change.data else None,
+            "created_at": change.created_at.isoformat() if change.created_at else None
+        }
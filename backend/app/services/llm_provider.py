@@ -0,0 +1,256 @@
+"""
+LLM provider layer.
+This module hides the wire format of the chat completion API behind a small provider interface.
+"""
+
+import json
+import threading
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Type
+
+from ..utils.resilience import UpstreamError, ProviderNotConfiguredError, parse_retry_after
+
+if TYPE_CHECKING:
+    # requests is imported on first use, keeping it out of the application's startup
+    import requests
+
+
+class LLMProvider(ABC):
+    """Interface for chat completion providers.
+
+    A provider makes single attempts only; retries, circuit breaking and
+    concurrency limits are applied around it by the AI services.
+    """
+
+    name = "base"
+
+    def __init__(self, config):
+        """
+        Initialize the provider.
+
+        Args:
+            config: AI configuration; read on every call so that setting changes apply immediately
+        """
+        self.config = config
+
+    @abstractmethod
+    def complete(self, messages: List[dict], json_response: bool = False) -> Any:
+        """
+        Make one chat completion request.
+
+        Args:
+            messages: Chat messages with role and content
+            json_response: Whether to request and parse a JSON object response
+
+        Returns:
+            str or dict: The response content, parsed as JSON if json_response=True
+
+        Raises:
+            UpstreamError: If the request fails in a way that may be retried
+            ValueError: If the response cannot be used
+        """
+
+    @abstractmethod
+    def open_stream(self, messages: List[dict]) -> Any:
+        """
+        Open a streamed chat completion.
+
+        Args:
+            messages: Chat messages with role and content
+
+        Returns:
+            A stream handle for iter_stream
+
+        Raises:
+            UpstreamError: If the stream could not be opened
+        """
+
+    @abstractmethod
+    def iter_stream(self, stream: Any, cancel_event: Optional[threading.Event] = None) -> Iterator[str]:
+        """
+        Yield the content deltas of an open stream, closing it when done or cancelled.
+
+        Args:
+            stream: Handle returned by open_stream
+            cancel_event: Optional event that stops the stream
+
+        Yields:
+            str: Content deltas in generation order
+        """
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Provider for any server implementing the OpenAI chat completions API at OPENAI_BASE_URL."""
+
+    name = "openai"
+
+    def build_request(self, messages: List[dict], json_response: bool = False,
+                      stream: bool = False) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Build the URL, headers and body of a chat completions request.
+
+        Args:
+            messages: List of message objects for the API
+            json_response: Whether to request a JSON object response
+            stream: Whether to request a streamed (SSE) response
+
+        Returns:
+            tuple: URL, headers and JSON body
+
+        Raises:
+            ProviderNotConfiguredError: If the API key is not configured
+        """
+        if not self.config.OPENAI_API_KEY:
+            raise ProviderNotConfiguredError("OPENAI_API_KEY environment variable is required")
+
+        headers = {
+            "Authorization": f"Bearer {self.config.OPENAI_API_KEY}",
+            "Content-Type": "application/json"
+        }
+
+        data = {
+            "model": self.config.OPENAI_MODEL,
+            "messages": messages,
+            "temperature": self.config.OPENAI_TEMPERATURE,
+            "max_tokens": self.config.OPENAI_MAX_TOKENS
+        }
+
+        # For JSON responses, add the response format parameter
+        if json_response:
+            data["response_format"] = {"type": "json_object"}
+            data["temperature"] = 0.3  # Lower temperature for more deterministic results
+            data["max_tokens"] = 500   # Smaller response size needed
+
+        if stream:
+            data["stream"] = True
+
+        url = f"{self.config.OPENAI_BASE_URL.rstrip('/')}/chat/completions"
+        return url, headers, data
+
+    @staticmethod
+    def post(url: str, headers: Dict[str, str], data: Dict[str, Any], timeout: float, stream: bool = False) -> "requests.Response":
+        """Send a request to the provider, raising UpstreamError for failed responses.
+
+        Raises:
+            UpstreamError: On connection errors, timeouts and error status codes
+        """
+        import requests
+
+        try:
+            response = requests.post(url, headers=headers, json=data, timeout=timeout, stream=stream)
+        except requests.exceptions.RequestException as e:
+            raise UpstreamError(f"OpenAI API request failed: {str(e)}")
+
+        if response.status_code >= 400:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            reason = response.reason
+            response.close()
+            raise UpstreamError(
+                f"OpenAI API request failed: {response.status_code} {reason}",
+                status_code=response.status_code,
+                retry_after=retry_after
+            )
+        return response
+
+    def complete(self, messages: List[dict], json_response: bool = False) -> Any:
+        import requests
+
+        url, headers, data = self.build_request(messages, json_response)
+        response = self.post(url, headers, data, timeout=self.config.AI_REQUEST_TIMEOUT_SECONDS)
+
+        try:
+            result = response.json()
+            if not result.get("choices") or not result["choices"][0].get("message", {}).get("content"):
+                raise ValueError("Empty response from OpenAI API")
+
+            content = result["choices"][0]["message"]["content"].strip()
+
+            # Parse JSON if requested
+            if json_response:
+                try:
+                    return json.loads(content)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Failed to parse JSON response: {str(e)}")
+
+            return content
+
+        except requests.exceptions.RequestException as e:
+            raise UpstreamError(f"OpenAI API request failed: {str(e)}")
+        except (KeyError, IndexError) as e:
+            raise ValueError(f"Invalid response format from OpenAI API: {str(e)}")
+
+    def open_stream(self, messages: List[dict]) -> "requests.Response":
+        url, headers, data = self.build_request(messages, stream=True)
+        return self.post(url, headers, data, timeout=self.config.AI_REQUEST_TIMEOUT_SECONDS, stream=True)
+
+    def iter_stream(self, stream: "requests.Response", cancel_event: Optional[threading.Event] = None) -> Iterator[str]:
+        """Parse a chat completions SSE response into content deltas."""
+        import requests
+
+        try:
+            for line in stream.iter_lines(decode_unicode=True):
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                if not line or not line.startswith("data:"):
+                    continue
+
+                payload = line[len("data:"):].strip()
+                if payload == "[DONE]":
+                    return
+
+                chunk = json.loads(payload)
+                delta = chunk["choices"][0].get("delta", {}).get("content")
+                if delta:
+                    yield delta
+        except requests.exceptions.RequestException as e:
+            raise UpstreamError(f"OpenAI API request failed: {str(e)}")
+        except (json.JSONDecodeError, KeyError, IndexError) as e:
+            raise ValueError(f"Invalid stream format from OpenAI API: {str(e)}")
+        finally:
+            # Closing the response drops the upstream connection, which stops generation
+            stream.close()
+
+
+class LocalProvider(LLMProvider):
+    """The offline provider: summaries come from the local extractive summarizer and searches from the TF-IDF index.
+
+    The AI services check for it and take their local paths before building a
+    prompt. It has no chat completion API, so a call that still reaches it
+    fails as unconfigured, which the services answer locally when fallback is on.
+    """
+
+    name = "local"
+
+    def complete(self, messages: List[dict], json_response: bool = False) -> Any:
+        raise ProviderNotConfiguredError("The local provider has no chat completion API")
+
+    def open_stream(self, messages: List[dict]) -> Any:
+        raise ProviderNotConfiguredError("The local provider has no chat completion API")
+
+    def iter_stream(self, stream: Any, cancel_event: Optional[threading.Event] = None) -> Iterator[str]:
+        return iter(())
+
+
+# Registered providers by AI_PROVIDER name
+LLM_PROVIDERS: Dict[str, Type[LLMProvider]] = {
+    OpenAICompatibleProvider.name: OpenAICompatibleProvider,
+    LocalProvider.name: LocalProvider,
+}
+
+
+def create_provider(config) -> LLMProvider:
+    """
+    Create the provider selected by AI_PROVIDER.
+
+    Args:
+        config: AI configuration
+
+    Returns:
+        Provider instance
+
+    Raises:
+        ValueError: If the provider name is unknown
+    """
+    provider_class = LLM_PROVIDERS.get(config.AI_PROVIDER)
+    if provider_class is None:
+        raise ValueError(f"Unknown AI_PROVIDER '{config.AI_PROVIDER}', expected one of: {', '.join(LLM_PROVIDERS)}")
+    return provider_class(config)
@@ -0,0 +1,191 @@
+"""
+Local extractive summarizer.
+This module summarizes student answers on the CPU with TextRank over TF-IDF sentence vectors,
+so summaries are available without an AI provider.
+"""
+
+import re
+from collections import Counter
+from typing import List, Sequence, Tuple
+
+from ..models.ai_models import StudentAnswer
+from .answer_dedup import AnswerDeduplicator
+from .search_index import tokenize
+
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Filler words common in student answers, on top of the search stopwords
+_FILLER_WORDS = frozenset("""
+i me my we our you your he she they them their its not no so but if then than there these those has have had
+can will would should could just also very really think because about into some all more most other like
+""".split())
+
+
+def content_terms(text: str) -> List[str]:
+    """
+    Get the meaningful terms of a text.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        Terms without stopwords and filler words
+    """
+    return [term for term in tokenize(text) if term not in _FILLER_WORDS]
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split an answer into sentences.
+
+    Args:
+        text: Answer text
+
+    Returns:
+        Non-empty sentences with whitespace collapsed
+    """
+    text = _WHITESPACE_PATTERN.sub(" ", text or "").strip()
+    return [sentence for sentence in _SENTENCE_PATTERN.split(text) if sentence]
+
+
+class LocalSummarizer:
+    """Extractive summarizer: weighted TextRank for main points, term frequency for keywords."""
+
+    def __init__(self, max_points: int = 5, max_keywords: int = 8, max_sentences: int = 2000,
+                 max_terms: int = 2000, damping: float = 0.85, redundancy: float = 0.6,
+                 min_terms: int = 2, deduplicator: AnswerDeduplicator = None):
+        """
+        Initialize the summarizer.
+
+        Args:
+            max_points: Maximum number of sentences in the summary
+            max_keywords: Maximum number of keywords listed
+            max_sentences: Sentences ranked at most; the largest answer groups are kept first
+            max_terms: Vocabulary size cap, keeping the most frequent terms
+            damping: TextRank damping factor
+            redundancy: Cosine similarity above which a sentence repeats an earlier point
+            min_terms: Meaningful terms a sentence needs to be a main point
+            deduplicator: Groups near-duplicate answers so repeated answers count once, with a weight
+        """
+        self.max_points = max_points
+        self.max_keywords = max_keywords
+        self.max_sentences = max_sentences
+        self.max_terms = max_terms
+        self.damping = damping
+        self.redundancy = redundancy
+        self.min_terms = min_terms
+        self.deduplicator = deduplicator or AnswerDeduplicator()
+
+    def keywords(self, answers: Sequence[StudentAnswer]) -> List[Tuple[str, int]]:
+        """
+        Get the terms used by the most answers.
+
+        Args:
+            answers: Student answers
+
+        Returns:
+            (term, number of answers using it) pairs, most used first
+        """
+        frequency = Counter()
+        for answer in answers:
+            frequency.update(set(content_terms(answer.answer_text)))
+        return frequency.most_common(self.max_keywords)
+
+    def main_points(self, answers: Sequence[StudentAnswer]) -> List[Tuple[str, int]]:
+        """
+        Rank answer sentences with TextRank weighted by how many students gave each answer.
+
+        Args:
+            answers: Student answers
+
+        Returns:
+            (sentence, number of students making that point) pairs, most central first
+        """
+        sentences: List[str] = []
+        documents: List[List[str]] = []
+        weights: List[int] = []
+        for group in self.deduplicator.group(answers):
+            for sentence in split_sentences(group.representative):
+                terms = content_terms(sentence)
+                if len(terms) >= self.min_terms:
+                    sentences.append(sentence)
+                    documents.append(terms)
+                    weights.append(group.count)
+            if len(sentences) >= self.max_sentences:
+                break
+        if not sentences:
+            return []
+
+        # Imported here, where it is first needed, to keep NumPy out of the application's startup
+        import numpy as np
+        term_counts = Counter(term for terms in documents for term in set(terms))
+        vocabulary = {term: column for column, (term, _) in enumerate(term_counts.most_common(self.max_terms))}
+
+        counts = np.zeros((len(sentences), max(1, len(vocabulary))), dtype=np.float32)
+        for row, terms in enumerate(documents):
+            for term in terms:
+                column = vocabulary.get(term)
+                if column is not None:
+                    counts[row, column] += 1
+
+        document_frequency = np.count_nonzero(counts, axis=0)
+        idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1
+        vectors = np.log1p(counts) * idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        vectors /= norms
+
+        # TextRank: random walk over the sentence similarity graph, restarting in
+        # proportion to how many students gave each answer
+        similarity = vectors @ vectors.T
+        np.fill_diagonal(similarity, 0)
+        out_weight = similarity.sum(axis=1, keepdims=True)
+        out_weight[out_weight == 0] = 1
+        transition = similarity / out_weight
+        restart = np.asarray(weights, dtype=np.float32)
+        restart /= restart.sum()
+        rank = restart.copy()
+        for _ in range(30):
+            updated = (1 - self.damping) * restart + self.damping * (transition.T @ rank)
+            if np.abs(updated - rank).sum() < 1e-6:
+                rank = updated
+                break
+            rank = updated
+
+        # Greedy selection that skips sentences repeating an already chosen point
+        chosen: List[int] = []
+        for index in np.argsort(-rank, kind="stable"):
+            if len(chosen) >= self.max_points:
+                break
+            if all(similarity[index, other] < self.redundancy for other in chosen):
+                chosen.append(int(index))
+
+        # A point's support counts every student with a sentence close to it
+        weight_vector = np.asarray(weights, dtype=np.int64)
+        support = (similarity[chosen] >= self.redundancy) @ weight_vector + weight_vector[chosen]
+        return [(sentences[i], int(min(count, len(answers)))) for i, count in zip(chosen, support)]
+
+    def summarize(self, answers: Sequence[StudentAnswer]) -> str:
+        """
+        Summarize student answers.
+
+        Args:
+            answers: Student answers
+
+        Returns:
+            Plain-text summary listing the key terms and main points
+        """
+        lines = [f"Summary of {len(answers)} answers (generated locally)."]
+
+        keywords = self.keywords(answers)
+        if keywords:
+            lines.append("Key terms: " + ", ".join(f"{term} ({count})" for term, count in keywords))
+
+        points = self.main_points(answers)
+        if points:
+            lines.append("Main points:")
+            for sentence, count in points:
+                students = "student" if count == 1 else "students"
+                lines.append(f"- {sentence} ({count} {students})")
+        return "\n".join(lines)
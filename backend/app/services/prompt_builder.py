@@ -0,0 +1,346 @@
+"""
+Prompt building layer for AI requests.
+This module counts tokens, encodes request data compactly and enforces a token budget.
+"""
+
+import hashlib
+import math
+import re
+from typing import Any, List, Dict, Optional, Tuple
+
+from ..models.ai_models import SummarizationRequest, SummarizationContext, StudentAnswer, SmartSearchRequest, QuestionItem, PromptUsage
+from .answer_dedup import AnswerDeduplicator
+
+# Words, numbers and single punctuation marks - roughly how BPE tokenizers split text
+_PIECE_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Average characters per BPE token for English words
+_CHARS_PER_TOKEN = 4
+
+# Overhead tokens the chat format adds per message (role markers, separators)
+_TOKENS_PER_MESSAGE = 4
+
+
+class TokenCounter:
+    """Counts tokens with tiktoken when available, otherwise with a BPE-like heuristic."""
+
+    def __init__(self, model: str = "gpt-3.5-turbo"):
+        """
+        Initialize the counter for a model.
+
+        Args:
+            model: Model name used to pick the tiktoken encoding
+        """
+        self.model = model
+        # Resolved on the first count, so building a counter neither imports tiktoken
+        # nor loads (and possibly downloads) the encoding during application startup
+        self._encoding: Any = None
+        self._encoding_resolved = False
+
+    def _get_encoding(self) -> Any:
+        """Get the tiktoken encoding of the model, or None when tiktoken is not installed."""
+        if not self._encoding_resolved:
+            try:
+                import tiktoken  # Optional: exact BPE token counts when installed
+            except ImportError:
+                tiktoken = None
+            if tiktoken is not None:
+                try:
+                    self._encoding = tiktoken.encoding_for_model(self.model)
+                except KeyError:
+                    self._encoding = tiktoken.get_encoding("cl100k_base")
+            self._encoding_resolved = True
+        return self._encoding
+
+    def count(self, text: str) -> int:
+        """
+        Count the tokens in a piece of text.
+
+        Args:
+            text: Text to count
+
+        Returns:
+            Number of tokens
+        """
+        if not text:
+            return 0
+        encoding = self._get_encoding()
+        if encoding is not None:
+            return len(encoding.encode(text))
+
+        # Heuristic fallback: short words are one token, long words split every ~4 chars
+        return sum(
+            max(1, math.ceil(len(piece) / _CHARS_PER_TOKEN))
+            for piece in _PIECE_PATTERN.findall(text)
+        )
+
+    def count_messages(self, messages: List[Dict[str, str]]) -> int:
+        """
+        Count the prompt tokens of a list of chat messages.
+
+        Args:
+            messages: Chat messages with role and content
+
+        Returns:
+            Number of prompt tokens including per-message overhead
+        """
+        return sum(self.count(m["content"]) + _TOKENS_PER_MESSAGE for m in messages)
+
+
+def compact_text(text: str) -> str:
+    """
+    Collapse whitespace and escape the row delimiter so text fits on one row.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        Single-line text safe for pipe-delimited rows
+    """
+    return _WHITESPACE_PATTERN.sub(" ", text or "").strip().replace("|", "/")
+
+
+def _stable_rank(value: str) -> str:
+    """Deterministic sort key used to sample rows independently of input order."""
+    return hashlib.sha1(value.encode("utf-8")).hexdigest()
+
+
+class PromptBuilder:
+    """Builds compact, budget-limited prompts for the AI services."""
+
+    def __init__(self, token_budget: int, max_answer_tokens: int, model: str = "gpt-3.5-turbo",
+                 deduplicator: Optional[AnswerDeduplicator] = None, max_group_names: int = 3):
+        """
+        Initialize the builder.
+
+        Args:
+            token_budget: Hard limit on prompt tokens per request
+            max_answer_tokens: Tokens kept per answer once the budget is exceeded
+            model: Model name used for token counting
+            deduplicator: Collapses near-duplicate answers into one row when provided
+            max_group_names: Student names listed on a collapsed row before '+N more'
+        """
+        self.token_budget = token_budget
+        self.max_answer_tokens = max_answer_tokens
+        self.counter = TokenCounter(model)
+        self.deduplicator = deduplicator
+        self.max_group_names = max_group_names
+
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text down to roughly max_tokens tokens."""
+        if self.counter.count(text) <= max_tokens:
+            return text
+        words = text.split(" ")
+        kept: List[str] = []
+        used = 0
+        for word in words:
+            used += self.counter.count(word)
+            if used > max_tokens:
+                break
+            kept.append(word)
+        return " ".join(kept) + "..."
+
+    def _fit_rows(self, rows: List[Tuple[str, str]], available: int,
+                  weights: Optional[List[int]] = None) -> Tuple[List[str], bool]:
+        """
+        Fit (sample_key, row) pairs into the available tokens.
+
+        Rows that do not fit are dropped in a deterministic order derived from
+        their weight (heaviest kept first) and sample key, and the kept rows stay
+        in their original order.
+
+        Returns:
+            Kept rows and whether any row was dropped
+        """
+        costs = [self.counter.count(row) + 1 for _, row in rows]  # +1 for the newline
+        if sum(costs) <= available:
+            return [row for _, row in rows], False
+
+        weights = weights or [1] * len(rows)
+        ranked = sorted(range(len(rows)), key=lambda i: (-weights[i], _stable_rank(rows[i][0])))
+        keep = set()
+        used = 0
+        for i in ranked:
+            if used + costs[i] > available:
+                continue
+            keep.add(i)
+            used += costs[i]
+        return [rows[i][1] for i in range(len(rows)) if i in keep], True
+
+    def _answer_rows(self, answers: List[StudentAnswer]) -> Tuple[List[Tuple[str, str]], List[int]]:
+        """
+        Encode answers as (sample_key, 'name|answer') rows with their weights.
+
+        With a deduplicator, near-identical answers share one row whose name field
+        reads 'N students (A, B, C +2 more)', and the row weight is the group size.
+
+        Returns:
+            Rows and the number of answers each row stands for
+        """
+        if self.deduplicator is None:
+            rows = [
+                (f"{a.student_id}:{a.answer_text}", f"{compact_text(a.student_name)}|{compact_text(a.answer_text)}")
+                for a in answers
+            ]
+            return rows, [1] * len(rows)
+
+        rows = []
+        weights = []
+        for group in self.deduplicator.group(answers):
+            first = group.answers[0]
+            if group.count == 1:
+                names = compact_text(first.student_name)
+            else:
+                shown = ", ".join(compact_text(name) for name in group.student_names[:self.max_group_names])
+                hidden = group.count - self.max_group_names
+                more = f" +{hidden} more" if hidden > 0 else ""
+                names = f"{group.count} students ({shown}{more})"
+            rows.append((f"{first.student_id}:{group.representative}", f"{names}|{compact_text(group.representative)}"))
+            weights.append(group.count)
+        return rows, weights
+
+    def build_summary_messages(self, system_prompt: str, request: SummarizationRequest) -> Tuple[List[Dict[str, str]], PromptUsage]:
+        """
+        Build the chat messages for a summarization request.
+
+        Student and question IDs and submission timestamps are pruned, and the
+        answers are sent as 'name|answer' rows.
+
+        Args:
+            system_prompt: System prompt text
+            request: Summarization request
+
+        Returns:
+            Chat messages and the prompt usage record
+        """
+        context = request.context
+        total = len(request.student_answers)
+        rows, weights = self._answer_rows(request.student_answers)
+
+        def render(kept: List[str]) -> str:
+            return "\n".join([
+                f"Question: {compact_text(context.question_text)}",
+                f"Summary instructions: {compact_text(context.summary_instructions)}",
+                f"Student answers ({total} total, {len(kept)} lines), one per line as name|answer:",
+                *kept,
+            ])
+
+        return self._build(system_prompt, rows, render, total, weights)
+
+    def build_incremental_summary_messages(self, system_prompt: str, context: SummarizationContext, previous_summary: str,
+                                           answers: List[StudentAnswer], total_answers: int) -> Tuple[List[Dict[str, str]], PromptUsage]:
+        """
+        Build the chat messages that update a previous summary with new or changed answers.
+
+        Args:
+            system_prompt: System prompt text
+            context: Question context and summary instructions
+            previous_summary: Summary covering the earlier answers
+            answers: Answers added or changed since the previous summary
+            total_answers: Number of answers the updated summary covers
+
+        Returns:
+            Chat messages and the prompt usage record
+        """
+        total = len(answers)
+        rows, weights = self._answer_rows(answers)
+
+        def render(kept: List[str]) -> str:
+            return "\n".join([
+                f"Question: {compact_text(context.question_text)}",
+                f"Summary instructions: {compact_text(context.summary_instructions)}",
+                f"Class size after this update: {total_answers} answers",
+                "Previous summary:",
+                previous_summary.strip(),
+                f"New or changed answers ({total} total, {len(kept)} lines), one per line as name|answer:",
+                *kept,
+            ])
+
+        return self._build(system_prompt, rows, render, total, weights)
+
+    def build_search_messages(self, system_prompt: str, request: SmartSearchRequest) -> Tuple[List[Dict[str, str]], PromptUsage]:
+        """
+        Build the chat messages for a smart search request.
+
+        Args:
+            system_prompt: System prompt text
+            request: Smart search request
+
+        Returns:
+            Chat messages and the prompt usage record
+        """
+        total = len(request.available_questions)
+        rows = [
+            (str(q.id), f"{q.id}|{compact_text(q.text)}")
+            for q in request.available_questions
+        ]
+
+        def render(kept: List[str]) -> str:
+            return "\n".join([
+                f"Query: {compact_text(request.query)}",
+                "Available questions, one per line as id|text:",
+                *kept,
+            ])
+
+        return self._build(system_prompt, rows, render, total)
+
+    def build_batch_search_messages(self, system_prompt: str, queries: List[str],
+                                    questions: List[QuestionItem]) -> Tuple[List[Dict[str, str]], PromptUsage]:
+        """
+        Build the chat messages for several smart search queries answered in one prompt.
+
+        Queries are listed as q<number>|query, so they cannot be mistaken for question rows.
+
+        Args:
+            system_prompt: System prompt text
+            queries: Search queries, numbered from 1 in order
+            questions: Questions to search through
+
+        Returns:
+            Chat messages and the prompt usage record
+        """
+        rows = [(str(q.id), f"{q.id}|{compact_text(q.text)}") for q in questions]
+
+        def render(kept: List[str]) -> str:
+            return "\n".join([
+                "Queries, one per line as q<number>|query:",
+                *(f"q{number}|{compact_text(query)}" for number, query in enumerate(queries, start=1)),
+                "Available questions, one per line as id|text:",
+                *kept,
+            ])
+
+        return self._build(system_prompt, rows, render, len(questions))
+
+    def _build(self, system_prompt: str, rows: List[Tuple[str, str]], render, total: int,
+               weights: Optional[List[int]] = None) -> Tuple[List[Dict[str, str]], PromptUsage]:
+        """Apply the budget to the rows and assemble the final messages."""
+        system_prompt = _WHITESPACE_PATTERN.sub(" ", system_prompt).strip()
+        fixed_messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": render([])},
+        ]
+        available = self.token_budget - self.counter.count_messages(fixed_messages)
+
+        kept, dropped = self._fit_rows(rows, available, weights)
+        truncated = False
+        if dropped:
+            # Shorten long rows first so that as many answers as possible are kept
+            rows = [(key, self._truncate(row, self.max_answer_tokens)) for key, row in rows]
+            truncated = True
+            kept, dropped = self._fit_rows(rows, available, weights)
+
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": render(kept)},
+        ]
+        usage = PromptUsage(
+            prompt_tokens=self.counter.count_messages(messages),
+            token_budget=self.token_budget,
+            items_total=total,
+            items_sent=len(kept),
+            truncated=truncated,
+            rows_total=len(rows),
+            compression_ratio=round(total / len(rows), 2) if rows else 1.0,
+        )
+        return messages, usage
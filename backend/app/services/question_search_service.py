@@ -0,0 +1,88 @@
+"""
+Question search service layer.
+This module answers query-only searches against the question bank stored server-side.
+"""
+
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+
+from ..database.repositories.question_repository import QuestionRepository
+from ..utils.versions import question_set_version
+from .search_index import QuestionSearchIndex
+
+
+class QuestionSearchService:
+    """Service class for server-side question search."""
+    
+    def __init__(self, question_repo: QuestionRepository = None):
+        """
+        Initializes the repository dependency.
+        
+        Args:
+            question_repo: Question repository instance (optional, creates one if not provided)
+        """
+        self.question_repo = question_repo or QuestionRepository()
+        # Index per closed-status filter, stamped with the question bank version it was built at
+        self._indexes: Dict[Optional[bool], Tuple[int, QuestionSearchIndex]] = {}
+        self._lock = threading.Lock()
+    
+    def search(self, db, query: str, is_closed: Optional[bool] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Ranks the stored questions against a query.
+        
+        Args:
+            db: Database session
+            query: Natural language query
+            is_closed: Optional filter for closed status
+            limit: Maximum number of results
+            
+        Returns:
+            List of dictionaries with question id and score, best first
+        """
+        index = self._get_index(db, is_closed)
+        return [
+            {"id": question_id, "score": score}
+            for question_id, score in index.search(query, limit)
+        ]
+    
+    def preload(self, db) -> int:
+        """
+        Builds the indexes for every closed-status filter ahead of the first search.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            Number of questions indexed
+        """
+        indexes = [self._get_index(db, is_closed) for is_closed in (None, False, True)]
+        return len(indexes[0])
+    
+    def clear_cache(self) -> None:
+        """Drops the cached indexes, e.g. when the database is replaced."""
+        with self._lock:
+            self._indexes.clear()
+    
+    def _get_index(self, db, is_closed: Optional[bool]) -> QuestionSearchIndex:
+        """
+        Gets the index for a filter, rebuilding it once the question bank has changed.
+        
+        Args:
+            db: Database session
+            is_closed: Optional filter for closed status
+            
+        Returns:
+            Search index over the matching questions
+        """
+        version = question_set_version.value
+        cached = self._indexes.get(is_closed)
+        if cached and cached[0] == version:
+            return cached[1]
+        
+        index = QuestionSearchIndex(self.question_repo.get_search_rows(db, is_closed))
+        with self._lock:
+            cached = self._indexes.get(is_closed)
+            # Stamped with the version read before the query, so a change made meanwhile triggers a rebuild
+            if not cached or cached[0] <= version:
+                self._indexes[is_closed] = (version, index)
+        return index
@@ -3,19 +3,14 @@ Question service layer.
 This module handles business logic for question operations.
 """
 
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Optional, Tuple
 from fastapi import HTTPException
 from datetime import datetime
-try:
-    from app.database.repositories.question_repository import QuestionRepository
-    from app.database.repositories.answer_repository import AnswerRepository
-except ImportError:
-    # Fallback for direct execution
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from app.database.repositories.question_repository import QuestionRepository
-    from app.database.repositories.answer_repository import AnswerRepository
+from app.database.repositories.question_repository import QuestionRepository
+from app.database.repositories.answer_repository import AnswerRepository
+from app.utils.events import events, QUESTION_CREATED, QUESTION_CLOSED, QUESTION_DELETED
+from app.utils.versions import question_set_version
 
 
 class QuestionService:
@@ -31,11 +26,14 @@ class QuestionService:
         """
         self.question_repo = question_repo
         self.answer_repo = answer_repo or AnswerRepository()
+        # Open questions by access code, valid while the question bank is at the stamped version
+        self._open_by_code: Tuple[int, Dict[str, Dict[str, Any]]] = (-1, {})
+        self._open_by_code_lock = threading.Lock()
     
     def create_question(self, db, title: str, text: str, access_code: str) -> int:
         """
         Creates a new question, ensuring the access_code is unique.
-        Raises an exception on conflict.
+        Raises an exception on conflict and publishes a question.created event on success.
         
         Args:
             db: Database session
@@ -67,6 +65,7 @@ class QuestionService:
         
         # Create question and return ID
         question = self.question_repo.create(db, question_data)
+        events.publish(QUESTION_CREATED, db=db, question_id=question.id)
         return question.id
     
     def get_questions(self, db, is_closed: Optional[bool] = None) -> List[Dict[str, Any]]:
@@ -110,13 +109,53 @@ class QuestionService:
         Returns:
             Question dictionary if found, None otherwise
         """
-        question = self.question_repo.get_by_access_code(db, access_code)
-        return self._question_to_dict(question) if question else None
+        version, open_by_code = self._open_by_code
+        if version == question_set_version.value and access_code in open_by_code:
+            return dict(open_by_code[access_code])
+        
+        version = question_set_version.value
+        question = self._question_to_dict(self.question_repo.get_by_access_code(db, access_code))
+        if question and not question["is_closed"]:
+            with self._open_by_code_lock:
+                cached_version, open_by_code = self._open_by_code
+                if cached_version < version:
+                    open_by_code = {}
+                if cached_version <= version:
+                    # Read before the query, so a change made meanwhile invalidates the entry
+                    self._open_by_code = (version, {**open_by_code, access_code: dict(question)})
+        return question
+    
+    def preload_open_questions(self, db) -> int:
+        """
+        Loads every open question into the access code cache, so that the first
+        answer submissions after a start do not each query the database.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            Number of open questions loaded
+        """
+        version = question_set_version.value
+        open_by_code = {
+            question.access_code: self._question_to_dict(question)
+            for question in self.question_repo.get_all_by_status(db, is_closed=False)
+        }
+        with self._open_by_code_lock:
+            if self._open_by_code[0] <= version:
+                self._open_by_code = (version, open_by_code)
+        return len(open_by_code)
+    
+    def clear_cache(self) -> None:
+        """Drops the cached open questions, e.g. when the database is replaced."""
+        with self._open_by_code_lock:
+            self._open_by_code = (-1, {})
     
     def close_question(self, db, question_id: int) -> bool:
         """
         Updates a question's status to closed.
-        Checks if the question exists and is not already closed.
+        Checks if the question exists and is not already closed, then publishes
+        a question.closed event so that closing hooks can run.
         
         Args:
             db: Database session
@@ -140,12 +179,17 @@ class QuestionService:
         
         # Update question status
         updated_question = self.question_repo.update_status(db, question_id, True)
-        return updated_question is not None
+        if updated_question is None:
+            return False
+        
+        events.publish(QUESTION_CLOSED, db=db, question_id=question_id, access_code=question.get("access_code"))
+        return True
     
     def delete_question(self, db, question_id: int) -> bool:
         """
         Deletes a question by ID.
-        Checks if the question exists before attempting deletion.
+        Checks if the question exists before attempting deletion and publishes
+        a question.deleted event once it is gone.
         
         Args:
             db: Database session
@@ -158,10 +202,13 @@ class QuestionService:
             HTTPException: If question not found
         """
         # Check if question exists
-        self.get_question_by_id(db, question_id)
+        question = self.get_question_by_id(db, question_id)
         
         # Delete the question
-        return self.question_repo.delete_question(db, question_id)
+        deleted = self.question_repo.delete_question(db, question_id)
+        if deleted:
+            events.publish(QUESTION_DELETED, db=db, question_id=question_id, access_code=question.get("access_code"))
+        return deleted
     
     def _question_to_dict(self, question) -> Dict[str, Any]:
         """
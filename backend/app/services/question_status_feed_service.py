@@ -0,0 +1,64 @@
+"""
+Question status feed service layer.
+This module tells students waiting on an access code when its question closes or is deleted.
+"""
+
+from typing import Any, Optional
+
+from ..utils.broker import EventBroker, Subscription
+
+# Feed event names; both end the student's stream
+QUESTION_CLOSED_EVENT = "question.closed"
+QUESTION_DELETED_EVENT = "question.deleted"
+TERMINAL_EVENTS = (QUESTION_CLOSED_EVENT, QUESTION_DELETED_EVENT)
+
+
+class QuestionStatusFeedService:
+    """Service class for the per-access-code status channel.
+
+    A question only ever sends one event to its students, so subscribers get a
+    tiny queue and history, and codes no one is waiting on publish nothing.
+    """
+
+    def __init__(self, broker: EventBroker):
+        """
+        Initializes the feed.
+
+        Args:
+            broker: Broker fanning events out to the open streams
+        """
+        self.broker = broker
+
+    @staticmethod
+    def topic(access_code: str) -> tuple:
+        """Broker topic of an access code's channel."""
+        return ("question-status", access_code)
+
+    def subscribe(self, access_code: str, cursor: Optional[int] = None) -> Subscription:
+        """
+        Open a subscription to an access code's channel on the running event loop.
+
+        Args:
+            access_code: Question access code
+            cursor: Last event ID the client saw, to replay what it missed
+
+        Returns:
+            The subscription
+        """
+        return self.broker.subscribe(self.topic(access_code), cursor)
+
+    def on_question_closed(self, question_id: int, access_code: Optional[str] = None, **payload: Any) -> None:
+        """Tell waiting students that the question no longer accepts answers."""
+        self._publish(access_code, QUESTION_CLOSED_EVENT, question_id)
+
+    def on_question_deleted(self, question_id: int, access_code: Optional[str] = None, **payload: Any) -> None:
+        """Tell waiting students that the question is gone, then forget the channel."""
+        self._publish(access_code, QUESTION_DELETED_EVENT, question_id)
+        if access_code is not None:
+            # The code may be reused by a new question, which must start with a fresh channel
+            self.broker.close_topic(self.topic(access_code))
+
+    def _publish(self, access_code: Optional[str], event: str, question_id: int) -> None:
+        topic = self.topic(access_code)
+        if access_code is not None and self.broker.has_topic(topic):
+            self.broker.publish(topic, event, {"access_code": access_code, "question_id": question_id})
@@ -0,0 +1,169 @@
+"""
+Question summary service layer.
+This module builds AI summaries server-side from a question's stored answers.
+"""
+
+from typing import Dict, Any, Optional
+from fastapi import HTTPException
+
+from ..database.repositories.question_repository import QuestionRepository
+from ..database.repositories.answer_repository import AnswerRepository
+from ..database.models.answer import Answer
+from ..models.ai_models import SummarizationRequest, SummarizationContext, StudentAnswer
+from .ai_service import AISummarizationService
+from .student_service import StudentService
+from .summary_job_service import SummaryJobService
+
+# Only the columns the prompt needs are loaded
+ANSWER_SUMMARY_COLUMNS = (Answer.id, Answer.student_id, Answer.text, Answer.timestamp)
+
+
+class QuestionSummaryService:
+    """Service class for summarizing a question's answers by question ID."""
+    
+    def __init__(self, summarization_service: AISummarizationService, question_repo: QuestionRepository = None,
+                 answer_repo: AnswerRepository = None, student_service: StudentService = None,
+                 job_service: SummaryJobService = None):
+        """
+        Initializes the service dependencies.
+        
+        Args:
+            summarization_service: Service that generates the summaries
+            question_repo: Question repository instance (optional, creates one if not provided)
+            answer_repo: Answer repository instance (optional, creates one if not provided)
+            student_service: Student service instance (optional, creates one if not provided)
+            job_service: Background job service used to precompute summaries (optional)
+        """
+        self.summarization_service = summarization_service
+        self.question_repo = question_repo or QuestionRepository()
+        self.answer_repo = answer_repo or AnswerRepository()
+        self.student_service = student_service or StudentService()
+        self.job_service = job_service
+    
+    def build_request(self, db, question_id: int, summary_instructions: str, incremental: bool = False) -> SummarizationRequest:
+        """
+        Builds a summarization request from the answers stored for a question.
+        
+        Args:
+            db: Database session
+            question_id: Question ID
+            summary_instructions: Instructions for how to summarize
+            incremental: Whether the request should update the stored summary incrementally
+            
+        Returns:
+            Summarization request with the question's answers
+            
+        Raises:
+            HTTPException: If question not found or it has no answers
+        """
+        question = self.question_repo.get(db, question_id)
+        if not question:
+            raise HTTPException(status_code=404, detail="Question not found")
+        
+        rows = self.answer_repo.get_by_question_id(db, question_id, columns=ANSWER_SUMMARY_COLUMNS)
+        if not rows:
+            raise HTTPException(status_code=400, detail="Question has no answers to summarize")
+        
+        student_names = {s.get("id"): s.get("name") for s in self.student_service.get_all_students()}
+        
+        return SummarizationRequest(
+            context=SummarizationContext(
+                question_id=question.id,
+                question_text=question.text,
+                summary_instructions=summary_instructions
+            ),
+            student_answers=[
+                StudentAnswer(
+                    answer_id=row.id,
+                    student_id=row.student_id,
+                    student_name=student_names.get(row.student_id) or row.student_id,
+                    answer_text=row.text,
+                    submitted_at=row.timestamp.isoformat() if row.timestamp else ""
+                )
+                for row in rows
+            ],
+            incremental=incremental
+        )
+    
+    def summarize_question(self, db, question_id: int, summary_instructions: str, incremental: bool = True) -> Dict[str, Any]:
+        """
+        Summarizes the answers of a question.
+        
+        Args:
+            db: Database session
+            question_id: Question ID
+            summary_instructions: Instructions for how to summarize
+            incremental: Whether to update the stored summary with only new or changed answers
+            
+        Returns:
+            Dictionary with the question ID, summary and number of answers covered
+            
+        Raises:
+            HTTPException: If question not found or it has no answers
+            ValueError: If summarization fails
+        """
+        if not summary_instructions.strip():
+            raise HTTPException(status_code=400, detail="Summary instructions cannot be empty")
+        
+        request = self.build_request(db, question_id, summary_instructions, incremental)
+        if incremental:
+            summary = self.summarization_service.generate_incremental_summary(db, request)
+        else:
+            summary = self.summarization_service.generate_summary(request)
+        
+        return {
+            "question_id": question_id,
+            "summary": summary,
+            "answer_count": len(request.student_answers)
+        }
+    
+    def precompute_summary(self, db, question_id: int, summary_instructions: Optional[str] = None,
+                           **payload: Any) -> Optional[Dict[str, Any]]:
+        """
+        Queues a background job that stores the question's summary for later views.
+        
+        Used as the question.closed hook: the answer set is frozen, so the stored summary
+        stays valid until the question is reopened and gets new answers, or other
+        instructions are requested. Questions without answers are skipped.
+        
+        Args:
+            db: Database session
+            question_id: Question ID
+            summary_instructions: Instructions for how to summarize (defaults to the configured instructions)
+            **payload: Other question.closed event fields, ignored
+            
+        Returns:
+            Job dictionary, or None if nothing was queued
+        """
+        config = self.summarization_service.config
+        if self.job_service is None or not config.OPENAI_API_KEY:
+            return None
+        
+        try:
+            request = self.build_request(
+                db, question_id, summary_instructions or config.AI_DEFAULT_SUMMARY_INSTRUCTIONS, incremental=True
+            )
+        except HTTPException:
+            return None
+        
+        job = self.job_service.submit(db, request)
+        print(f"Queued summary job {job['job_id']} for closed question {question_id}")
+        return job
+    
+    def forget_question(self, db, question_id: int, **payload: Any) -> None:
+        """
+        Deletes the stored summaries and summary jobs of a deleted question.
+        
+        Used as the question.deleted hook: SQLite reuses the IDs of deleted questions,
+        so a summary left behind would become the previous summary of the next question
+        with the same ID. Jobs are dropped first, so a job still running when the
+        summaries are deleted finds its job gone and deletes the summary it stored.
+        
+        Args:
+            db: Database session
+            question_id: Question ID
+            **payload: Other question.deleted event fields, ignored
+        """
+        if self.job_service is not None:
+            self.job_service.drop_question_jobs(db, question_id)
+        self.summarization_service.summary_repo.delete_by_question_id(db, question_id)
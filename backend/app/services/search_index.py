@@ -0,0 +1,150 @@
+"""
+Server-side question search index.
+This module ranks questions against a text query with TF-IDF vectors in NumPy.
+"""
+
+import math
+import re
+import unicodedata
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    # NumPy is imported when the first index is built, keeping it out of the application's startup
+    import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Common English words that carry no meaning for matching
+_STOPWORDS = frozenset("""
+a an and are as at be by do does for from how in is it of on or that the this to was what when where which who why with
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms.
+    
+    Args:
+        text: Raw text
+        
+    Returns:
+        List of terms without stopwords
+    """
+    return [
+        token for token in _TOKEN_PATTERN.findall((text or "").lower())
+        if token not in _STOPWORDS
+    ]
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query so that trivially different spellings share cache entries.
+    
+    Applies Unicode NFKC and case folding, and drops punctuation and extra whitespace,
+    so "Photosynthesis?" and "  photosynthesis" normalize to the same text.
+    
+    Args:
+        query: Raw query
+        
+    Returns:
+        Normalized query
+    """
+    return " ".join(_TOKEN_PATTERN.findall(unicodedata.normalize("NFKC", query or "").casefold()))
+
+
+class QuestionSearchIndex:
+    """TF-IDF index over question titles and texts."""
+    
+    def __init__(self, questions: Sequence):
+        """
+        Build the index.
+        
+        Args:
+            questions: Rows with id and text attributes, and optionally title and is_closed
+        """
+        import numpy as np
+        self.ids = np.array([q.id for q in questions], dtype=np.int64)
+        self.is_closed = np.array([bool(getattr(q, "is_closed", False)) for q in questions], dtype=bool)
+        self.vocabulary: Dict[str, int] = {}
+        
+        documents = [tokenize(f"{getattr(q, 'title', '') or ''} {q.text}") for q in questions]
+        for terms in documents:
+            for term in terms:
+                self.vocabulary.setdefault(term, len(self.vocabulary))
+        
+        counts = np.zeros((len(documents), len(self.vocabulary)), dtype=np.float32)
+        for row, terms in enumerate(documents):
+            for term in terms:
+                counts[row, self.vocabulary[term]] += 1
+        
+        # Smoothed inverse document frequency and sublinear term frequency
+        document_frequency = np.count_nonzero(counts, axis=0)
+        self.idf = (np.log((1 + len(documents)) / (1 + document_frequency)) + 1).astype(np.float32)
+        weights = np.log1p(counts) * self.idf
+        self.matrix = self._normalize(weights)
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    @staticmethod
+    def _normalize(vectors: "np.ndarray") -> "np.ndarray":
+        """L2-normalize rows so that dot products are cosine similarities."""
+        import numpy as np
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+    
+    def _query_vector(self, query: str) -> "np.ndarray":
+        """Encode a query in the index vocabulary; unknown terms are ignored."""
+        import numpy as np
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for term in tokenize(query):
+            column = self.vocabulary.get(term)
+            if column is not None:
+                vector[column] += 1
+        return self._normalize((np.log1p(vector) * self.idf)[np.newaxis, :])[0]
+    
+    def search(self, query: str, limit: int = 10, is_closed: Optional[bool] = None) -> List[Tuple[int, float]]:
+        """
+        Rank questions by similarity to a query.
+        
+        Args:
+            query: Natural language query
+            limit: Maximum number of results
+            is_closed: Optional filter for closed status
+            
+        Returns:
+            List of (question_id, score) pairs, best first, with scores above zero
+        """
+        return self.search_many([query], limit, is_closed)[0]
+    
+    def search_many(self, queries: Sequence[str], limit: int = 10,
+                    is_closed: Optional[bool] = None) -> List[List[Tuple[int, float]]]:
+        """
+        Rank questions against several queries with one matrix product.
+        
+        Args:
+            queries: Natural language queries
+            limit: Maximum number of results per query
+            is_closed: Optional filter for closed status
+            
+        Returns:
+            One list of (question_id, score) pairs per query, best first, with scores above zero
+        """
+        if not len(self) or not self.vocabulary or not len(queries):
+            return [[] for _ in queries]
+        
+        import numpy as np
+        # queries x questions cosine similarities
+        scores = np.stack([self._query_vector(query) for query in queries]) @ self.matrix.T
+        if is_closed is not None:
+            scores = np.where(self.is_closed == is_closed, scores, 0)
+        
+        limit = min(limit, scores.shape[1])
+        top = np.argpartition(-scores, limit - 1, axis=1)[:, :limit]
+        order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        return [
+            [(int(self.ids[i]), round(float(row_scores[i]), 4)) for i in row_top if row_scores[i] > 0]
+            for row_scores, row_top in zip(scores, top)
+        ]
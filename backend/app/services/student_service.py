@@ -5,12 +5,16 @@ This module handles business logic for student operations.
 
 import json
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from fastapi import HTTPException
 
 
 class StudentService:
-    """Service class for student operations."""
+    """Service class for student operations.
+    
+    The parsed roster is cached and reloaded only when the data file changes,
+    so one instance shared by all requests reads the file once per change.
+    """
     
     def __init__(self, data_file_path: str = None):
         """
@@ -29,10 +33,12 @@ class StudentService:
                 current_dir = os.path.dirname(os.path.abspath(__file__))
                 data_file_path = os.path.join(current_dir, "..", "..", "..", "data", "students.json")
         self.data_file_path = data_file_path
+        # (roster version, students, students by ID); replaced as a whole so readers never see a partial update
+        self._roster: Optional[Tuple[str, List[Dict[str, Any]], Dict[Any, Dict[str, Any]]]] = None
     
     def _load_students(self) -> List[Dict[str, Any]]:
         """
-        Load students from the JSON file.
+        Load students from the JSON file, or from the cache if the file is unchanged.
         
         Returns:
             List of student dictionaries
@@ -40,13 +46,58 @@ class StudentService:
         Raises:
             HTTPException: If there's an error loading the file
         """
+        return self._load_roster()[1]
+    
+    def _load_roster(self) -> Tuple[str, List[Dict[str, Any]], Dict[Any, Dict[str, Any]]]:
+        """
+        Get the cached roster, reloading it if the data file changed.
+        
+        Returns:
+            Tuple of roster version, students and students by ID
+            
+        Raises:
+            HTTPException: If there's an error loading the file
+        """
+        version = self.roster_version()
+        roster = self._roster
+        if roster is not None and roster[0] == version:
+            return roster
         try:
             with open(self.data_file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                students = json.load(f)
         except FileNotFoundError:
-            return []
+            students = []
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error loading students: {str(e)}")
+        by_id: Dict[Any, Dict[str, Any]] = {}
+        for student in students:
+            # The first entry wins, as it did for a linear search
+            by_id.setdefault(student.get("id"), student)
+        roster = (version, students, by_id)
+        self._roster = roster
+        return roster
+    
+    def roster_version(self) -> str:
+        """
+        Get a version of the student roster from the data file's modification time and size.
+        
+        Returns:
+            Version string that changes whenever the data file changes
+        """
+        try:
+            stat = os.stat(self.data_file_path)
+        except FileNotFoundError:
+            return "none"
+        return f"{stat.st_mtime_ns:x}.{stat.st_size:x}"
+    
+    def preload_roster(self) -> int:
+        """
+        Load the roster into the cache ahead of the first lookup.
+        
+        Returns:
+            Number of students loaded
+        """
+        return len(self._load_students())
     
     def get_all_students(self) -> List[Dict[str, Any]]:
         """
@@ -55,7 +106,8 @@ class StudentService:
         Returns:
             List of student dictionaries
         """
-        return self._load_students()
+        # A copy, so callers cannot change the cached roster
+        return list(self._load_students())
     
     def get_student_by_id(self, student_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -70,10 +122,9 @@ class StudentService:
         Raises:
             HTTPException: If student not found
         """
-        students = self._load_students()
-        for student in students:
-            if student.get("id") == student_id:
-                return student
+        student = self._load_roster()[2].get(student_id)
+        if student is not None:
+            return student
         raise HTTPException(status_code=404, detail="Student not found")
     
     def validate_student_id(self, student_id: str) -> bool:
@@ -86,5 +137,4 @@ class StudentService:
         Returns:
             True if the student exists, False otherwise
         """
-        students = self._load_students()
-        return any(student.get("id") == student_id for student in students)
\ No newline at end of file
+        return student_id in self._load_roster()[2]
\ No newline at end of file
@@ -0,0 +1,199 @@
+"""
+Summary job service layer.
+This module runs AI summarization as persisted background jobs on a bounded worker pool.
+"""
+
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+from fastapi import HTTPException, status
+
+from ..database.repositories.summary_job_repository import SummaryJobRepository
+from ..models.ai_models import SummarizationRequest
+from ..utils.hashing import content_hash
+from .ai_service import AISummarizationService
+
+
+class SummaryJobService:
+    """Service class for background summarization jobs."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+    def __init__(self, summarization_service: AISummarizationService, job_repo: SummaryJobRepository = None,
+                 session_factory=None, max_workers: int = 2, max_pending: int = 100):
+        """
+        Initializes the job service.
+
+        Args:
+            summarization_service: Service that generates the summaries
+            job_repo: Summary job repository instance (optional, creates one if not provided)
+            session_factory: Callable returning a new database session for worker threads
+            max_workers: Number of jobs processed concurrently
+            max_pending: Maximum number of queued jobs before new submissions are rejected
+        """
+        if session_factory is None:
+            from ..database.config import SessionLocal
+            session_factory = SessionLocal
+
+        self.summarization_service = summarization_service
+        self.job_repo = job_repo or SummaryJobRepository()
+        self.session_factory = session_factory
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="summary-job")
+        # Makes the duplicate check and the insert one step, so identical concurrent requests share a job
+        self._submit_lock = threading.Lock()
+
+    def submit(self, db, request: SummarizationRequest) -> Dict[str, Any]:
+        """
+        Queues a summarization job, reusing an existing job for an identical request.
+
+        Args:
+            db: Database session
+            request: Summarization request
+
+        Returns:
+            Job dictionary
+
+        Raises:
+            HTTPException: If the queue is full
+        """
+        payload = request.model_dump(mode="json")
+        request_hash = content_hash(payload)
+
+        with self._submit_lock:
+            # De-duplicate identical requests that are queued, running or done
+            existing = self.job_repo.get_active_by_content_hash(db, request_hash)
+            if existing:
+                return self._job_to_dict(existing)
+
+            if self.job_repo.count_by_status(db, self.PENDING) >= self.max_pending:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many summarization jobs queued, please try again later",
+                    headers={"Retry-After": "5"}
+                )
+
+            job = self.job_repo.create(db, {
+                "id": uuid.uuid4().hex,
+                "content_hash": request_hash,
+                "question_id": request.context.question_id,
+                "status": self.PENDING,
+                "request_payload": request.model_dump_json()
+            })
+        self._executor.submit(self._run_job, job.id)
+        return self._job_to_dict(job)
+
+    def get_job(self, db, job_id: str) -> Dict[str, Any]:
+        """
+        Retrieves a job by ID.
+
+        Args:
+            db: Database session
+            job_id: Job ID
+
+        Returns:
+            Job dictionary
+
+        Raises:
+            HTTPException: If job not found
+        """
+        job = self.job_repo.get(db, job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Summary job not found")
+        return self._job_to_dict(job)
+
+    def resume_pending_jobs(self) -> int:
+        """
+        Re-queues jobs left pending or running by a previous process.
+
+        Returns:
+            Number of jobs re-queued
+        """
+        db = self.session_factory()
+        try:
+            jobs = self.job_repo.get_by_statuses(db, [self.PENDING, self.RUNNING])
+            for job in jobs:
+                self._executor.submit(self._run_job, job.id)
+            return len(jobs)
+        finally:
+            db.close()
+
+    def drop_question_jobs(self, db, question_id: int) -> int:
+        """
+        Deletes every job of a question, so queued jobs are skipped and running ones discard their result.
+
+        Args:
+            db: Database session
+            question_id: Question ID
+
+        Returns:
+            Number of jobs deleted
+        """
+        return self.job_repo.delete_by_question_id(db, question_id)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Stops the worker pool. Unfinished jobs stay persisted and resume on next start.
+
+        Args:
+            wait: Whether to wait for running jobs to finish
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run_job(self, job_id: str) -> None:
+        """
+        Processes a single job on a worker thread with its own database session.
+
+        Args:
+            job_id: Job ID
+        """
+        db = self.session_factory()
+        try:
+            job = self.job_repo.get(db, job_id)
+            if not job or job.status not in (self.PENDING, self.RUNNING):
+                return
+
+            self.job_repo.update_status(db, job_id, self.RUNNING)
+            try:
+                request = SummarizationRequest.model_validate_json(job.request_payload)
+                if request.incremental:
+                    # Incremental jobs also persist the result as the question's stored summary
+                    summary = self.summarization_service.generate_incremental_summary(db, request)
+                else:
+                    summary = self.summarization_service.generate_summary(request)
+            except Exception as e:
+                print(f"Summary job {job_id} failed: {str(e)}")
+                # A failed flush leaves the session unusable until rolled back
+                db.rollback()
+                self.job_repo.update_status(db, job_id, self.FAILED, error=str(e))
+                return
+
+            if self.job_repo.update_status(db, job_id, self.COMPLETED, result=summary) is None and request.incremental:
+                # The question was deleted while the job ran; its summary must not outlive it
+                self.summarization_service.summary_repo.delete_by_question_id(db, request.context.question_id)
+        finally:
+            db.close()
+
+    def _job_to_dict(self, job) -> Dict[str, Any]:
+        """
+        Convert SQLAlchemy summary job object to dictionary.
+
+        Args:
+            job: SQLAlchemy summary job object
+
+        Returns:
+            Job dictionary
+        """
+        return {
+            "job_id": job.id,
+            "question_id": job.question_id,
+            "status": job.status,
+            "summary": job.result,
+            "error": job.error,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "updated_at": job.updated_at.isoformat() if job.updated_at else None
+        }
@@ -0,0 +1,286 @@
+"""
+In-process pub/sub broker for streaming endpoints.
+Fans events out to per-subscriber bounded queues and keeps a short history so clients can resume.
+"""
+
+import asyncio
+import itertools
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Hashable, Optional, Set
+
+# Event sent instead of a replay when the client's cursor is older than the kept history
+RESET_EVENT = "reset"
+
+# Event ending a stream whose subscriber fell too far behind
+OVERFLOW_EVENT = "overflow"
+
+
+class BrokerMessage:
+    """An event published on a topic, identified by a broker-wide sequence number."""
+
+    __slots__ = ("seq", "event", "data")
+
+    def __init__(self, seq: int, event: str, data: Any):
+        self.seq = seq
+        self.event = event
+        self.data = data
+
+
+class Subscription:
+    """One subscriber's bounded queue of messages.
+
+    Messages are delivered on the subscriber's event loop. A subscriber whose
+    queue is full is dropped: it receives a final overflow message carrying
+    its last delivered sequence number, from which it can resume.
+    """
+
+    def __init__(self, broker: "EventBroker", topic: Hashable, max_queue: int, loop: asyncio.AbstractEventLoop):
+        self.broker = broker
+        self.topic = topic
+        self.max_queue = max_queue
+        self.loop = loop
+        self.closed = False
+        self.cursor = 0
+        self._queued_seq = 0
+        # Unbounded so the final overflow or close marker always fits; max_queue is enforced in _offer
+        self._queue: "asyncio.Queue[Optional[BrokerMessage]]" = asyncio.Queue()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[BrokerMessage]:
+        """
+        Wait for the next message.
+
+        Args:
+            timeout: Seconds to wait before raising asyncio.TimeoutError (None waits forever)
+
+        Returns:
+            The next message, or None once the subscription is closed
+        """
+        message = await asyncio.wait_for(self._queue.get(), timeout)
+        if message is not None and message.event != OVERFLOW_EVENT:
+            self.cursor = message.seq
+        return message
+
+    def close(self) -> None:
+        """Unsubscribe; a pending get returns None."""
+        self.broker.unsubscribe(self)
+
+    def _offer(self, message: Optional[BrokerMessage]) -> None:
+        """Queue a message; runs on the subscriber's loop."""
+        if self.closed and message is not None:
+            return
+        if message is None:
+            self.closed = True
+        elif self._queue.qsize() >= self.max_queue:
+            # Slow consumer: stop delivering and tell it where to resume from
+            self.broker._drop(self)
+            self.closed = True
+            message = BrokerMessage(self._queued_seq, OVERFLOW_EVENT, {"reason": "slow consumer"})
+        else:
+            self._queued_seq = message.seq
+        self._queue.put_nowait(message)
+
+
+class _Topic:
+    """Subscribers and recent history of one topic."""
+
+    __slots__ = ("subscribers", "history", "evicted_seq")
+
+    def __init__(self, history_size: int, evicted_seq: int):
+        self.subscribers: Set[Subscription] = set()
+        self.history: Deque[BrokerMessage] = deque(maxlen=history_size)
+        # Highest sequence number that may have been published to the topic but is not in the history
+        self.evicted_seq = evicted_seq
+
+
+class EventBroker:
+    """Thread-safe topic broker.
+
+    Publishing never blocks: messages are handed to each subscriber's event loop
+    with call_soon_threadsafe, so writers in worker threads and on the loop
+    itself publish the same way. Each topic keeps its last history_size messages
+    for subscribers resuming from a cursor; the least recently used topics are
+    forgotten beyond max_topics.
+    """
+
+    def __init__(self, max_queue: int = 100, history_size: int = 500, max_topics: int = 1024):
+        """
+        Initialize the broker.
+
+        Args:
+            max_queue: Messages a subscriber may have pending before it is dropped
+            history_size: Messages kept per topic for resuming
+            max_topics: Topics whose history is kept
+        """
+        self.max_queue = max_queue
+        self.history_size = history_size
+        self.max_topics = max_topics
+        self._lock = threading.Lock()
+        self._topics: "OrderedDict[Hashable, _Topic]" = OrderedDict()
+        self._seq = itertools.count(1)
+        self.last_seq = 0
+        self.published = 0
+        self.dropped = 0
+
+    def publish(self, topic: Hashable, event: str, data: Any) -> int:
+        """
+        Publish an event to a topic's subscribers and history.
+
+        Args:
+            topic: Topic key
+            event: Event name
+            data: JSON-serializable payload
+
+        Returns:
+            Sequence number of the message
+        """
+        with self._lock:
+            state = self._topic(topic)
+            message = BrokerMessage(next(self._seq), event, data)
+            self.last_seq = message.seq
+            self.published += 1
+            if len(state.history) == state.history.maxlen:
+                state.evicted_seq = state.history[0].seq
+            state.history.append(message)
+            subscribers = list(state.subscribers)
+        for subscription in subscribers:
+            self._deliver(subscription, message)
+        return message.seq
+
+    def subscribe(self, topic: Hashable, cursor: Optional[int] = None) -> Subscription:
+        """
+        Subscribe to a topic on the running event loop.
+
+        Args:
+            topic: Topic key
+            cursor: Sequence number of the last message the client saw; later
+                messages still in the history are replayed. If some were already
+                forgotten, a reset message is queued instead, telling the client
+                to refetch its state.
+
+        Returns:
+            The subscription; its cursor is where a reconnect should resume from
+        """
+        subscription = Subscription(self, topic, self.max_queue, asyncio.get_running_loop())
+        missed = []
+        with self._lock:
+            # A new subscriber starts at the current position, so its first cursor already resumes correctly
+            subscription.cursor = subscription._queued_seq = self.last_seq if cursor is None else cursor
+            state = self._topic(topic)
+            state.subscribers.add(subscription)
+            if cursor is not None:
+                missed = [message for message in state.history if message.seq > cursor]
+                # Older than the history, or from before a restart (sequence numbers start over)
+                if cursor < state.evicted_seq or cursor > self.last_seq:
+                    missed = [BrokerMessage(self.last_seq, RESET_EVENT, {"reason": "cursor expired"})]
+        # Queued before any later publish, which reaches this loop through call_soon_threadsafe
+        for message in missed:
+            subscription._offer(message)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Remove a subscription; a pending get returns None.
+
+        Args:
+            subscription: Subscription returned by subscribe
+        """
+        with self._lock:
+            state = self._topics.get(subscription.topic)
+            if state is not None:
+                state.subscribers.discard(subscription)
+        self._deliver(subscription, None)
+
+    def close_topic(self, topic: Hashable) -> None:
+        """
+        End every subscription to a topic and forget its history.
+
+        Args:
+            topic: Topic key
+        """
+        with self._lock:
+            state = self._topics.pop(topic, None)
+        for subscription in (state.subscribers if state else ()):
+            self._deliver(subscription, None)
+
+    def reset(self) -> None:
+        """End every subscription and forget all topics."""
+        with self._lock:
+            topics = list(self._topics)
+        for topic in topics:
+            self.close_topic(topic)
+
+    def has_topic(self, topic: Hashable) -> bool:
+        """
+        Check whether a topic has subscribers or history, i.e. whether publishing to it can reach anyone.
+
+        Args:
+            topic: Topic key
+
+        Returns:
+            True if the topic is known
+        """
+        with self._lock:
+            return topic in self._topics
+
+    def subscriber_count(self, topic: Optional[Hashable] = None) -> int:
+        """
+        Count subscribers.
+
+        Args:
+            topic: Topic key, or None for all topics
+
+        Returns:
+            Number of subscribers
+        """
+        with self._lock:
+            if topic is not None:
+                state = self._topics.get(topic)
+                return len(state.subscribers) if state else 0
+            return sum(len(state.subscribers) for state in self._topics.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the broker counters."""
+        with self._lock:
+            return {
+                "topics": len(self._topics),
+                "subscribers": sum(len(state.subscribers) for state in self._topics.values()),
+                "published": self.published,
+                "dropped": self.dropped,
+                "last_seq": self.last_seq
+            }
+
+    def _topic(self, topic: Hashable) -> _Topic:
+        """Get or create a topic's state; the lock must be held."""
+        state = self._topics.get(topic)
+        if state is None:
+            # A topic seen for the first time, or forgotten, cannot replay anything published before now
+            state = self._topics[topic] = _Topic(self.history_size, self.last_seq)
+            self._evict_topics()
+        else:
+            self._topics.move_to_end(topic)
+        return state
+
+    def _evict_topics(self) -> None:
+        """Forget the least recently used idle topics beyond max_topics; the lock must be held."""
+        for topic in list(self._topics):
+            if len(self._topics) <= self.max_topics:
+                break
+            if not self._topics[topic].subscribers:
+                del self._topics[topic]
+
+    def _drop(self, subscription: Subscription) -> None:
+        """Remove a slow subscriber; called on its loop."""
+        with self._lock:
+            state = self._topics.get(subscription.topic)
+            if state is not None and subscription in state.subscribers:
+                state.subscribers.discard(subscription)
+                self.dropped += 1
+
+    @staticmethod
+    def _deliver(subscription: Subscription, message: Optional[BrokerMessage]) -> None:
+        try:
+            subscription.loop.call_soon_threadsafe(subscription._offer, message)
+        except RuntimeError:
+            # The subscriber's loop is closed; nothing is listening any more
+            pass
@@ -0,0 +1,282 @@
+"""
+HTTP content encoding.
+Negotiates a content coding from Accept-Encoding and compresses whole or streamed response bodies.
+"""
+
+import gzip
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from starlette.datastructures import Headers
+
+try:
+    import brotli
+except ImportError:
+    # brotli is optional; clients then get gzip
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    # zstandard is optional; clients then get brotli or gzip
+    zstandard = None
+
+# Encodings this server can produce, in order of preference
+SUPPORTED_ENCODINGS: Tuple[str, ...] = tuple(
+    encoding for encoding, available in (("br", brotli), ("zstd", zstandard), ("gzip", zlib)) if available
+)
+
+# Levels suited to compressing dynamic responses on the request path
+DEFAULT_LEVELS: Dict[str, int] = {"gzip": 6, "br": 5, "zstd": 3}
+
+# Responses smaller than this are sent uncompressed; the encoding overhead outweighs the savings
+DEFAULT_MIN_SIZE = 1024
+
+# Content types worth compressing; anything else (images, archives) is already dense
+_COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson", "application/javascript", "application/xml")
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """
+    Parse an Accept-Encoding header into quality values.
+
+    Args:
+        header: Accept-Encoding header value, if any
+
+    Returns:
+        Mapping of lowercase coding to its q-value
+    """
+    accepted: Dict[str, float] = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def choose_encoding(header: Optional[str], available: Sequence[str] = SUPPORTED_ENCODINGS) -> Optional[str]:
+    """
+    Choose the preferred available encoding the client accepts.
+
+    Args:
+        header: Accept-Encoding header value, if any
+        available: Encodings the server can produce, most preferred first
+
+    Returns:
+        Encoding name, or None to send the identity representation
+    """
+    accepted = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    """
+    Check whether a response of this content type is worth compressing.
+
+    Args:
+        content_type: Content-Type header value, if any
+
+    Returns:
+        True for text and JSON types
+    """
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith(_COMPRESSIBLE_TYPES) or media_type.endswith("+json")
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """
+    Compress a complete body.
+
+    Args:
+        body: Uncompressed bytes
+        encoding: Encoding returned by choose_encoding
+        level: Compression level (defaults to DEFAULT_LEVELS)
+
+    Returns:
+        Compressed bytes
+
+    Raises:
+        ValueError: If the encoding is not supported
+    """
+    if encoding not in SUPPORTED_ENCODINGS:
+        raise ValueError(f"Unsupported encoding '{encoding}'")
+    level = DEFAULT_LEVELS[encoding] if level is None else level
+    if encoding == "gzip":
+        # mtime=0 makes the output deterministic for identical bodies
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return zstandard.ZstdCompressor(level=level).compress(body)
+
+
+class StreamCompressor:
+    """Incremental compressor for streamed responses.
+
+    Every chunk is flushed, so each NDJSON line or SSE event reaches the client
+    as soon as it is produced instead of waiting in the compressor's window.
+    """
+
+    def __init__(self, encoding: str, level: Optional[int] = None):
+        """
+        Initialize the compressor.
+
+        Args:
+            encoding: Encoding returned by choose_encoding
+            level: Compression level (defaults to DEFAULT_LEVELS)
+
+        Raises:
+            ValueError: If the encoding is not supported
+        """
+        if encoding not in SUPPORTED_ENCODINGS:
+            raise ValueError(f"Unsupported encoding '{encoding}'")
+        level = DEFAULT_LEVELS[encoding] if level is None else level
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        elif encoding == "br":
+            self._compressor = brotli.Compressor(quality=level)
+        else:
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk: bytes) -> bytes:
+        """
+        Compress a chunk and flush it.
+
+        Args:
+            chunk: Uncompressed bytes
+
+        Returns:
+            Compressed bytes that decode to everything given so far
+        """
+        if self.encoding == "gzip":
+            return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        if self.encoding == "br":
+            return self._compressor.process(chunk) + self._compressor.flush()
+        return self._compressor.compress(chunk) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        """
+        End the stream.
+
+        Returns:
+            The final compressed bytes
+        """
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses for clients that accept it.
+
+    Whole bodies below the size threshold are sent as is. Streamed bodies
+    (NDJSON, Server-Sent Events) are compressed chunk by chunk. Responses
+    that already carry a Content-Encoding, such as compressed variants
+    served by the response cache, or that are marked Cache-Control:
+    no-transform, are passed through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = DEFAULT_MIN_SIZE, levels: Optional[Dict[str, int]] = None,
+                 encodings: Sequence[str] = SUPPORTED_ENCODINGS):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application
+            minimum_size: Smallest whole body that is compressed
+            levels: Compression level per encoding (defaults to DEFAULT_LEVELS)
+            encodings: Encodings to offer, most preferred first
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {**DEFAULT_LEVELS, **(levels or {})}
+        self.encodings = tuple(encoding for encoding in encodings if encoding in SUPPORTED_ENCODINGS)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        state = {"start": None, "compressor": None, "passthrough": False}
+
+        async def compress_send(message):
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message.get("headers", []))
+                if (message["status"] < 200 or message["status"] in (204, 304)
+                        or "content-encoding" in headers or not is_compressible(headers.get("content-type"))
+                        or "no-transform" in headers.get("cache-control", "").lower()):
+                    state["passthrough"] = True
+                    await send(message)
+                else:
+                    # Held back until the first body chunk shows whether the body is whole or streamed
+                    state["start"] = message
+                return
+
+            if message["type"] != "http.response.body" or state["passthrough"]:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            start = state["start"]
+            if start is not None:
+                state["start"] = None
+                if not more_body:
+                    if len(body) < self.minimum_size:
+                        await send(self._compressed_start(start, None, len(body)))
+                        await send(message)
+                        return
+                    body = compress(body, encoding, self.levels[encoding])
+                    await send(self._compressed_start(start, encoding, len(body)))
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                state["compressor"] = StreamCompressor(encoding, self.levels[encoding])
+                await send(self._compressed_start(start, encoding, None))
+
+            compressor = state["compressor"]
+            chunk = compressor.compress(body) if body else b""
+            if not more_body:
+                chunk += compressor.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, compress_send)
+
+    @staticmethod
+    def _compressed_start(start, encoding: Optional[str], length: Optional[int]):
+        """Response start message varying on Accept-Encoding; encoding None means identity, length None streamed."""
+        headers: List[Tuple[bytes, bytes]] = [
+            (name, value) for name, value in start.get("headers", [])
+            if name.lower() not in (b"content-length", b"vary")
+        ]
+        vary = Headers(raw=start.get("headers", [])).get("vary")
+        vary_values = [value.strip() for value in vary.split(",")] if vary else []
+        if not any(value.lower() == "accept-encoding" for value in vary_values):
+            vary_values.append("Accept-Encoding")
+        headers.append((b"vary", ", ".join(vary_values).encode("latin-1")))
+        if encoding is not None:
+            headers.append((b"content-encoding", encoding.encode("latin-1")))
+        if length is not None:
+            headers.append((b"content-length", str(length).encode("latin-1")))
+        return {**start, "headers": headers}
@@ -88,3 +88,36 @@ def handle_unexpected_error(operation: str, error: Exception) -> HTTPException:
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         detail=f"Failed to {operation}: {str(error)}"
     )
+
+
+def handle_too_many_requests(message: str) -> HTTPException:
+    """
+    Handle rejected requests when a capacity limit is reached (429).
+    
+    Args:
+        message: Explanation for the client
+        
+    Returns:
+        HTTPException: 429 Too Many Requests exception
+    """
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=message,
+        headers={"Retry-After": "1"}
+    )
+
+
+def handle_service_unavailable(message: str) -> HTTPException:
+    """
+    Handle requests rejected because a dependency is unavailable (503).
+    
+    Args:
+        message: Explanation for the client
+        
+    Returns:
+        HTTPException: 503 Service Unavailable exception
+    """
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=message
+    )
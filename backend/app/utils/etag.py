@@ -0,0 +1,66 @@
+"""
+Entity tags for conditional GET requests.
+Builds weak ETags from data version numbers and answers If-None-Match with 304 Not Modified.
+"""
+
+import uuid
+from typing import Any, Optional
+
+from fastapi import Response, status
+
+# Version counters restart with the process; the boot ID keeps tags from different runs apart
+BOOT_ID = uuid.uuid4().hex[:8]
+
+# Clients may reuse a response only after revalidating it with its ETag
+ETAG_CACHE_CONTROL = "no-cache"
+
+
+def weak_etag(*parts: Any) -> str:
+    """
+    Build a weak ETag from the parts that identify a representation.
+
+    Args:
+        *parts: Resource name, version numbers and query parameters
+
+    Returns:
+        Weak ETag header value, such as W/"3f2a9c1e-questions-12"
+    """
+    return 'W/"' + "-".join(str(part) for part in (BOOT_ID, *parts)) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag with weak comparison.
+
+    Args:
+        if_none_match: If-None-Match header value, if any
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if (candidate[2:] if candidate.startswith("W/") else candidate) == opaque:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    """Build a 304 Not Modified response for an ETag."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL}
+    )
+
+
+def with_etag(response: Response, etag: str) -> Response:
+    """Attach an ETag and revalidation headers to a response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = ETAG_CACHE_CONTROL
+    return response
@@ -0,0 +1,71 @@
+"""
+In-process domain events.
+Lets services announce state changes without knowing which features react to them.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+# Event names
+QUESTION_CREATED = "question.created"
+QUESTION_CLOSED = "question.closed"
+QUESTION_DELETED = "question.deleted"
+ANSWER_SUBMITTED = "answer.submitted"
+
+
+class EventBus:
+    """Synchronous publish/subscribe for domain events.
+
+    Handlers run in the publisher's thread, in subscription order. A failing
+    handler is logged and never fails the operation that published the event.
+    """
+
+    def __init__(self):
+        """Initialize the handler table."""
+        self._lock = threading.Lock()
+        self._handlers: Dict[str, List[Callable[..., Any]]] = defaultdict(list)
+
+    def subscribe(self, event: str, handler: Callable[..., Any]) -> None:
+        """
+        Register a handler for an event. Registering the same handler twice has no effect.
+
+        Args:
+            event: Event name
+            handler: Callable receiving the event payload as keyword arguments
+        """
+        with self._lock:
+            if handler not in self._handlers[event]:
+                self._handlers[event].append(handler)
+
+    def unsubscribe(self, event: str, handler: Callable[..., Any]) -> None:
+        """
+        Remove a handler for an event, if registered.
+
+        Args:
+            event: Event name
+            handler: Previously registered handler
+        """
+        with self._lock:
+            if handler in self._handlers[event]:
+                self._handlers[event].remove(handler)
+
+    def publish(self, event: str, **payload: Any) -> None:
+        """
+        Call every handler registered for an event.
+
+        Args:
+            event: Event name
+            **payload: Event data passed to the handlers
+        """
+        with self._lock:
+            handlers = list(self._handlers[event])
+        for handler in handlers:
+            try:
+                handler(**payload)
+            except Exception as e:
+                print(f"Error in {event} handler {getattr(handler, '__name__', handler)}: {str(e)}")
+
+
+# Process-wide bus used by the services
+events = EventBus()
@@ -0,0 +1,24 @@
+"""
+Content hashing utilities.
+Produces stable keys for JSON-serializable payloads.
+"""
+
+import hashlib
+import json
+from typing import Any
+
+
+def content_hash(payload: Any) -> str:
+    """
+    Hash a JSON-serializable payload into a stable hex key.
+    
+    Keys are sorted so that equal payloads always produce the same hash.
+    
+    Args:
+        payload: JSON-serializable value
+        
+    Returns:
+        str: SHA-256 hex digest
+    """
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
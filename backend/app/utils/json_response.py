@@ -0,0 +1,50 @@
+"""
+Fast JSON responses.
+Renders API responses with orjson when it is installed, falling back to the standard library.
+"""
+
+import json
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; responses are then rendered with the json module
+    orjson = None
+
+
+def dumps_json(content: Any) -> bytes:
+    """
+    Encode content as compact UTF-8 JSON, byte-compatible with Starlette's JSONResponse.
+    
+    Content should already be made of JSON primitives (dicts, lists, strings, numbers,
+    booleans and None); anything else is passed through jsonable_encoder first.
+    
+    Args:
+        content: Content to encode
+        
+    Returns:
+        JSON bytes
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return orjson.dumps(jsonable_encoder(content), option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by dumps_json.
+    
+    Endpoints returning large lists of primitives return this response directly,
+    which also skips FastAPI's jsonable_encoder pass over the content.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
@@ -0,0 +1,439 @@
+"""
+Resilience utilities for upstream API calls.
+Provides retries with backoff, a circuit breaker and a concurrency bulkhead.
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Callable, ContextManager, Dict, Iterator, Optional
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class UpstreamError(ValueError):
+    """Raised when an upstream request fails."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        """
+        Initialize the error.
+
+        Args:
+            message: Error message
+            status_code: HTTP status of the upstream response, None for connection errors
+            retry_after: Delay in seconds requested by the upstream Retry-After header
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        """Whether the request may succeed if retried."""
+        return self.status_code is None or self.status_code in RETRYABLE_STATUS_CODES
+
+
+class CircuitOpenError(ValueError):
+    """Raised when the circuit breaker rejects a call because the upstream is unhealthy."""
+
+
+class BulkheadFullError(ValueError):
+    """Raised when no upstream slot or queue position is available."""
+
+
+class ProviderNotConfiguredError(ValueError):
+    """Raised when an upstream call is attempted without provider credentials."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given in seconds or as an HTTP date.
+
+    Args:
+        value: Header value
+
+    Returns:
+        Delay in seconds, or None if absent or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, honoring the upstream's Retry-After."""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0,
+                 max_retry_after: float = 30.0):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts: Total attempts including the first one
+            base_delay: Backoff ceiling for the first retry in seconds
+            max_delay: Upper bound for any single backoff delay in seconds
+            max_retry_after: Longest Retry-After in seconds worth waiting for; longer ones are not retried
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Get the delay before the next attempt.
+
+        Args:
+            attempt: Zero-based number of the attempt that just failed
+            retry_after: Delay requested by the upstream, honored when present
+
+        Returns:
+            Delay in seconds, or None if the upstream asked to wait longer than max_retry_after
+        """
+        if retry_after is not None:
+            # Retrying sooner than asked would only be rejected again
+            return retry_after if retry_after <= self.max_retry_after else None
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """Fails fast while the upstream is unhealthy.
+
+    The circuit opens after a number of consecutive failures, rejects calls until
+    the reset timeout has passed, then lets a single probe call through (half-open).
+    A successful probe closes the circuit; a failed probe opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before allowing a probe
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current circuit state."""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def before_call(self) -> None:
+        """
+        Check whether a call may proceed.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or a half-open probe is already running
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    raise CircuitOpenError("AI provider is unavailable, please try again later")
+                self._state = self.HALF_OPEN
+            if self._probe_in_flight:
+                raise CircuitOpenError("AI provider is recovering, please try again later")
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        """Record a successful call and close the circuit."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Record a call that says nothing about upstream health, letting another probe through without closing the circuit."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit at the threshold or after a failed probe."""
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def reset(self) -> None:
+        """Close the circuit and forget past failures."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._opened_at = 0.0
+            self._probe_in_flight = False
+
+
+class Bulkhead:
+    """Caps concurrent upstream calls with a bounded wait queue."""
+
+    def __init__(self, max_in_flight: int = 4, max_queue: int = 16, queue_timeout: float = 10.0):
+        """
+        Initialize the bulkhead.
+
+        Args:
+            max_in_flight: Maximum concurrent calls
+            max_queue: Maximum callers waiting for a slot
+            queue_timeout: Seconds a caller waits for a slot before being rejected
+        """
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiting = 0
+        self.rejected = 0
+
+    def acquire(self) -> None:
+        """
+        Take an upstream slot, waiting in the queue if none is free; pair with release().
+
+        Raises:
+            BulkheadFullError: If the wait queue is full or no slot frees up in time
+        """
+        acquired = self._semaphore.acquire(blocking=False)
+        if not acquired:
+            with self._lock:
+                if self._waiting >= self.max_queue:
+                    self.rejected += 1
+                    raise BulkheadFullError("Too many AI requests in progress, please try again shortly")
+                self._waiting += 1
+            try:
+                acquired = self._semaphore.acquire(timeout=self.queue_timeout)
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+            if not acquired:
+                with self._lock:
+                    self.rejected += 1
+                raise BulkheadFullError("Timed out waiting for an AI request slot")
+
+        with self._lock:
+            self._in_flight += 1
+
+    def release(self) -> None:
+        """Give back a slot taken with acquire()."""
+        with self._lock:
+            self._in_flight -= 1
+        self._semaphore.release()
+
+    @contextmanager
+    def slot(self):
+        """
+        Hold an upstream slot for the duration of the block.
+
+        Raises:
+            BulkheadFullError: If the wait queue is full or no slot frees up in time
+        """
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> Dict[str, int]:
+        """Get the bulkhead counters."""
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+                "max_in_flight": self.max_in_flight,
+                "max_queue": self.max_queue,
+                "rejected": self.rejected
+            }
+
+
+class AdmittedStream:
+    """Iterator over an opened upstream stream that holds its bulkhead slot until exhausted or closed.
+
+    Admission happens when the stream is opened, before the caller commits to a
+    response; the slot is given back once, on exhaustion, error or close(), and
+    as a last resort when the stream is garbage collected without being read.
+    """
+
+    def __init__(self, chunks: Iterator[Any], release: Callable[[], None]):
+        """
+        Initialize the stream.
+
+        Args:
+            chunks: Iterator reading the upstream stream
+            release: Gives back the slot
+        """
+        self._chunks = chunks
+        self._release: Optional[Callable[[], None]] = release
+
+    def __iter__(self) -> "AdmittedStream":
+        return self
+
+    def __next__(self) -> Any:
+        if self._release is None:
+            raise StopIteration
+        try:
+            return next(self._chunks)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """Stop reading the stream and give back the slot."""
+        release, self._release = self._release, None
+        if release is None:
+            return
+        try:
+            close = getattr(self._chunks, "close", None)
+            if close is not None:
+                close()
+        finally:
+            release()
+
+    def __del__(self):
+        self.close()
+
+
+class UpstreamGuard:
+    """Combines the bulkhead, circuit breaker and retry policy around upstream calls."""
+
+    def __init__(self, retry_policy: RetryPolicy, circuit_breaker: CircuitBreaker, bulkhead: Bulkhead,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize the guard.
+
+        Args:
+            retry_policy: Backoff policy for retryable failures
+            circuit_breaker: Breaker tracking upstream health
+            bulkhead: Concurrency limiter for upstream calls
+            sleep: Sleep function, replaceable in tests
+        """
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.bulkhead = bulkhead
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.retries = 0
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """
+        Call the upstream with admission control, retries and circuit breaking.
+
+        A slot is held for each attempt and given back during the backoff, so
+        callers waiting out a rate limit do not keep others from the upstream.
+
+        Args:
+            fn: Zero-argument callable making one upstream attempt; raises UpstreamError on failure
+
+        Returns:
+            The result of fn
+
+        Raises:
+            BulkheadFullError: If an attempt is not admitted
+            CircuitOpenError: If the upstream is considered unhealthy
+            UpstreamError: If the last attempt failed, or the upstream asked to wait too long
+        """
+        return self._call(fn, self.bulkhead.slot)
+
+    def open_stream(self, open_fn: Callable[[], Any], read_fn: Callable[[Any], Iterator[Any]]) -> AdmittedStream:
+        """
+        Admit and open a streamed upstream call, holding a slot until the stream is done.
+
+        Opening is retried like a call, with a slot taken for each attempt and given
+        back during the backoff; the slot of the attempt that opened the stream is
+        kept until the stream is done. Failures after the stream is open are not retried.
+
+        Args:
+            open_fn: Zero-argument callable opening the stream; raises UpstreamError on failure
+            read_fn: Turns the opened stream into an iterator of chunks
+
+        Returns:
+            The open stream
+
+        Raises:
+            BulkheadFullError: If an attempt is not admitted
+            CircuitOpenError: If the upstream is considered unhealthy
+            UpstreamError: If opening failed
+        """
+        def open_attempt():
+            self.bulkhead.acquire()
+            try:
+                return read_fn(open_fn())
+            except BaseException:
+                self.bulkhead.release()
+                raise
+
+        return AdmittedStream(self._call(open_attempt, nullcontext), self.bulkhead.release)
+
+    def _call(self, fn: Callable[[], Any], slot: Callable[[], ContextManager]) -> Any:
+        """Run attempts of fn, each inside slot(), sleeping between retryable failures."""
+        for attempt in range(self.retry_policy.max_attempts):
+            with slot():
+                self.circuit_breaker.before_call()
+                try:
+                    result = fn()
+                except UpstreamError as e:
+                    if not e.retryable:
+                        # Client errors say nothing about upstream health
+                        self.circuit_breaker.release_probe()
+                        raise
+                    self.circuit_breaker.record_failure()
+                    error = e
+                except Exception:
+                    # The upstream answered, but with an unusable response
+                    self.circuit_breaker.release_probe()
+                    raise
+                else:
+                    self.circuit_breaker.record_success()
+                    return result
+
+            delay = None
+            if attempt + 1 < self.retry_policy.max_attempts:
+                delay = self.retry_policy.delay(attempt, error.retry_after)
+            if delay is None:
+                raise error
+            with self._lock:
+                self.retries += 1
+            self._sleep(delay)
+
+    def reset(self) -> None:
+        """Close the circuit and zero the retry counter; calls in flight keep their slots."""
+        self.circuit_breaker.reset()
+        with self._lock:
+            self.retries = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the guard counters."""
+        return {
+            "circuit_state": self.circuit_breaker.state,
+            "retries": self.retries,
+            **self.bulkhead.stats()
+        }
@@ -0,0 +1,364 @@
+"""
+In-process HTTP response cache.
+Stores the serialized bytes of read responses, plus compressed variants, under version-aware keys.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Pattern, Sequence, Set, Tuple
+from urllib.parse import parse_qsl
+
+from starlette.datastructures import Headers
+
+from .compression import DEFAULT_LEVELS, DEFAULT_MIN_SIZE, SUPPORTED_ENCODINGS, choose_encoding, compress
+from .etag import etag_matches
+
+# Headers recomputed for every cached response
+_VOLATILE_HEADERS = {b"content-length", b"content-encoding", b"vary", b"x-cache"}
+
+# Prefix of the CORS headers, which depend on the request's Origin and so must not be replayed
+_CORS_HEADER_PREFIX = b"access-control-"
+
+
+def _stored_headers(headers: Iterable[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    """
+    Select the response headers to store with a cached entry.
+
+    Per-response and per-origin headers are dropped; Vary is kept, without
+    Accept-Encoding, which is added again for every response.
+
+    Args:
+        headers: Response headers with lowercase names
+
+    Returns:
+        Headers to store
+    """
+    stored = [
+        (name, value) for name, value in headers
+        if name not in _VOLATILE_HEADERS and not name.startswith(_CORS_HEADER_PREFIX)
+    ]
+    vary = [
+        field.strip() for name, value in headers if name == b"vary"
+        for field in value.split(b",") if field.strip() and field.strip().lower() != b"accept-encoding"
+    ]
+    if vary:
+        stored.append((b"vary", b", ".join(vary)))
+    return stored
+
+
+class CachedResponse:
+    """A cached 200 response: headers, identity body and compressed variants."""
+
+    __slots__ = ("headers", "body", "etag", "variants")
+
+    def __init__(self, headers: List[Tuple[bytes, bytes]], body: bytes):
+        """
+        Initialize the entry.
+
+        Args:
+            headers: Response headers, without the per-response ones
+            body: Uncompressed response body
+        """
+        self.headers = headers
+        self.body = body
+        self.etag = next((value.decode("latin-1") for name, value in headers if name == b"etag"), None)
+        self.variants: Dict[str, bytes] = {}
+
+    @property
+    def size(self) -> int:
+        """Bytes held by the entry."""
+        return len(self.body) + sum(len(variant) for variant in self.variants.values())
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of responses bounded by total size in bytes.
+
+    Entries carry tags so that a write can drop exactly the responses it affects.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, max_entry_bytes: int = 4 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Total size of bodies and variants kept before evicting the least recently used
+            max_entry_bytes: Largest body that is cached
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._entry_tags: Dict[Hashable, Tuple[str, ...]] = {}
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """
+        Get an entry and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached response or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: Hashable, entry: CachedResponse, tags: Iterable[str] = ()) -> bool:
+        """
+        Store an entry, evicting the least recently used entries if over the size bound.
+
+        Args:
+            key: Cache key
+            entry: Response to cache
+            tags: Invalidation tags of the response
+
+        Returns:
+            True if stored, False if the body is too large to cache
+        """
+        if len(entry.body) > self.max_entry_bytes:
+            return False
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._entry_tags[key] = tuple(tags)
+            for tag in self._entry_tags[key]:
+                self._tags.setdefault(tag, set()).add(key)
+            self._bytes += entry.size
+            self._evict()
+        return True
+
+    def add_variant(self, key: Hashable, entry: CachedResponse, encoding: str, body: bytes) -> None:
+        """
+        Attach a compressed variant to a cached entry.
+
+        Args:
+            key: Cache key of the entry
+            entry: The entry, as returned by get
+            encoding: Content coding of the variant
+            body: Compressed body
+        """
+        with self._lock:
+            if encoding in entry.variants:
+                return
+            entry.variants[encoding] = body
+            if self._entries.get(key) is entry:
+                self._bytes += len(body)
+                self._evict()
+
+    def invalidate(self, *tags: str) -> int:
+        """
+        Drop every entry carrying any of the tags.
+
+        Args:
+            *tags: Invalidation tags
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            keys = set().union(*(self._tags.get(tag, ()) for tag in tags)) if tags else set()
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._entry_tags.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the cache counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        """Remove an entry and its tag references; the lock must be held."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        for tag in self._entry_tags.pop(key, ()):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until within the size bound; the lock must be held."""
+        while self._bytes > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+
+class CacheRule:
+    """A cacheable GET route and how to derive its version key and invalidation tags."""
+
+    def __init__(self, path: str, version: Callable[[Dict[str, str]], Hashable],
+                 tags: Callable[[Dict[str, str]], Sequence[str]]):
+        """
+        Initialize the rule.
+
+        Args:
+            path: Regular expression matched against the full request path, with named groups
+            version: Returns the current data version for the matched path parameters
+            tags: Returns the invalidation tags for the matched path parameters
+        """
+        self.pattern: Pattern = re.compile(path)
+        self.version = version
+        self.tags = tags
+
+
+class ResponseCacheMiddleware:
+    """ASGI middleware serving cached GET responses for the configured routes.
+
+    The data version is part of the key and is read before the request is handled,
+    so a response built while a write happens is stored under the old version and
+    never served for the new one. Responses honor If-None-Match and are sent
+    compressed when the client accepts it; each encoding of an entry is compressed
+    once, on the first request that asks for it, and kept with the entry.
+    """
+
+    def __init__(self, app, cache: ResponseCache, rules: Sequence[CacheRule], minimum_size: int = DEFAULT_MIN_SIZE,
+                 levels: Optional[Dict[str, int]] = None, encodings: Sequence[str] = SUPPORTED_ENCODINGS):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application
+            cache: Response cache
+            rules: Cacheable routes
+            minimum_size: Smallest body that is sent compressed
+            levels: Compression level per encoding (defaults to DEFAULT_LEVELS)
+            encodings: Encodings to offer, most preferred first
+        """
+        self.app = app
+        self.cache = cache
+        self.rules = rules
+        self.minimum_size = minimum_size
+        self.levels = {**DEFAULT_LEVELS, **(levels or {})}
+        self.encodings = tuple(encoding for encoding in encodings if encoding in SUPPORTED_ENCODINGS)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        rule, params = self._match(scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        query = tuple(sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)))
+        key = (scope["path"], query, rule.version(params))
+        request_headers = Headers(scope=scope)
+
+        entry = self.cache.get(key)
+        if entry is not None:
+            await self._send_entry(send, key, entry, request_headers, b"HIT")
+            return
+
+        await self._handle_miss(scope, receive, send, key, rule.tags(params), request_headers)
+
+    def _match(self, path: str) -> Tuple[Optional[CacheRule], Dict[str, str]]:
+        for rule in self.rules:
+            match = rule.pattern.fullmatch(path)
+            if match:
+                return rule, match.groupdict()
+        return None, {}
+
+    async def _send_entry(self, send, key: Hashable, entry: CachedResponse, request_headers: Headers,
+                          cache_status: bytes) -> None:
+        """Send a cached response in the client's encoding, or 304 if the client's copy is current."""
+        if entry.etag and etag_matches(request_headers.get("if-none-match"), entry.etag):
+            headers = [(name, value) for name, value in entry.headers if name in (b"etag", b"cache-control")]
+            await send({"type": "http.response.start", "status": 304, "headers": headers + [(b"x-cache", cache_status)]})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        body, encoding = entry.body, None
+        if len(entry.body) >= self.minimum_size:
+            encoding = choose_encoding(request_headers.get("accept-encoding"), self.encodings)
+            if encoding is not None:
+                variant = entry.variants.get(encoding)
+                if variant is None:
+                    variant = compress(entry.body, encoding, self.levels[encoding])
+                    self.cache.add_variant(key, entry, encoding, variant)
+                body = variant
+
+        headers = [(name, value) for name, value in entry.headers if name != b"vary"]
+        vary = [value for name, value in entry.headers if name == b"vary"]
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        headers.append((b"vary", b", ".join(vary + [b"Accept-Encoding"])))
+        headers.append((b"x-cache", cache_status))
+        if encoding is not None:
+            headers.append((b"content-encoding", encoding.encode("latin-1")))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _handle_miss(self, scope, receive, send, key: Hashable, tags: Sequence[str],
+                           request_headers: Headers) -> None:
+        """Pass the request through, caching a 200 response and sending it like a hit."""
+        state = {"start": None, "size": 0}
+        chunks: List[bytes] = []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                headers = [(name.lower(), value) for name, value in message.get("headers", [])]
+                if message["status"] == 200 and not any(name == b"content-encoding" for name, _ in headers):
+                    # Held back until the whole body is in, to be stored and sent in the client's encoding
+                    state["start"] = message
+                    return
+            elif message["type"] == "http.response.body" and state["start"] is not None:
+                body = message.get("body", b"")
+                state["size"] += len(body)
+                if state["size"] > self.cache.max_entry_bytes:
+                    # Too large to cache: release what was held back and stream the rest
+                    await send(state["start"])
+                    state["start"] = None
+                    for chunk in chunks:
+                        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                    chunks.clear()
+                else:
+                    chunks.append(body)
+                    if not message.get("more_body", False):
+                        headers = _stored_headers(
+                            (name.lower(), value) for name, value in state["start"].get("headers", [])
+                        )
+                        entry = CachedResponse(headers, b"".join(chunks))
+                        self.cache.set(key, entry, tags)
+                        await self._send_entry(send, key, entry, request_headers, b"MISS")
+                    return
+            await send(message)
+
+        await self.app(scope, receive, capture)
@@ -0,0 +1,70 @@
+"""
+Single-flight request coalescing.
+Concurrent calls with the same key share one in-flight execution and its result.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one execution."""
+    
+    def __init__(self):
+        """Initialize the in-flight table and counters."""
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+    
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key.
+        
+        The first caller (the leader) executes fn; callers arriving while it is
+        in flight wait for the leader's result or exception instead.
+        
+        Args:
+            key: Content hash identifying identical work
+            fn: Zero-argument callable performing the work
+            
+        Returns:
+            The result of fn
+            
+        Raises:
+            Exception: Whatever fn raised, re-raised in every waiting caller
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[key] = future
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        
+        if not is_leader:
+            return future.result()
+        
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+    
+    def stats(self) -> Dict[str, int]:
+        """Get the coalescing counters."""
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._in_flight)
+            }
@@ -0,0 +1,54 @@
+"""
+Server-Sent Events utilities.
+Formats messages for text/event-stream responses.
+"""
+
+import json
+from typing import Any, Optional
+
+# Headers that keep proxies from buffering or caching an event stream
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+# Headers for long-lived, mostly idle streams; no-transform skips response compression,
+# whose per-connection compressor state costs far more than the few bytes it would save
+IDLE_SSE_HEADERS = {
+    **SSE_HEADERS,
+    "Cache-Control": "no-cache, no-transform",
+}
+
+
+def format_sse(data: Any, event: Optional[str] = None, event_id: Optional[str] = None) -> str:
+    """
+    Format a single Server-Sent Event.
+    
+    Args:
+        data: JSON-serializable payload
+        event: Optional event name
+        event_id: Optional event ID the client can resume from
+        
+    Returns:
+        str: Encoded event terminated by a blank line
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+def format_sse_comment(comment: str = "") -> str:
+    """
+    Format an SSE comment line, used to open the stream and as a keep-alive.
+    
+    Args:
+        comment: Comment text
+        
+    Returns:
+        str: Encoded comment
+    """
+    return f": {comment}\n\n"
@@ -0,0 +1,76 @@
+"""
+Startup timing.
+Records how long the application took to import and to run each startup step.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class StartupTimer:
+    """Durations of named startup phases, measured from a common start.
+
+    The report is printed once the server is up and served at /startup, so a
+    slow worker boot can be traced to the import or the step that caused it.
+    """
+
+    def __init__(self, started: Optional[float] = None):
+        """
+        Initialize the timer.
+
+        Args:
+            started: time.perf_counter() value the phases are measured from (defaults to now)
+        """
+        self.started = time.perf_counter() if started is None else started
+        self._last = self.started
+        self._lock = threading.Lock()
+        self._phases: List[Tuple[str, float]] = []
+
+    def mark(self, name: str) -> float:
+        """
+        End a phase that ran since the previous mark.
+
+        Args:
+            name: Phase name
+
+        Returns:
+            Duration of the phase in milliseconds
+        """
+        now = time.perf_counter()
+        with self._lock:
+            duration = (now - self._last) * 1000
+            self._last = now
+            self._phases.append((name, duration))
+        return duration
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time a block as a phase, excluding any time since the previous mark.
+
+        Args:
+            name: Phase name
+        """
+        with self._lock:
+            self._last = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.mark(name)
+
+    def report(self) -> Dict[str, Any]:
+        """Get the phase durations and their total in milliseconds."""
+        with self._lock:
+            phases = list(self._phases)
+        return {
+            "phases": {name: round(duration, 1) for name, duration in phases},
+            "total_ms": round(sum(duration for _, duration in phases), 1)
+        }
+
+    def format(self) -> str:
+        """Format the report as one log line."""
+        report = self.report()
+        phases = ", ".join(f"{name} {duration:.0f} ms" for name, duration in report["phases"].items())
+        return f"Startup took {report['total_ms']:.0f} ms ({phases})"
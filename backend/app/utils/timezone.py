@@ -66,3 +66,28 @@ def israel_to_utc(israel_dt):
         # Assume it's Israel time if no timezone info
         israel_dt = israel_tz.localize(israel_dt)
     return israel_dt.astimezone(pytz.utc)
+
+
+def parse_timestamp(value):
+    """
+    Parse an ISO 8601 timestamp into a naive Israel-time datetime.
+    
+    Timestamps are stored naive in Israel time, so aware values are converted
+    to Israel time before their timezone is dropped.
+    
+    Args:
+        value: ISO 8601 string or datetime
+        
+    Returns:
+        datetime: Naive datetime in Israel time, or None if value is empty or invalid
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if value.tzinfo is not None:
+        value = value.astimezone(get_israel_timezone()).replace(tzinfo=None)
+    return value
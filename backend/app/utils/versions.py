@@ -0,0 +1,84 @@
+"""
+Data version counters.
+Lets caches detect that the data behind an entry changed by comparing a cheap version number.
+"""
+
+import threading
+from typing import Any, Dict, Hashable
+
+from .events import events, QUESTION_CREATED, QUESTION_CLOSED, QUESTION_DELETED, ANSWER_SUBMITTED
+
+
+class VersionCounter:
+    """Thread-safe, monotonically increasing version number."""
+
+    def __init__(self):
+        """Initialize the counter at version 0."""
+        self._lock = threading.Lock()
+        self._value = 0
+
+    @property
+    def value(self) -> int:
+        """Current version."""
+        return self._value
+
+    def bump(self, **payload: Any) -> int:
+        """
+        Advance the version. Accepts and ignores event payloads so it can be subscribed directly.
+
+        Returns:
+            The new version
+        """
+        with self._lock:
+            self._value += 1
+            return self._value
+
+
+class KeyedVersionCounter:
+    """Thread-safe version numbers per key, such as per question.
+
+    Versions are never reset, so a deleted and recreated key does not repeat old versions.
+    """
+
+    def __init__(self, key_field: str):
+        """
+        Initialize the counters.
+
+        Args:
+            key_field: Event payload field holding the key, used by bump
+        """
+        self.key_field = key_field
+        self._lock = threading.Lock()
+        self._values: Dict[Hashable, int] = {}
+
+    def value(self, key: Hashable) -> int:
+        """Current version of a key; keys never bumped are at version 0."""
+        return self._values.get(key, 0)
+
+    def bump(self, **payload: Any) -> int:
+        """
+        Advance the version of the key named by the event payload.
+
+        Returns:
+            The new version of that key
+        """
+        key = payload[self.key_field]
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + 1
+            return self._values[key]
+
+
+# Version of the question bank, advanced whenever a question is created, closed or deleted
+question_set_version = VersionCounter()
+for _event in (QUESTION_CREATED, QUESTION_CLOSED, QUESTION_DELETED):
+    events.subscribe(_event, question_set_version.bump)
+
+# Version of the question list, which also shows answer counts
+question_list_version = VersionCounter()
+for _event in (QUESTION_CREATED, QUESTION_CLOSED, QUESTION_DELETED, ANSWER_SUBMITTED):
+    events.subscribe(_event, question_list_version.bump)
+
+# Version of each question's answer view (the question and its answers)
+question_answers_version = KeyedVersionCounter("question_id")
+for _event in (QUESTION_CLOSED, QUESTION_DELETED, ANSWER_SUBMITTED):
+    events.subscribe(_event, question_answers_version.bump)
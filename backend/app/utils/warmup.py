@@ -0,0 +1,85 @@
+"""
+Startup warm-up.
+Preloads caches in parallel after a start and tracks whether the instance is ready for traffic.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class WarmUp:
+    """Named preload tasks, run once in parallel worker threads.
+
+    Until every task has finished the instance reports not ready, so a load
+    balancer keeps the first burst of requests away from cold caches. A task
+    that fails leaves its cache to fill on first use, which costs latency but
+    not correctness, so the failure is reported and readiness is not held back.
+    """
+
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, tasks: Dict[str, Callable[[], Any]]):
+        """
+        Initialize the warm-up.
+
+        Args:
+            tasks: Task callables by name; each returns the number of items it loaded
+        """
+        self.tasks = tasks
+        self.ready = False
+        self.duration_ms: Optional[float] = None
+        self._started: Optional[float] = None
+        self._lock = threading.Lock()
+        self._results: Dict[str, Dict[str, Any]] = {name: {"status": self.PENDING} for name in tasks}
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run every task in its own thread and wait for all of them.
+
+        Returns:
+            The warm-up status
+        """
+        if self._started is not None:
+            return self.status()
+        self._started = time.perf_counter()
+        await asyncio.gather(*(asyncio.to_thread(self._run_task, name, task) for name, task in self.tasks.items()))
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+        self.ready = True
+        return self.status()
+
+    def _run_task(self, name: str, task: Callable[[], Any]) -> None:
+        """Run one task, recording its duration and item count or error."""
+        started = time.perf_counter()
+        try:
+            result = {"status": self.DONE, "items": task()}
+        except Exception as e:
+            print(f"❌ Warm-up task {name} failed: {e}")
+            result = {"status": self.FAILED, "error": str(e)}
+        result["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        with self._lock:
+            self._results[name] = result
+
+    def status(self) -> Dict[str, Any]:
+        """Get readiness, the total duration and each task's result in milliseconds."""
+        with self._lock:
+            tasks = {name: dict(result) for name, result in self._results.items()}
+        return {
+            "ready": self.ready,
+            "duration_ms": round(self.duration_ms, 1) if self.duration_ms is not None else None,
+            "tasks": tasks
+        }
+
+    def format(self) -> str:
+        """Format the status as one log line."""
+        status = self.status()
+        tasks = ", ".join(
+            f"{name} {result['duration_ms']:.0f} ms"
+            + (f" ({result['items']} items)" if result["status"] == self.DONE else f" ({result['status']})")
+            for name, result in status["tasks"].items()
+            if "duration_ms" in result
+        )
+        return f"Warm-up took {status['duration_ms'] or 0:.0f} ms ({tasks})"
@@ -42,3 +42,60 @@ CREATE UNIQUE INDEX uq_question_student ON answers (question_id, student_id);
 -- Optional: Add foreign key constraint (SQLite supports this but it's disabled by default)
 -- To enable foreign key constraints in SQLite, run: PRAGMA foreign_keys = ON;
 -- FOREIGN KEY (question_id) REFERENCES questions(id)
+
+-- Table 3: Summary jobs (background AI summarization)
+CREATE TABLE summary_jobs (
+    id VARCHAR(32) PRIMARY KEY,
+    content_hash VARCHAR(64) NOT NULL,
+    question_id INTEGER,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending',
+    request_payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- De-duplicate identical requests by content hash
+CREATE INDEX ix_summary_jobs_content_hash ON summary_jobs (content_hash);
+
+-- Find jobs to resume after a restart
+CREATE INDEX ix_summary_jobs_status ON summary_jobs (status);
+
+CREATE INDEX ix_summary_jobs_question_id ON summary_jobs (question_id);
+
+-- Table 4: Question summaries (latest AI summary per question and instructions)
+CREATE TABLE question_summaries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    question_id INTEGER NOT NULL,
+    instructions_hash VARCHAR(64) NOT NULL,
+    summary_instructions TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    answer_count INTEGER NOT NULL DEFAULT 0,
+    last_answer_id INTEGER,
+    last_answer_at DATETIME,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX ix_question_summaries_question_id ON question_summaries (question_id);
+
+-- One stored summary per question and set of instructions
+CREATE UNIQUE INDEX uq_question_instructions ON question_summaries (question_id, instructions_hash);
+
+-- Table 5: Change log (append-only; written in the same transaction as question and answer mutations)
+CREATE TABLE changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,  -- AUTOINCREMENT: never reused after compaction
+    entity VARCHAR(16) NOT NULL,
+    entity_id INTEGER NOT NULL,
+    op VARCHAR(16) NOT NULL,
+    question_id INTEGER,
+    data TEXT,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Changes of one question
+CREATE INDEX ix_changes_question_id ON changes (question_id);
+
+-- Age-based compaction
+CREATE INDEX ix_changes_created_at ON changes (created_at);
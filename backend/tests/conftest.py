@@ -20,6 +20,7 @@ try:
     from app.database.models.question import Question
     from app.database.models.answer import Answer
     from app.main import app
+    from app.api.dependencies import container
 except ImportError:
     import sys
     import os
@@ -29,6 +30,7 @@ except ImportError:
     from app.database.models.question import Question
     from app.database.models.answer import Answer
     from app.main import app
+    from app.api.dependencies import container
 
 # Test database configuration
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -53,6 +55,12 @@ def db_session():
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture
+def session_factory(db_session):
+    """Session factory bound to the test database, for code that opens its own sessions."""
+    return TestingSessionLocal
+
+
 @pytest.fixture
 def client(db_session):
     """Create a test client with database session override."""
@@ -63,9 +71,12 @@ def client(db_session):
             pass
     
     app.dependency_overrides[get_db] = override_get_db
+    # Version counters outlive the per-test database, so cached responses and feeds must not
+    container.reset()
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+    container.reset()
 
 
 @pytest.fixture
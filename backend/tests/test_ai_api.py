@@ -0,0 +1,221 @@
+"""
+Integration tests for AI API endpoints.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+try:
+    from app.api.dependencies import container
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.api.dependencies import container
+
+
+@pytest.fixture
+def summarization_request():
+    """Sample summarization request body."""
+    return {
+        "context": {
+            "question_id": 1,
+            "question_text": "What is photosynthesis?",
+            "summary_instructions": "List the main ideas"
+        },
+        "student_answers": [
+            {
+                "student_id": "STU1001",
+                "student_name": "Shaked Grunfeld",
+                "answer_text": "Plants turn light into energy",
+                "submitted_at": "2024-01-01T10:00:00+02:00"
+            }
+        ]
+    }
+
+
+class TestSummarizeStreamAPI:
+    """Test cases for the streaming summary endpoint."""
+    
+    def test_stream_summary_events(self, client: TestClient, summarization_request, monkeypatch):
+        """Test that tokens are forwarded as SSE and the final text is cached."""
+        service = container.summarization_service
+        service.summary_cache.clear()
+        monkeypatch.setattr(
+            service, "_stream_openai_request",
+            lambda messages, cancel_event=None: iter(["Plants ", "make ", "energy"])
+        )
+        
+        with client.stream("POST", "/api/v1/ai/summarize/stream", json=summarization_request) as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+            body = "".join(response.iter_text())
+        
+        assert body.count("event: delta") == 3
+        assert 'event: done\ndata: {"summary":"Plants make energy"}' in body
+        
+        # The streamed text is served from the cache without another upstream call
+        monkeypatch.setattr(service, "_make_openai_request", lambda *args, **kwargs: pytest.fail("upstream called"))
+        response = client.post("/api/v1/ai/summarize", json=summarization_request)
+        assert response.json()["summary"] == "Plants make energy"
+    
+    def test_stream_summary_invalid_request(self, client: TestClient, summarization_request):
+        """Test that validation errors are returned before the stream starts."""
+        summarization_request["student_answers"] = []
+        
+        response = client.post("/api/v1/ai/summarize/stream", json=summarization_request)
+        
+        assert response.status_code == 500
+        assert "No student answers" in response.json()["detail"]
+
+
+class TestSummarizeQuestionAPI:
+    """Test cases for the server-side summarize-by-question endpoint."""
+    
+    def test_summarize_question_loads_answers_server_side(self, client: TestClient, sample_question_data, monkeypatch):
+        """Test that answers are read from the database and only instructions are uploaded."""
+        question_id = client.post("/api/v1/questions/open", json=sample_question_data).json()["id"]
+        client.post("/api/v1/answers/submit", json={
+            "access_code": sample_question_data["access_code"],
+            "student_id": "STU1001",
+            "answer_text": "Paris"
+        })
+        prompts = []
+        monkeypatch.setattr(
+            container.summarization_service, "_make_openai_request",
+            lambda messages, json_response=False, **kwargs: prompts.append(messages[1]["content"]) or "Everyone said Paris"
+        )
+        
+        response = client.post(
+            f"/api/v1/ai/questions/{question_id}/summarize",
+            json={"summary_instructions": "Summarize", "incremental": False}
+        )
+        
+        assert response.status_code == 200
+        assert response.json() == {"question_id": question_id, "summary": "Everyone said Paris", "answer_count": 1}
+        assert "Shaked Grunfeld|Paris" in prompts[0]
+    
+    def test_deleted_question_summary_is_not_reused(self, client: TestClient, sample_question_data, monkeypatch):
+        """Test that a new question given a deleted question's ID does not inherit its stored summary."""
+        prompts = []
+        monkeypatch.setattr(
+            container.summarization_service, "_make_openai_request",
+            lambda messages, json_response=False, **kwargs: prompts.append(messages[1]["content"]) or f"SUMMARY-{len(prompts)}"
+        )
+        
+        def answered_question(access_code, answer_text):
+            question_id = client.post("/api/v1/questions/open", json={**sample_question_data, "access_code": access_code}).json()["id"]
+            client.post("/api/v1/answers/submit", json={"access_code": access_code, "student_id": "STU1001", "answer_text": answer_text})
+            return question_id
+        
+        old_id = answered_question("OLD1", "Paris")
+        assert client.get(f"/api/v1/ai/questions/{old_id}/summary").json()["summary"] == "SUMMARY-1"
+        assert client.delete(f"/api/v1/questions/{old_id}").status_code == 200
+        
+        new_id = answered_question("NEW1", "Lyon")
+        response = client.get(f"/api/v1/ai/questions/{new_id}/summary")
+        
+        assert new_id == old_id
+        assert response.json()["summary"] == "SUMMARY-2"
+        assert "SUMMARY-1" not in prompts[1]
+    
+    def test_summarize_question_not_found(self, client: TestClient):
+        """Test summarizing a question that does not exist."""
+        response = client.post("/api/v1/ai/questions/999/summarize", json={"summary_instructions": "Summarize"})
+        
+        assert response.status_code == 404
+    
+    def test_summarize_question_without_answers(self, client: TestClient, sample_question_data):
+        """Test summarizing a question with no answers."""
+        question_id = client.post("/api/v1/questions/open", json=sample_question_data).json()["id"]
+        
+        response = client.post(f"/api/v1/ai/questions/{question_id}/summarize", json={"summary_instructions": "Summarize"})
+        
+        assert response.status_code == 400
+
+
+class TestQuestionSearchAPI:
+    """Test cases for the query-only search endpoint."""
+    
+    @pytest.fixture
+    def questions(self, client: TestClient):
+        """Create an open and a closed question."""
+        plants = client.post("/api/v1/questions/open", json={
+            "title": "Plants", "text": "Explain photosynthesis in green plants", "access_code": "PLANT1"
+        }).json()["id"]
+        capitals = client.post("/api/v1/questions/open", json={
+            "title": "Geography", "text": "What is the capital of France?", "access_code": "GEO1"
+        }).json()["id"]
+        client.patch(f"/api/v1/questions/{capitals}/close")
+        return {"plants": plants, "capitals": capitals}
+    
+    def test_search_ranks_matching_questions(self, client: TestClient, questions):
+        """Test that the best lexical match is returned with a score."""
+        response = client.get("/api/v1/ai/search", params={"q": "photosynthesis plants"})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["matching_question_ids"] == [questions["plants"]]
+        assert 0 < data["results"][0]["score"] <= 1
+    
+    def test_search_filters_by_status(self, client: TestClient, questions):
+        """Test that the status filter excludes non-matching questions."""
+        response = client.get("/api/v1/ai/search", params={"q": "capital France", "status": "open"})
+        
+        assert response.json()["matching_question_ids"] == []
+        
+        response = client.get("/api/v1/ai/search", params={"q": "capital France", "status": "closed"})
+        assert response.json()["matching_question_ids"] == [questions["capitals"]]
+    
+    def test_search_requires_query(self, client: TestClient):
+        """Test that an empty query is rejected."""
+        assert client.get("/api/v1/ai/search", params={"q": ""}).status_code == 422
+
+
+class TestSmartSearchAPI:
+    """Test cases for the smart search endpoint."""
+    
+    def test_local_provider_ranks_with_index(self, client: TestClient, monkeypatch):
+        """Test that AI_PROVIDER=local answers from the TF-IDF index without a prompt."""
+        service = container.smart_search_service
+        monkeypatch.setattr(service.config, "AI_PROVIDER", "local")
+        monkeypatch.setattr(service, "_make_openai_request", lambda *args, **kwargs: pytest.fail("upstream called"))
+        
+        response = client.post("/api/v1/ai/smart-search", json={
+            "query": "capital of France",
+            "available_questions": [
+                {"id": 1, "text": "Explain photosynthesis in green plants"},
+                {"id": 2, "text": "What is the capital of France?"}
+            ]
+        })
+        
+        assert response.status_code == 200
+        assert response.json()["matching_question_ids"] == [2]
+        assert service.get_stats().requests == 0
+
+
+class TestSmartSearchBatchAPI:
+    """Test cases for the batch smart search endpoint."""
+    
+    def test_batch_returns_matches_per_query(self, client: TestClient):
+        """Test that every query gets its own matches, in request order."""
+        response = client.post("/api/v1/ai/smart-search/batch", json={
+            "queries": ["capital of France", "photosynthesis"],
+            "available_questions": [
+                {"id": 1, "text": "Explain photosynthesis in green plants"},
+                {"id": 2, "text": "What is the capital of France?"}
+            ],
+            "provider": "local"
+        })
+        
+        assert response.status_code == 200
+        assert response.json()["results"] == [
+            {"query": "capital of France", "matching_question_ids": [2]},
+            {"query": "photosynthesis", "matching_question_ids": [1]}
+        ]
+    
+    def test_batch_requires_queries(self, client: TestClient):
+        """Test that an empty query list is rejected."""
+        response = client.post("/api/v1/ai/smart-search/batch", json={"queries": [], "available_questions": []})
+        
+        assert response.status_code == 422
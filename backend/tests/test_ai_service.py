@@ -0,0 +1,383 @@
+"""
+Unit tests for the AI services.
+"""
+
+import threading
+import time
+import pytest
+
+try:
+    from app.services.ai_service import AISummarizationService, AISmartSearchService
+    from app.services.question_service import QuestionService
+    from app.services.search_index import normalize_query
+    from app.database.repositories.question_repository import QuestionRepository
+    from app.models.ai_models import SmartSearchRequest, BatchSmartSearchRequest, QuestionItem
+    from app.services.search_index import QuestionSearchIndex
+    from app.utils.cache import LRUCache
+    from app.utils.single_flight import SingleFlight
+    from app.utils.versions import question_set_version
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.services.ai_service import AISummarizationService, AISmartSearchService
+    from app.services.question_service import QuestionService
+    from app.services.search_index import normalize_query
+    from app.database.repositories.question_repository import QuestionRepository
+    from app.models.ai_models import SmartSearchRequest, BatchSmartSearchRequest, QuestionItem
+    from app.services.search_index import QuestionSearchIndex
+    from app.utils.cache import LRUCache
+    from app.utils.single_flight import SingleFlight
+    from app.utils.versions import question_set_version
+
+
+class TestSingleFlight:
+    """Test cases for single-flight request coalescing."""
+    
+    def test_concurrent_identical_calls_share_one_execution(self):
+        """Test that concurrent callers with the same key get one shared result."""
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+        
+        def work():
+            calls.append(1)
+            release.wait(timeout=5)
+            return "result"
+        
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flight.do("key", work))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        while flight.stats()["coalesced"] < 4:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+        
+        assert len(calls) == 1
+        assert results == ["result"] * 5
+        assert flight.stats() == {"executions": 1, "coalesced": 4, "in_flight": 0}
+    
+    def test_exception_fans_out_to_waiters(self):
+        """Test that a failed execution raises in the leader and is not cached."""
+        flight = SingleFlight()
+        
+        def fail():
+            raise ValueError("upstream failed")
+        
+        with pytest.raises(ValueError):
+            flight.do("key", fail)
+        
+        assert flight.do("key", lambda: "ok") == "ok"
+        assert flight.stats()["executions"] == 2
+
+
+class TestAIBaseService:
+    """Test cases for upstream request handling in AIBaseService."""
+    
+    def test_make_request_coalesces_identical_messages(self, monkeypatch):
+        """Test that identical concurrent prompts make a single upstream call."""
+        service = AISummarizationService()
+        calls = []
+        
+        def slow_send(messages, json_response=False):
+            calls.append(messages)
+            time.sleep(0.2)
+            return "summary"
+        
+        monkeypatch.setattr(service, "_send_openai_request", slow_send)
+        messages = [{"role": "user", "content": "same prompt"}]
+        
+        threads = [threading.Thread(target=service._make_openai_request, args=(messages,)) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        stats = service.get_stats()
+        assert len(calls) == 1
+        assert stats.upstream_calls == 1
+        assert stats.coalesced_requests == 2
+    
+    def test_coalesced_summaries_record_usage_once(self, monkeypatch):
+        """Test that identical concurrent cache misses count one request and its prompt tokens."""
+        from app.models.ai_models import SummarizationRequest
+        
+        service = AISummarizationService()
+        monkeypatch.setattr(service.config, "OPENAI_API_KEY", "test-key")
+        monkeypatch.setattr(service.config, "AI_LOCAL_FALLBACK", False)
+        
+        def slow_send(messages, json_response=False):
+            time.sleep(0.2)
+            return "summary"
+        
+        monkeypatch.setattr(service, "_send_openai_request", slow_send)
+        request = SummarizationRequest(
+            context={"question_id": 1, "question_text": "What is photosynthesis?", "summary_instructions": "Summarize"},
+            student_answers=[{"student_id": "A", "student_name": "A", "answer_text": "light to sugar",
+                              "submitted_at": "2024-01-01T10:00:00"}]
+        )
+        
+        threads = [threading.Thread(target=service.generate_summary, args=(request,)) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        stats = service.get_stats()
+        assert stats.coalesced_requests == 2
+        assert stats.requests == 1
+        assert stats.prompt_tokens_total == stats.recent[0].prompt_tokens
+        assert stats.recent[0].operation == "summarize"
+    
+    def test_failed_request_records_no_usage(self, monkeypatch):
+        """Test that a call that never completes is not counted in the usage stats."""
+        from app.models.ai_models import PromptUsage
+        
+        service = AISmartSearchService()
+        
+        def fail(messages, json_response=False):
+            raise ValueError("bad request")
+        
+        monkeypatch.setattr(service, "_send_openai_request", fail)
+        usage = PromptUsage(prompt_tokens=10, token_budget=100, items_total=1, items_sent=1,
+                            truncated=False, rows_total=1, compression_ratio=1.0)
+        
+        with pytest.raises(ValueError):
+            service._make_openai_request([{"role": "user", "content": "q"}], operation="smart-search", usage=usage)
+        
+        assert service.get_stats().requests == 0
+
+
+class TestIncrementalSummary:
+    """Test cases for incremental summarization."""
+    
+    @staticmethod
+    def make_request(answers):
+        """Build an incremental summarization request from (student, text, timestamp) tuples."""
+        from app.models.ai_models import SummarizationRequest
+        
+        return SummarizationRequest(
+            context={"question_id": 1, "question_text": "What is photosynthesis?", "summary_instructions": "Summarize"},
+            student_answers=[
+                {"student_id": sid, "student_name": sid, "answer_text": text, "submitted_at": ts}
+                for sid, text, ts in answers
+            ],
+            incremental=True
+        )
+    
+    def test_only_new_answers_are_sent(self, db_session, monkeypatch):
+        """Test that later summaries send the previous summary plus the delta."""
+        service = AISummarizationService()
+        prompts = []
+        
+        def fake_request(messages, json_response=False, **kwargs):
+            prompts.append(messages[1]["content"])
+            return f"summary v{len(prompts)}"
+        
+        monkeypatch.setattr(service, "_make_openai_request", fake_request)
+        first = [("A", "light to sugar", "2024-01-01T10:00:00"), ("B", "plants eat sun", "2024-01-01T10:01:00")]
+        
+        assert service.generate_incremental_summary(db_session, self.make_request(first)) == "summary v1"
+        
+        second = first + [("C", "chlorophyll absorbs light", "2024-01-01T10:05:00")]
+        assert service.generate_incremental_summary(db_session, self.make_request(second)) == "summary v2"
+        assert "summary v1" in prompts[1]
+        assert "C|chlorophyll absorbs light" in prompts[1]
+        assert "A|light to sugar" not in prompts[1]
+        
+        # Nothing new: the stored summary is served without an upstream call
+        assert service.generate_incremental_summary(db_session, self.make_request(second)) == "summary v2"
+        assert len(prompts) == 2
+    
+    def test_changed_answer_is_resent(self, db_session, monkeypatch):
+        """Test that an answer updated after the watermark is part of the delta."""
+        service = AISummarizationService()
+        prompts = []
+        monkeypatch.setattr(
+            service, "_make_openai_request",
+            lambda messages, json_response=False, **kwargs: prompts.append(messages[1]["content"]) or "summary"
+        )
+        
+        service.generate_incremental_summary(db_session, self.make_request([("A", "first", "2024-01-01T10:00:00")]))
+        service.generate_incremental_summary(db_session, self.make_request([("A", "second", "2024-01-01T11:00:00")]))
+        
+        assert "A|second" in prompts[1]
+
+
+class TestSmartSearchCache:
+    """Test cases for the smart search result cache."""
+    
+    @pytest.fixture
+    def search(self, monkeypatch):
+        """Smart search service with a stubbed provider matching everything but volcano queries."""
+        service = AISmartSearchService()
+        calls = []
+        
+        def provider(messages, json_response=False, **kwargs):
+            calls.append(messages)
+            return {"matching_question_ids": [] if "volcanoes" in messages[-1]["content"].lower() else [1]}
+        
+        monkeypatch.setattr(service, "_make_openai_request", provider)
+        return service, calls
+    
+    @staticmethod
+    def request(query, questions=None):
+        return SmartSearchRequest(query=query, available_questions=questions or [
+            {"id": 1, "text": "Explain photosynthesis"}, {"id": 2, "text": "Name the capital of France"}
+        ])
+    
+    def test_normalize_query(self):
+        """Test that case, punctuation and spacing do not change the normalized query."""
+        assert normalize_query("  Photosynthesis?? ") == normalize_query("photosynthesis") == "photosynthesis"
+        assert normalize_query("Chapter\u00a03") == "chapter 3"
+    
+    def test_repeated_query_is_served_from_cache(self, search):
+        """Test that an equivalent query does not call the provider again."""
+        service, calls = search
+        
+        assert service.find_relevant_questions(self.request("Photosynthesis")) == [1]
+        assert service.find_relevant_questions(self.request("photosynthesis?")) == [1]
+        assert service.get_cached_results(self.request("PHOTOSYNTHESIS")) == [1]
+        
+        assert len(calls) == 1
+        assert service.get_stats().cache["hits"] == 2
+    
+    def test_queries_without_matches_are_cached(self, search):
+        """Test negative caching of empty results."""
+        service, calls = search
+        
+        assert service.find_relevant_questions(self.request("volcanoes")) == []
+        assert service.find_relevant_questions(self.request("volcanoes")) == []
+        
+        assert len(calls) == 1
+    
+    def test_question_set_change_invalidates(self, search):
+        """Test that a new question-set version or another question list misses the cache."""
+        service, calls = search
+        
+        service.find_relevant_questions(self.request("photosynthesis"))
+        question_set_version.bump()
+        service.find_relevant_questions(self.request("photosynthesis"))
+        service.find_relevant_questions(self.request("photosynthesis", [{"id": 1, "text": "Explain photosynthesis in plants"}]))
+        
+        assert len(calls) == 3
+    
+    def test_question_changes_bump_version(self, db_session):
+        """Test that creating, closing and deleting questions advance the question-set version."""
+        service = QuestionService(QuestionRepository())
+        start = question_set_version.value
+        
+        question_id = service.create_question(db_session, "Title", "Text", "VER1")
+        service.close_question(db_session, question_id)
+        service.delete_question(db_session, question_id)
+        
+        assert question_set_version.value == start + 3
+    
+    def test_entry_ttl_overrides_cache_default(self):
+        """Test that a per-entry lifetime expires that entry only."""
+        cache = LRUCache(max_entries=4)
+        cache.set("short", 1, ttl_seconds=0.01)
+        cache.set("long", 2)
+        time.sleep(0.02)
+        
+        assert cache.get("short") is None
+        assert cache.get("long") == 2
+    
+    def test_zero_ttl_disables_caching(self):
+        """Test that an explicit TTL of zero stores nothing rather than keeping the value forever."""
+        cache = LRUCache(max_entries=4, ttl_seconds=60)
+        cache.set("key", 1)
+        cache.set("key", 2, ttl_seconds=0)
+        
+        assert cache.get("key") is None
+        assert len(cache) == 0
+    
+    def test_zero_negative_ttl_disables_negative_caching(self, search, monkeypatch):
+        """Test that AI_SEARCH_NEGATIVE_TTL_SECONDS=0 resends searches that found nothing."""
+        service, calls = search
+        monkeypatch.setattr(service.config, "AI_SEARCH_NEGATIVE_TTL_SECONDS", 0)
+        
+        service.find_relevant_questions(self.request("volcanoes"))
+        service.find_relevant_questions(self.request("volcanoes"))
+        
+        assert len(calls) == 2
+
+
+class TestBatchSmartSearch:
+    """Test cases for answering several smart search queries in one pass."""
+    
+    QUESTIONS = [
+        {"id": 1, "text": "Explain photosynthesis in green plants"},
+        {"id": 2, "text": "What is the capital of France?"},
+        {"id": 3, "text": "Describe the water cycle"},
+    ]
+    
+    @pytest.fixture
+    def search(self, monkeypatch):
+        """Smart search service with a stubbed provider answering every query with questions 1 and 99."""
+        service = AISmartSearchService()
+        calls = []
+        
+        def provider(messages, json_response=False, **kwargs):
+            calls.append(messages[-1]["content"])
+            queries = [line for line in messages[-1]["content"].splitlines() if line.startswith("q")]
+            return {"results": {line.split("|")[0]: [1, 99] for line in queries}}
+        
+        monkeypatch.setattr(service, "_make_openai_request", provider)
+        return service, calls
+    
+    def test_index_scores_many_queries_like_single_queries(self):
+        """Test that the vectorized pass ranks each query as a single search would."""
+        index = QuestionSearchIndex([QuestionItem(**question) for question in self.QUESTIONS])
+        queries = ["photosynthesis plants", "capital of France", "volcanoes"]
+        
+        assert index.search_many(queries, limit=2) == [index.search(query, limit=2) for query in queries]
+        assert index.search_many(queries, limit=2)[2] == []
+    
+    def test_local_provider_uses_index(self, search):
+        """Test that the local provider answers without calling the AI provider."""
+        service, calls = search
+        request = BatchSmartSearchRequest(
+            queries=["green plants", "France"], available_questions=self.QUESTIONS, provider="local"
+        )
+        
+        assert service.find_relevant_questions_batch(request) == [[1], [2]]
+        assert calls == []
+    
+    def test_queries_share_one_prompt(self, search):
+        """Test that all uncached queries go in one prompt and unknown IDs are dropped."""
+        service, calls = search
+        request = BatchSmartSearchRequest(
+            queries=["plants", "Plants?", "energy", "cells"], available_questions=self.QUESTIONS
+        )
+        
+        assert service.find_relevant_questions_batch(request) == [[1]] * 4
+        assert len(calls) == 1
+        # Equivalent queries take a single prompt line
+        assert "q3|cells" in calls[0] and "q4|" not in calls[0]
+    
+    def test_cached_queries_are_not_resent(self, search):
+        """Test that queries answered before are served from the result cache."""
+        service, calls = search
+        service.find_relevant_questions(SmartSearchRequest(query="plants", available_questions=self.QUESTIONS))
+        
+        service.find_relevant_questions_batch(
+            BatchSmartSearchRequest(queries=["plants", "energy"], available_questions=self.QUESTIONS)
+        )
+        service.find_relevant_questions_batch(
+            BatchSmartSearchRequest(queries=["energy", "plants"], available_questions=self.QUESTIONS)
+        )
+        
+        assert len(calls) == 2
+        assert "q1|energy" in calls[1] and "plants" not in calls[1].split("Available questions")[0]
+    
+    def test_empty_query_is_rejected(self, search):
+        """Test that a blank query fails the batch."""
+        service, _ = search
+        
+        with pytest.raises(ValueError):
+            service.find_relevant_questions_batch(
+                BatchSmartSearchRequest(queries=["plants", " "], available_questions=self.QUESTIONS)
+            )
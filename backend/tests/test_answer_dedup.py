@@ -0,0 +1,87 @@
+"""
+Unit tests for near-duplicate answer collapsing.
+"""
+
+import pytest
+
+try:
+    from app.services.answer_dedup import AnswerDeduplicator, normalize_answer
+    from app.services.prompt_builder import PromptBuilder
+    from app.models.ai_models import StudentAnswer, SummarizationRequest
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.services.answer_dedup import AnswerDeduplicator, normalize_answer
+    from app.services.prompt_builder import PromptBuilder
+    from app.models.ai_models import StudentAnswer, SummarizationRequest
+
+
+def make_answers(texts):
+    """Build student answers from a list of answer texts."""
+    return [
+        StudentAnswer(
+            student_id=f"STU{i:04d}",
+            student_name=f"Student {i}",
+            answer_text=text,
+            submitted_at="2024-01-01T10:00:00"
+        )
+        for i, text in enumerate(texts)
+    ]
+
+
+class TestAnswerDeduplicator:
+    """Test cases for AnswerDeduplicator."""
+
+    def test_normalize_answer(self):
+        """Test that case, punctuation and spacing are ignored."""
+        assert normalize_answer("  Photosynthesis!!  ") == normalize_answer("photosynthesis.")
+        assert normalize_answer("Ｐａｒｉｓ") == "paris"
+
+    def test_groups_exact_and_near_duplicates(self):
+        """Test that reworded copies collapse while distinct answers stay apart."""
+        answers = make_answers([
+            "Plants turn sunlight into sugar",
+            "plants turn sunlight into sugar.",
+            "Plants turn sunlight into sugars",
+            "Mitochondria are the powerhouse of the cell",
+        ])
+
+        groups = AnswerDeduplicator().group(answers)
+
+        assert [group.count for group in groups] == [3, 1]
+        assert groups[0].student_names == ["Student 0", "Student 1", "Student 2"]
+        assert groups[0].representative == "Plants turn sunlight into sugar"
+
+    def test_different_numbers_are_not_merged(self):
+        """Test that answers citing different numbers stay separate."""
+        groups = AnswerDeduplicator().group(make_answers(["The answer is 42", "The answer is 24"]))
+
+        assert len(groups) == 2
+
+    def test_grouping_is_deterministic(self):
+        """Test that the same answers always produce the same groups."""
+        answers = make_answers([f"Energy comes from the sun {i % 5}" for i in range(50)])
+
+        first = [(g.representative, g.count) for g in AnswerDeduplicator().group(answers)]
+        second = [(g.representative, g.count) for g in AnswerDeduplicator().group(answers)]
+
+        assert first == second
+        assert sum(count for _, count in first) == 50
+
+    def test_prompt_sends_one_row_per_group(self):
+        """Test that the prompt collapses duplicates and reports the compression ratio."""
+        builder = PromptBuilder(token_budget=2000, max_answer_tokens=50, deduplicator=AnswerDeduplicator())
+        request = SummarizationRequest(
+            context={"question_id": 1, "question_text": "Capital of France?", "summary_instructions": "Summarize"},
+            student_answers=make_answers(["Paris"] * 5 + ["paris!", "Lyon"])
+        )
+
+        messages, usage = builder.build_summary_messages("system", request)
+
+        user_prompt = messages[1]["content"]
+        assert "6 students (Student 0, Student 1, Student 2 +3 more)|Paris" in user_prompt
+        assert "Student 6|Lyon" in user_prompt
+        assert usage.items_total == 7
+        assert usage.rows_total == 2
+        assert usage.compression_ratio == 3.5
@@ -0,0 +1,255 @@
+"""
+Tests for the real-time answer feed.
+"""
+
+import asyncio
+import json
+import threading
+import time
+import pytest
+
+try:
+    from app.api.dependencies import container
+    from app.utils.broker import EventBroker, OVERFLOW_EVENT, RESET_EVENT
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.api.dependencies import container
+    from app.utils.broker import EventBroker, OVERFLOW_EVENT, RESET_EVENT
+
+
+def drain(subscription):
+    """Read every message queued on a subscription without waiting for more."""
+    async def read():
+        messages = []
+        while True:
+            try:
+                message = await subscription.get(timeout=0.05)
+            except asyncio.TimeoutError:
+                return messages
+            if message is None:
+                return messages
+            messages.append(message)
+    return read()
+
+
+class TestEventBroker:
+    """Test cases for the EventBroker."""
+
+    def test_delivers_in_order_across_threads(self):
+        """Test that messages published from another thread arrive in publish order."""
+        async def run():
+            broker = EventBroker()
+            subscription = broker.subscribe("t")
+            thread = threading.Thread(target=lambda: [broker.publish("t", "e", i) for i in range(5)])
+            thread.start()
+            thread.join()
+            return [message.data for message in await drain(subscription)]
+
+        assert asyncio.run(run()) == [0, 1, 2, 3, 4]
+
+    def test_topics_are_isolated(self):
+        """Test that subscribers only see their own topic."""
+        async def run():
+            broker = EventBroker()
+            subscription = broker.subscribe("a")
+            broker.publish("b", "e", "other")
+            broker.publish("a", "e", "mine")
+            return [message.data for message in await drain(subscription)]
+
+        assert asyncio.run(run()) == ["mine"]
+
+    def test_resume_replays_missed_messages(self):
+        """Test that a cursor replays only later messages of the topic."""
+        async def run():
+            broker = EventBroker()
+            first = broker.subscribe("t")
+            broker.publish("t", "e", 1)
+            seen = await drain(first)
+            first.close()
+            broker.publish("t", "e", 2)
+            broker.publish("t", "e", 3)
+            resumed = broker.subscribe("t", cursor=seen[-1].seq)
+            return [message.data for message in await drain(resumed)]
+
+        assert asyncio.run(run()) == [2, 3]
+
+    def test_expired_cursor_gets_reset(self):
+        """Test that a cursor older than the history, or from a restart, asks for a refetch."""
+        async def run():
+            broker = EventBroker(history_size=2)
+            broker.subscribe("t").close()
+            for i in range(4):
+                broker.publish("t", "e", i)
+            expired = await drain(broker.subscribe("t", cursor=1))
+            future = await drain(broker.subscribe("t", cursor=999))
+            return expired, future
+
+        expired, future = asyncio.run(run())
+        assert [message.event for message in expired] == [RESET_EVENT]
+        assert [message.event for message in future] == [RESET_EVENT]
+
+    def test_slow_consumer_is_dropped(self):
+        """Test that a full queue ends the subscription with an overflow message to resume from."""
+        async def run():
+            broker = EventBroker(max_queue=3)
+            slow = broker.subscribe("t")
+            fast = broker.subscribe("t")
+            seqs = []
+            for i in range(5):
+                seqs.append(broker.publish("t", "e", i))
+                await fast.get(timeout=1)
+            await asyncio.sleep(0)
+            return seqs, await drain(slow), broker
+
+        seqs, messages, broker = asyncio.run(run())
+        assert [message.data for message in messages[:-1]] == [0, 1, 2]
+        assert messages[-1].event == OVERFLOW_EVENT
+        assert messages[-1].seq == seqs[2]
+        assert broker.subscriber_count("t") == 1
+        assert broker.stats()["dropped"] == 1
+
+    def test_idle_topics_are_forgotten(self):
+        """Test that topic history is bounded by max_topics."""
+        broker = EventBroker(max_topics=2)
+        for topic in ("a", "b", "c"):
+            broker.publish(topic, "e", None)
+
+        assert not broker.has_topic("a")
+        assert broker.has_topic("b") and broker.has_topic("c")
+
+
+def create_question(client, code):
+    """Create an open question through the API and return its ID."""
+    return client.post("/api/v1/questions/open", json={
+        "title": f"Question {code}", "text": "What is photosynthesis?", "access_code": code
+    }).json()["id"]
+
+
+def submit_answer(client, code, student_id="STU1001", text="Light to energy"):
+    """Submit an answer through the API."""
+    return client.post("/api/v1/answers/submit", json={"access_code": code, "student_id": student_id, "answer_text": text})
+
+
+def parse_events(text):
+    """Parse an SSE body into (id, event, data) tuples, skipping comments."""
+    parsed = []
+    for block in text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if fields:
+            parsed.append((fields.get("id"), fields.get("event"), json.loads(fields["data"])))
+    return parsed
+
+
+class TestAnswerStreamEndpoint:
+    """Test cases for GET /api/v1/questions/{id}/answers/stream."""
+
+    @pytest.fixture
+    def subscriptions(self, monkeypatch):
+        """Record the subscriptions opened by the endpoint."""
+        opened = []
+        subscribe = container.answer_feed.subscribe
+        monkeypatch.setattr(container.answer_feed, "subscribe", lambda *args: opened.append(subscribe(*args)) or opened[-1])
+        return opened
+
+    @staticmethod
+    def stream(client, path, writer, headers=None):
+        """Read a stream to its end while writer runs in another thread once the stream is subscribed."""
+        errors = []
+
+        def run():
+            try:
+                writer()
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        response = client.get(path, headers=headers or {})
+        thread.join()
+        assert not errors, errors
+        return response, parse_events(response.text)
+
+    @staticmethod
+    def wait_for(condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            assert time.monotonic() < deadline, "timed out"
+            time.sleep(0.01)
+
+    def test_pushes_answers_with_live_counts(self, client, subscriptions):
+        """Test that inserts and updates are pushed with counts, and deletion ends the stream."""
+        question_id = create_question(client, "FD1")
+
+        def writer():
+            self.wait_for(lambda: subscriptions)
+            submit_answer(client, "FD1", "STU1001")
+            submit_answer(client, "FD1", "STU1002")
+            submit_answer(client, "FD1", "STU1001", text="Updated")
+            client.delete(f"/api/v1/questions/{question_id}")
+
+        response, events = self.stream(client, f"/api/v1/questions/{question_id}/answers/stream", writer)
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert [event for _, event, _ in events] == [
+            "ready", "answer.created", "answer.created", "answer.updated", "question.deleted"
+        ]
+        assert events[0][2] == {"question_id": question_id, "is_closed": False, "answer_count": 0}
+        assert [data["answer_count"] for _, _, data in events[1:4]] == [1, 2, 2]
+        assert events[3][2]["answer"]["text"] == "Updated"
+        assert events[3][2]["answer"]["student_name"]
+        ids = [int(event_id) for event_id, _, _ in events]
+        assert ids == sorted(ids)
+
+    def test_close_is_pushed(self, client, subscriptions):
+        """Test that closing the question is announced."""
+        question_id = create_question(client, "FD2")
+
+        def writer():
+            self.wait_for(lambda: subscriptions)
+            client.patch(f"/api/v1/questions/{question_id}/close")
+            subscriptions[0].close()
+
+        _, events = self.stream(client, f"/api/v1/questions/{question_id}/answers/stream", writer)
+
+        assert [event for _, event, _ in events] == ["ready", "question.closed"]
+
+    def test_reconnect_resumes_from_last_event_id(self, client, subscriptions):
+        """Test that answers submitted while disconnected are replayed on reconnect."""
+        create_question(client, "FD3")
+        question_id = client.get("/api/v1/questions/").json()[0]["id"]
+        path = f"/api/v1/questions/{question_id}/answers/stream"
+
+        def first_writer():
+            self.wait_for(lambda: subscriptions)
+            submit_answer(client, "FD3", "STU1001")
+            subscriptions[0].close()
+
+        _, first = self.stream(client, path, first_writer)
+        submit_answer(client, "FD3", "STU1002")
+
+        def second_writer():
+            self.wait_for(lambda: len(subscriptions) == 2)
+            subscriptions[1].close()
+
+        _, second = self.stream(client, path, second_writer, headers={"Last-Event-ID": first[-1][0]})
+
+        assert [event for _, event, _ in second] == ["ready", "answer.created"]
+        assert second[1][2]["answer"]["student_id"] == "STU1002"
+        assert second[0][2]["answer_count"] == 2
+
+    def test_unwatched_questions_publish_nothing(self, client):
+        """Test that answers to questions no one watches skip the feed."""
+        create_question(client, "FD4")
+        published = container.answer_feed.broker.published
+
+        submit_answer(client, "FD4")
+
+        assert container.answer_feed.broker.published == published
+
+    def test_missing_question_is_not_found(self, client):
+        """Test that watching an unknown question fails with 404."""
+        response = client.get("/api/v1/questions/999/answers/stream")
+
+        assert response.status_code == 404
@@ -7,13 +7,13 @@ from unittest.mock import Mock
 from fastapi import HTTPException
 
 try:
-    from app.services.answer_service import AnswerService
+    from app.services.answer_service import AnswerService, ANSWER_LIST_COLUMNS
     from app.database.repositories.answer_repository import AnswerRepository
 except ImportError:
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from app.services.answer_service import AnswerService
+    from app.services.answer_service import AnswerService, ANSWER_LIST_COLUMNS
     from app.database.repositories.answer_repository import AnswerRepository
 
 
@@ -50,7 +50,7 @@ class TestAnswerService:
         mock_answer.timestamp = None
         
         self.mock_question_service.get_question_by_code.return_value = mock_question
-        self.mock_answer_repo.upsert.return_value = mock_answer
+        self.mock_answer_repo.upsert_with_status.return_value = (mock_answer, True)
         self.mock_student_service.get_student_by_id.return_value = {"name": "John Doe"}
         
         # Act
@@ -65,7 +65,7 @@ class TestAnswerService:
         assert result is not None
         assert result["student_id"] == "student001"
         assert result["text"] == "Test answer"
-        self.mock_answer_repo.upsert.assert_called_once()
+        self.mock_answer_repo.upsert_with_status.assert_called_once()
     
     def test_submit_answer_question_not_found(self, sample_answer_data):
         """Test answer submission when question doesn't exist."""
@@ -152,7 +152,7 @@ class TestAnswerService:
         
         self.mock_question_service.get_question_by_id.return_value = mock_question
         self.mock_answer_repo.get_by_question_id.return_value = [mock_answer]
-        self.mock_student_service.get_student_by_id.return_value = {"name": "John Doe"}
+        self.mock_student_service.get_all_students.return_value = [{"id": "student001", "name": "John Doe"}]
         
         # Act
         result = self.answer_service.get_answers_for_question(self.mock_db, 1)
@@ -161,7 +161,9 @@ class TestAnswerService:
         assert len(result) == 1
         assert result[0]["question_id"] == 1
         assert result[0]["student_id"] == "student001"
-        self.mock_answer_repo.get_by_question_id.assert_called_once_with(self.mock_db, 1)
+        assert result[0]["student_name"] == "John Doe"
+        self.mock_answer_repo.get_by_question_id.assert_called_once_with(self.mock_db, 1, columns=ANSWER_LIST_COLUMNS)
+        self.mock_student_service.get_all_students.assert_called_once_with()
     
     def test_get_answers_for_question_not_found(self):
         """Test getting answers for non-existent question."""
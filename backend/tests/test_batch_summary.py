@@ -0,0 +1,204 @@
+"""
+Tests for batch summarization across many questions.
+"""
+
+import asyncio
+import json
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+from fastapi import HTTPException
+
+try:
+    from app.api.endpoints.ai import get_batch_summary_service
+    from app.main import app
+    from app.services.ai_service import AISummarizationService
+    from app.services.batch_summary_service import BatchSummaryService
+    from app.services.question_summary_service import QuestionSummaryService
+    from app.database.repositories.question_repository import QuestionRepository
+    from app.database.repositories.answer_repository import AnswerRepository
+    from app.config.ai_config import AIConfig
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.api.endpoints.ai import get_batch_summary_service
+    from app.main import app
+    from app.services.ai_service import AISummarizationService
+    from app.services.batch_summary_service import BatchSummaryService
+    from app.services.question_summary_service import QuestionSummaryService
+    from app.database.repositories.question_repository import QuestionRepository
+    from app.database.repositories.answer_repository import AnswerRepository
+    from app.config.ai_config import AIConfig
+
+
+def create_question(db_session, code, is_closed=1, answers=1):
+    """Create a question with the given number of answers."""
+    question = QuestionRepository().create(db_session, {
+        "title": f"Question {code}", "text": f"What about {code}?", "access_code": code, "is_closed": is_closed
+    })
+    for i in range(answers):
+        AnswerRepository().upsert(db_session, {"question_id": question.id, "student_id": f"STU{i}", "text": f"Answer {i}"})
+    return question.id
+
+
+def collect(service, question_ids, max_concurrency=None):
+    """Run a batch to completion and return its results."""
+    async def run():
+        return [result async for result in service.summarize_many(question_ids, "Summarize", max_concurrency)]
+    return asyncio.run(run())
+
+
+class TestBatchSummaryService:
+    """Test cases for BatchSummaryService."""
+
+    def test_resolves_questions_by_status(self, db_session, session_factory):
+        """Test that the status filter selects the questions to summarize."""
+        closed = create_question(db_session, "B1", is_closed=1)
+        open_ = create_question(db_session, "B2", is_closed=0)
+        service = BatchSummaryService(Mock(), session_factory=session_factory)
+
+        assert service.resolve_question_ids(db_session, status_filter="closed") == [closed]
+        assert service.resolve_question_ids(db_session, status_filter="open") == [open_]
+        assert service.resolve_question_ids(db_session, status_filter="all") == [closed, open_]
+
+    def test_explicit_ids_are_deduplicated(self, db_session, session_factory):
+        """Test that repeated IDs are summarized once, in request order."""
+        service = BatchSummaryService(Mock(), session_factory=session_factory)
+
+        assert service.resolve_question_ids(db_session, [3, 1, 3, 2]) == [3, 1, 2]
+
+    def test_invalid_filter_and_oversized_batch_are_rejected(self, db_session, session_factory):
+        """Test that bad batches fail before any work starts."""
+        service = BatchSummaryService(Mock(), session_factory=session_factory, max_questions=2)
+
+        with pytest.raises(HTTPException) as exc_info:
+            service.resolve_question_ids(db_session, status_filter="archived")
+        assert exc_info.value.status_code == 400
+        with pytest.raises(HTTPException) as exc_info:
+            service.resolve_question_ids(db_session, [1, 2, 3])
+        assert exc_info.value.status_code == 400
+
+    def test_concurrency_is_bounded(self):
+        """Test that no more than max_concurrency questions run at once."""
+        lock = threading.Lock()
+        running = {"now": 0, "peak": 0}
+
+        def summarize_question(db, question_id, instructions, incremental):
+            with lock:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+            time.sleep(0.02)
+            with lock:
+                running["now"] -= 1
+            return {"question_id": question_id, "summary": "ok", "answer_count": 1}
+
+        summary_service = Mock()
+        summary_service.summarize_question.side_effect = summarize_question
+        service = BatchSummaryService(summary_service, session_factory=Mock(), max_concurrency=3)
+
+        results = collect(service, list(range(1, 11)), max_concurrency=10)
+
+        assert sorted(result["question_id"] for result in results) == list(range(1, 11))
+        assert running["peak"] <= 3
+
+    def test_results_arrive_in_completion_order(self):
+        """Test that a fast question is not held back by a slow one."""
+        def summarize_question(db, question_id, instructions, incremental):
+            time.sleep(0.2 if question_id == 1 else 0)
+            return {"question_id": question_id, "summary": "ok", "answer_count": 1}
+
+        summary_service = Mock()
+        summary_service.summarize_question.side_effect = summarize_question
+        service = BatchSummaryService(summary_service, session_factory=Mock(), max_concurrency=2)
+
+        results = collect(service, [1, 2])
+
+        assert [result["question_id"] for result in results] == [2, 1]
+
+    def test_failures_are_reported_per_question(self):
+        """Test that one failing question does not stop the batch."""
+        def summarize_question(db, question_id, instructions, incremental):
+            if question_id == 2:
+                raise HTTPException(status_code=404, detail="Question not found")
+            return {"question_id": question_id, "summary": "ok", "answer_count": 1}
+
+        summary_service = Mock()
+        summary_service.summarize_question.side_effect = summarize_question
+        service = BatchSummaryService(summary_service, session_factory=Mock())
+
+        results = {result["question_id"]: result for result in collect(service, [1, 2])}
+
+        assert results[1]["status"] == "completed"
+        assert results[2] == {"question_id": 2, "status": "failed", "status_code": 404, "error": "Question not found"}
+
+
+class TestBatchSummaryEndpoint:
+    """Test cases for POST /api/v1/ai/summarize/batch."""
+
+    @pytest.fixture
+    def prompts(self, client, session_factory, monkeypatch):
+        """Batch service on the test database with a stubbed AI provider."""
+        summarizer = AISummarizationService()
+        summarizer.config = AIConfig()
+        summarizer.config.OPENAI_API_KEY = "test-key"
+        prompts = []
+        monkeypatch.setattr(
+            summarizer, "_make_openai_request",
+            lambda messages, json_response=False, **kwargs: prompts.append(messages) or f"summary v{len(prompts)}"
+        )
+        # One worker: the in-memory test database shares a single connection
+        service = BatchSummaryService(QuestionSummaryService(summarizer), session_factory=session_factory, max_concurrency=1)
+        app.dependency_overrides[get_batch_summary_service] = lambda: service
+        yield prompts
+        app.dependency_overrides.pop(get_batch_summary_service, None)
+
+    @staticmethod
+    def read_lines(response):
+        return [json.loads(line) for line in response.text.splitlines() if line]
+
+    def test_streams_ndjson_results(self, client, db_session, prompts):
+        """Test that each closed question gets a result line, then a totals line."""
+        first = create_question(db_session, "E1")
+        second = create_question(db_session, "E2")
+        create_question(db_session, "E3", is_closed=0)
+
+        response = client.post("/api/v1/ai/summarize/batch", json={})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = self.read_lines(response)
+        assert {line["question_id"] for line in lines[:-1]} == {first, second}
+        assert all(line["status"] == "completed" and line["answer_count"] == 1 for line in lines[:-1])
+        assert lines[-1] == {"status": "done", "total": 2, "completed": 2, "failed": 0}
+
+    def test_persisted_summaries_are_reused(self, client, db_session, prompts):
+        """Test that a repeated batch is served from the stored summaries."""
+        create_question(db_session, "R1")
+        create_question(db_session, "R2")
+
+        client.post("/api/v1/ai/summarize/batch", json={})
+        response = client.post("/api/v1/ai/summarize/batch", json={})
+
+        assert len(prompts) == 2
+        assert self.read_lines(response)[-1]["completed"] == 2
+
+    def test_unknown_and_unanswered_questions_fail_individually(self, client, db_session, prompts):
+        """Test that explicit IDs report their own errors."""
+        answered = create_question(db_session, "U1")
+        unanswered = create_question(db_session, "U2", answers=0)
+
+        response = client.post("/api/v1/ai/summarize/batch", json={"question_ids": [answered, unanswered, 999]})
+
+        lines = {line.get("question_id"): line for line in self.read_lines(response)}
+        assert lines[answered]["status"] == "completed"
+        assert lines[unanswered]["status_code"] == 400
+        assert lines[999]["status_code"] == 404
+        assert lines[None] == {"status": "done", "total": 3, "completed": 1, "failed": 2}
+
+    def test_invalid_status_is_rejected(self, client, prompts):
+        """Test that an unknown status filter fails the whole request."""
+        response = client.post("/api/v1/ai/summarize/batch", json={"status": "archived"})
+
+        assert response.status_code == 400
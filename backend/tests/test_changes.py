@@ -0,0 +1,175 @@
+"""
+Tests for the change log and the change feed endpoint.
+"""
+
+from datetime import timedelta
+import pytest
+from fastapi import HTTPException
+
+try:
+    from app.database.models.change import Change
+    from app.database.models.question import Question
+    from app.database.repositories.change_repository import ChangeRepository
+    from app.services.change_service import ChangeService
+    from app.utils.timezone import now_israel
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.database.models.change import Change
+    from app.database.models.question import Question
+    from app.database.repositories.change_repository import ChangeRepository
+    from app.services.change_service import ChangeService
+    from app.utils.timezone import now_israel
+
+
+def create_question(client, code):
+    """Create an open question through the API and return its ID."""
+    return client.post("/api/v1/questions/open", json={
+        "title": f"Question {code}", "text": "What is photosynthesis?", "access_code": code
+    }).json()["id"]
+
+
+def submit_answer(client, code, student_id="STU1001", text="Light to energy"):
+    """Submit an answer through the API."""
+    return client.post("/api/v1/answers/submit", json={"access_code": code, "student_id": student_id, "answer_text": text})
+
+
+def add_questions(db_session, count):
+    """Add questions directly, one change each."""
+    for i in range(count):
+        db_session.add(Question(title=f"Q{i}", text="Text", access_code=f"BULK{i}"))
+        db_session.commit()
+
+
+class TestChangeLog:
+    """Test cases for recording changes with the mutations."""
+
+    def test_mutations_are_logged_in_order(self, client):
+        """Test that each question and answer write appends one change with the new state."""
+        question_id = create_question(client, "CH1")
+        submit_answer(client, "CH1")
+        submit_answer(client, "CH1", text="Updated")
+        client.patch(f"/api/v1/questions/{question_id}/close")
+        client.delete(f"/api/v1/questions/{question_id}")
+
+        changes = client.get("/api/v1/changes/").json()["changes"]
+
+        assert [(c["entity"], c["op"]) for c in changes] == [
+            ("question", "created"), ("answer", "created"), ("answer", "updated"),
+            ("question", "updated"), ("question", "deleted")
+        ]
+        assert [c["seq"] for c in changes] == sorted(c["seq"] for c in changes)
+        assert all(c["question_id"] == question_id for c in changes)
+        assert changes[0]["data"]["access_code"] == "CH1"
+        assert changes[2]["data"]["text"] == "Updated"
+        assert changes[3]["data"]["is_closed"] is True
+        assert changes[4]["data"] is None
+
+    def test_rolled_back_writes_leave_no_change(self, db_session):
+        """Test that a change is part of its mutation's transaction."""
+        db_session.add(Question(title="Q", text="Text", access_code="RB1"))
+        db_session.flush()
+        db_session.rollback()
+
+        assert db_session.query(Change).count() == 0
+
+    def test_unchanged_updates_are_not_logged(self, db_session):
+        """Test that touching an entity without changing a value appends nothing."""
+        add_questions(db_session, 1)
+        question = db_session.query(Question).first()
+
+        question.title = question.title
+        db_session.commit()
+
+        assert db_session.query(Change).count() == 1
+
+
+class TestChangeFeedEndpoint:
+    """Test cases for GET /api/v1/changes."""
+
+    def test_pages_through_the_log(self, client, db_session):
+        """Test that next_since and has_more walk the log in pages."""
+        add_questions(db_session, 5)
+
+        first = client.get("/api/v1/changes/", params={"limit": 3}).json()
+        second = client.get("/api/v1/changes/", params={"since": first["next_since"], "limit": 3}).json()
+
+        assert len(first["changes"]) == 3 and first["has_more"] is True
+        assert len(second["changes"]) == 2 and second["has_more"] is False
+        assert second["next_since"] == second["latest_seq"] == 5
+        caught_up = client.get("/api/v1/changes/", params={"since": 5}).json()
+        assert caught_up["changes"] == [] and caught_up["next_since"] == 5
+
+    def test_compacted_cursor_is_gone(self, client, db_session):
+        """Test that a cursor older than the log answers 410 with the latest sequence number."""
+        add_questions(db_session, 5)
+        ChangeService(retention=2, max_age_hours=0).compact(db_session)
+
+        response = client.get("/api/v1/changes/", params={"since": 1})
+
+        assert response.status_code == 410
+        assert response.headers["x-latest-seq"] == "5"
+        assert [c["seq"] for c in client.get("/api/v1/changes/", params={"since": 3}).json()["changes"]] == [4, 5]
+
+    def test_cursor_ahead_of_the_log_is_gone(self, client, db_session):
+        """Test that a cursor from a reset database asks for a resync."""
+        add_questions(db_session, 1)
+
+        assert client.get("/api/v1/changes/", params={"since": 7}).status_code == 410
+        assert client.get("/api/v1/changes/", params={"since": -1}).status_code == 422
+
+
+class TestChangeCompaction:
+    """Test cases for ChangeService.compact."""
+
+    def test_keeps_the_retention_count(self, db_session):
+        """Test count-based compaction."""
+        add_questions(db_session, 5)
+
+        deleted = ChangeService(retention=2, max_age_hours=0).compact(db_session)
+
+        assert deleted == 3
+        assert ChangeRepository().get_bounds(db_session) == (4, 5)
+
+    def test_drops_old_changes_but_keeps_the_newest(self, db_session):
+        """Test age-based compaction never empties the log."""
+        add_questions(db_session, 3)
+        db_session.query(Change).update({"created_at": now_israel() - timedelta(days=3)})
+        db_session.commit()
+
+        deleted = ChangeService(retention=100, max_age_hours=24).compact(db_session)
+
+        assert deleted == 2
+        assert ChangeRepository().get_bounds(db_session) == (3, 3)
+
+    def test_sequence_numbers_are_not_reused(self, db_session):
+        """Test that compaction does not let new changes repeat old sequence numbers."""
+        add_questions(db_session, 2)
+        ChangeRepository().delete_through(db_session, 2)
+
+        db_session.add(Question(title="Q", text="Text", access_code="AFTER"))
+        db_session.commit()
+
+        assert ChangeRepository().get_bounds(db_session) == (3, 3)
+
+    def test_writes_trigger_compaction_periodically(self, db_session):
+        """Test that on_write compacts every compact_interval writes."""
+        service = ChangeService(retention=1, max_age_hours=0, compact_interval=3)
+        add_questions(db_session, 3)
+
+        service.on_write(db_session)
+        service.on_write(db_session)
+        assert db_session.query(Change).count() == 3
+        service.on_write(db_session)
+        assert db_session.query(Change).count() == 1
+
+    def test_service_rejects_expired_cursor(self, db_session):
+        """Test the service-level 410."""
+        add_questions(db_session, 3)
+        service = ChangeService(retention=1, max_age_hours=0)
+        service.compact(db_session)
+
+        with pytest.raises(HTTPException) as exc_info:
+            service.get_changes(db_session, 0, 10)
+        assert exc_info.value.status_code == 410
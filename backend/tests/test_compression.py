@@ -0,0 +1,165 @@
+"""
+Tests for response compression.
+"""
+
+import gzip
+import json
+import zlib
+import brotli
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+try:
+    from app.main import app
+    from app.api.endpoints.students import get_student_service
+    from app.services.student_service import StudentService
+    from app.utils.compression import CompressionMiddleware, StreamCompressor, choose_encoding, compress
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.main import app
+    from app.api.endpoints.students import get_student_service
+    from app.services.student_service import StudentService
+    from app.utils.compression import CompressionMiddleware, StreamCompressor, choose_encoding, compress
+
+DECODERS = {"gzip": gzip.decompress, "br": brotli.decompress}
+
+
+def raw_get(client, path, accept_encoding):
+    """GET a path and return the undecoded response and its raw body."""
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+class TestEncodingNegotiation:
+    """Test cases for Accept-Encoding negotiation and one-shot compression."""
+
+    def test_prefers_brotli_then_gzip(self):
+        """Test the server preference and client q-values."""
+        assert choose_encoding("gzip, deflate, br") == "br"
+        assert choose_encoding("gzip, br;q=0") == "gzip"
+        assert choose_encoding("br", available=("gzip",)) is None
+        assert choose_encoding("*") == "br"
+        assert choose_encoding(None) is None
+        assert choose_encoding("identity") is None
+
+    @pytest.mark.parametrize("encoding", ["gzip", "br"])
+    def test_round_trip(self, encoding):
+        """Test that compressed bodies decode to the original."""
+        body = b'{"text": "photosynthesis"}' * 100
+
+        assert DECODERS[encoding](compress(body, encoding)) == body
+        assert DECODERS[encoding](compress(body, encoding, level=1)) == body
+
+    def test_unknown_encoding_is_rejected(self):
+        """Test that unsupported encodings raise ValueError."""
+        with pytest.raises(ValueError):
+            compress(b"data", "lzma")
+        with pytest.raises(ValueError):
+            StreamCompressor("lzma")
+
+
+class TestStreamCompressor:
+    """Test cases for incremental compression."""
+
+    def test_gzip_chunks_decode_as_they_arrive(self):
+        """Test that every flushed gzip chunk is decodable before the stream ends."""
+        compressor = StreamCompressor("gzip")
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+        assert decoder.decompress(compressor.compress(b'{"line": 1}\n')) == b'{"line": 1}\n'
+        assert decoder.decompress(compressor.compress(b'{"line": 2}\n')) == b'{"line": 2}\n'
+        assert decoder.decompress(compressor.finish()) == b""
+        assert decoder.eof
+
+    def test_brotli_chunks_decode_as_they_arrive(self):
+        """Test that every flushed brotli chunk is decodable before the stream ends."""
+        compressor = StreamCompressor("br")
+        decoder = brotli.Decompressor()
+
+        assert decoder.process(compressor.compress(b"data: one\n\n")) == b"data: one\n\n"
+        assert decoder.process(compressor.compress(b"data: two\n\n")) == b"data: two\n\n"
+        decoder.process(compressor.finish())
+        assert decoder.is_finished()
+
+
+class TestCompressionMiddleware:
+    """Test cases for CompressionMiddleware."""
+
+    @pytest.fixture
+    def stream_client(self):
+        """Client for a small app with whole, streamed and binary responses."""
+        stream_app = FastAPI()
+
+        @stream_app.get("/text")
+        async def text(size: int = 2000):
+            return PlainTextResponse("a" * size)
+
+        @stream_app.get("/ndjson")
+        async def ndjson():
+            async def lines():
+                for i in range(3):
+                    yield json.dumps({"line": i}) + "\n"
+            return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+        @stream_app.get("/image")
+        async def image():
+            return PlainTextResponse("a" * 2000, media_type="image/png")
+
+        stream_app.add_middleware(CompressionMiddleware, minimum_size=1024, levels={"gzip": 1})
+        return TestClient(stream_app)
+
+    @pytest.mark.parametrize("encoding", ["gzip", "br"])
+    def test_whole_body_is_compressed(self, stream_client, encoding):
+        """Test that a large body is compressed with a matching Content-Length."""
+        response, raw = raw_get(stream_client, "/text", encoding)
+
+        assert response.headers["content-encoding"] == encoding
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) == len(raw) < 2000
+        assert DECODERS[encoding](raw) == b"a" * 2000
+
+    def test_small_body_is_sent_as_is(self, stream_client):
+        """Test that bodies below the threshold are not compressed."""
+        response, raw = raw_get(stream_client, "/text?size=100", "gzip")
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert raw == b"a" * 100
+
+    def test_streamed_body_is_compressed_incrementally(self, stream_client):
+        """Test that NDJSON is compressed without a Content-Length and decodes line by line."""
+        response, raw = raw_get(stream_client, "/ndjson", "gzip")
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        lines = gzip.decompress(raw).decode().splitlines()
+        assert [json.loads(line)["line"] for line in lines] == [0, 1, 2]
+
+    def test_identity_and_binary_responses_pass_through(self, stream_client):
+        """Test that clients without compression and dense content types are left alone."""
+        response, raw = raw_get(stream_client, "/text", "identity")
+        assert "content-encoding" not in response.headers and len(raw) == 2000
+
+        response, raw = raw_get(stream_client, "/image", "gzip")
+        assert "content-encoding" not in response.headers and len(raw) == 2000
+
+
+class TestApiCompression:
+    """Test cases for compression of the API responses."""
+
+    def test_roster_is_compressed(self, client, tmp_path):
+        """Test that a large student roster goes over the wire compressed."""
+        path = tmp_path / "students.json"
+        path.write_text(json.dumps([{"id": f"STU{i}", "name": f"Student {i}"} for i in range(200)]), encoding="utf-8")
+        app.dependency_overrides[get_student_service] = lambda: StudentService(str(path))
+        try:
+            response, raw = raw_get(client, "/api/v1/students/", "br")
+        finally:
+            app.dependency_overrides.pop(get_student_service, None)
+
+        assert response.headers["content-encoding"] == "br"
+        assert len(json.loads(brotli.decompress(raw))) == 200
@@ -0,0 +1,178 @@
+"""
+Tests for the application-scoped service container and the student roster cache.
+"""
+
+import json
+import os
+import pytest
+
+try:
+    from app.main import app
+    from app.api import dependencies
+    from app.api.dependencies import ServiceContainer, container
+    from app.api.endpoints import ai, answers, changes, questions, students
+    from app.services.student_service import StudentService
+except ImportError:
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.main import app
+    from app.api import dependencies
+    from app.api.dependencies import ServiceContainer, container
+    from app.api.endpoints import ai, answers, changes, questions, students
+    from app.services.student_service import StudentService
+
+
+def write_roster(path, students):
+    """Write a roster file, moving its modification time so the change is always seen."""
+    path.write_text(json.dumps(students), encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class TestServiceContainer:
+    """Test cases for the shared service graph."""
+
+    def test_providers_return_the_same_instances(self):
+        """Test that every request gets the process's services instead of new ones."""
+        assert dependencies.get_answer_service() is dependencies.get_answer_service()
+        assert dependencies.get_question_service() is container.question_service
+        assert dependencies.get_student_service() is container.student_service
+        assert dependencies.get_change_service() is container.change_service
+
+    def test_services_share_repositories(self):
+        """Test that the services are wired to one set of repositories and services."""
+        assert container.answer_service.question_service is container.question_service
+        assert container.answer_service.student_service is container.student_service
+        assert container.answer_service.answer_repo is container.answer_repo
+        assert container.question_service.answer_repo is container.answer_repo
+        assert container.change_service.change_repo is container.change_repo
+
+    def test_endpoints_resolve_through_the_container(self):
+        """Test that the endpoint modules and AI services use the container's instances."""
+        assert answers.get_answer_service is dependencies.get_answer_service
+        assert questions.get_answer_service is dependencies.get_answer_service
+        assert questions.get_question_service is answers.get_question_service
+        assert students.get_student_service is answers.get_student_service
+        assert changes.get_change_service is dependencies.get_change_service
+        assert container.question_summary_service.student_service is container.student_service
+        assert container.question_search_service.question_repo is container.question_repo
+        assert ai.get_summary_job_service is dependencies.get_summary_job_service
+
+    def test_ai_services_live_in_the_container(self):
+        """Test that the AI services, and the caches, guard and pools they hold, are the container's."""
+        assert dependencies.get_summarization_service() is container.summarization_service
+        assert dependencies.get_smart_search_service() is container.smart_search_service
+        assert dependencies.get_batch_summary_service() is container.batch_summary_service
+        assert container.summary_job_service.summarization_service is container.summarization_service
+        assert container.question_summary_service.job_service is container.summary_job_service
+        assert container.batch_summary_service.question_summary_service is container.question_summary_service
+        assert container.summarization_service.upstream is container.smart_search_service.upstream
+        assert dependencies.get_upstream_guard() is container.upstream_guard is container.summarization_service.upstream
+
+    def test_caches_and_feeds_live_in_the_container(self):
+        """Test that the response cache and the live feeds are built by the container and resolved through it."""
+        assert dependencies.get_response_cache() is container.response_cache
+        assert dependencies.get_answer_feed_service() is container.answer_feed
+        assert dependencies.get_question_status_feed_service() is container.question_status_feed
+        assert container.answer_feed.answer_repo is container.answer_repo
+        assert not hasattr(ai, "summarization_service")
+
+    def test_containers_are_isolated(self):
+        """Test that a second container builds its own cache, feeds and guard."""
+        other = ServiceContainer()
+
+        assert other.response_cache is not container.response_cache
+        assert other.answer_feed is not container.answer_feed
+        assert other.question_status_feed is not container.question_status_feed
+        assert other.upstream_guard is not container.upstream_guard
+
+    def test_reset_closes_the_upstream_circuit(self):
+        """Test that resetting the container clears the guard's circuit and retry count."""
+        breaker = container.upstream_guard.circuit_breaker
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        assert breaker.state == "open"
+
+        container.reset()
+
+        assert breaker.state == "closed"
+        assert container.upstream_guard.stats()["retries"] == 0
+
+    def test_override_applies_to_every_endpoint(self, client, tmp_path):
+        """Test that one dependency override replaces the student service for all routers."""
+        path = tmp_path / "students.json"
+        write_roster(path, [{"id": "STU9", "name": "Hedy"}])
+        app.dependency_overrides[students.get_student_service] = lambda: StudentService(str(path))
+        client.post("/api/v1/questions/open", json={"title": "Q", "text": "Why?", "access_code": "DEPS1"})
+
+        assert [student["id"] for student in client.get("/api/v1/students/").json()] == ["STU9"]
+        response = client.post("/api/v1/answers/question/DEPS1", json={"student_id": "STU9"})
+        assert response.status_code == 200
+
+    def test_reset_ends_streams_and_drops_cached_responses(self, client):
+        """Test that reset clears the shared response and AI caches and the brokers."""
+        client.get("/api/v1/questions/")
+        container.summarization_service.summary_cache.set("prompt", "summary")
+        container.smart_search_service.search_cache.set("query", (1,))
+        assert len(container.response_cache) == 1
+
+        container.reset()
+
+        assert len(container.response_cache) == 0
+        assert container.summarization_service.summary_cache.stats()["size"] == 0
+        assert container.smart_search_service.search_cache.stats()["size"] == 0
+        assert container.answer_feed.broker.stats()["topics"] == 0
+        assert container.question_status_feed.broker.stats()["topics"] == 0
+
+    def test_separate_container_builds_its_own_graph(self, tmp_path):
+        """Test that a container can be built around another roster."""
+        student_service = StudentService(str(tmp_path / "students.json"))
+        other = ServiceContainer(student_service)
+
+        assert other.student_service is student_service
+        assert other.answer_service.student_service is student_service
+        assert other.question_service is not container.question_service
+
+
+class TestStudentRosterCache:
+    """Test cases for the cached student roster."""
+
+    @pytest.fixture
+    def roster(self, tmp_path):
+        path = tmp_path / "students.json"
+        write_roster(path, [{"id": "STU1", "name": "Ada"}, {"id": "STU2", "name": "Grace"}])
+        return path
+
+    def test_roster_is_read_once_while_unchanged(self, roster, monkeypatch):
+        """Test that lookups after the first do not reread the file."""
+        service = StudentService(str(roster))
+        assert service.validate_student_id("STU1")
+
+        monkeypatch.setattr("builtins.open", lambda *args, **kwargs: pytest.fail("roster reread"))
+
+        assert service.get_student_by_id("STU2")["name"] == "Grace"
+        assert not service.validate_student_id("STU3")
+
+    def test_roster_reloads_when_the_file_changes(self, roster):
+        """Test that a changed file is picked up on the next lookup."""
+        service = StudentService(str(roster))
+        assert not service.validate_student_id("STU3")
+
+        write_roster(roster, [{"id": "STU3", "name": "Hedy"}])
+
+        assert service.validate_student_id("STU3")
+        assert not service.validate_student_id("STU1")
+
+    def test_get_all_students_returns_a_copy(self, roster):
+        """Test that callers cannot change the cached roster."""
+        service = StudentService(str(roster))
+        service.get_all_students().clear()
+
+        assert len(service.get_all_students()) == 2
+
+    def test_first_duplicate_id_wins(self, tmp_path):
+        """Test that lookups match the first entry of a duplicated ID, as a linear search did."""
+        path = tmp_path / "students.json"
+        write_roster(path, [{"id": "STU1", "name": "Ada"}, {"id": "STU1", "name": "Other"}])
+
+        assert StudentService(str(path)).get_student_by_id("STU1")["name"] == "Ada"
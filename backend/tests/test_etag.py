@@ -0,0 +1,161 @@
+"""
+Tests for ETags and conditional GET requests.
+"""
+
+import json
+import pytest
+from unittest.mock import Mock
+
+try:
+    from app.main import app
+    from app.database.config import get_db
+    from app.api.endpoints.students import get_student_service
+    from app.services.student_service import StudentService
+    from app.utils.etag import etag_matches, weak_etag
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.main import app
+    from app.database.config import get_db
+    from app.api.endpoints.students import get_student_service
+    from app.services.student_service import StudentService
+    from app.utils.etag import etag_matches, weak_etag
+
+
+def create_question(client, code):
+    """Create an open question through the API and return its ID."""
+    return client.post("/api/v1/questions/open", json={
+        "title": f"Question {code}", "text": "What is photosynthesis?", "access_code": code
+    }).json()["id"]
+
+
+def submit_answer(client, code, student_id="STU1001", text="Light to energy"):
+    """Submit an answer through the API."""
+    return client.post("/api/v1/answers/submit", json={"access_code": code, "student_id": student_id, "answer_text": text})
+
+
+class TestEtagMatching:
+    """Test cases for If-None-Match comparison."""
+
+    def test_weak_comparison(self):
+        """Test that weak and strong forms of the same tag match, and lists are searched."""
+        etag = weak_etag("questions", 3)
+        opaque = etag[2:]
+
+        assert etag_matches(etag, etag)
+        assert etag_matches(opaque, etag)
+        assert etag_matches(f'W/"other", {etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches(None, etag)
+        assert not etag_matches(weak_etag("questions", 4), etag)
+
+
+class TestQuestionListEtag:
+    """Test cases for conditional GET of the question list."""
+
+    def test_unchanged_list_is_not_modified(self, client):
+        """Test that a repeated poll gets 304 with an empty body."""
+        create_question(client, "ET1")
+        first = client.get("/api/v1/questions/")
+        etag = first.headers["etag"]
+
+        second = client.get("/api/v1/questions/", headers={"If-None-Match": etag})
+
+        assert etag.startswith('W/"')
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+    def test_writes_change_the_tag(self, client):
+        """Test that creating, answering and closing questions change the list tag."""
+        question_id = create_question(client, "ET2")
+        tags = [client.get("/api/v1/questions/").headers["etag"]]
+
+        submit_answer(client, "ET2")
+        tags.append(client.get("/api/v1/questions/").headers["etag"])
+        client.patch(f"/api/v1/questions/{question_id}/close")
+        tags.append(client.get("/api/v1/questions/").headers["etag"])
+        create_question(client, "ET3")
+        tags.append(client.get("/api/v1/questions/").headers["etag"])
+
+        assert len(set(tags)) == 4
+        response = client.get("/api/v1/questions/", headers={"If-None-Match": tags[0]})
+        assert response.status_code == 200
+        assert response.json()[0]["answer_count"] == 1
+
+    def test_status_filters_have_their_own_tags(self, client):
+        """Test that a tag for one filter does not validate another."""
+        create_question(client, "ET4")
+        etag = client.get("/api/v1/questions/", params={"status": "open"}).headers["etag"]
+
+        response = client.get("/api/v1/questions/", params={"status": "closed"}, headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+
+    def test_not_modified_skips_the_database(self, client):
+        """Test that a matching tag is answered without a database query."""
+        create_question(client, "ET5")
+        etag = client.get("/api/v1/questions/").headers["etag"]
+        session = Mock()
+        session.query.side_effect = AssertionError("database queried")
+        app.dependency_overrides[get_db] = lambda: session
+
+        response = client.get("/api/v1/questions/", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        session.query.assert_not_called()
+
+
+class TestAnswersEtag:
+    """Test cases for conditional GET of a question's answers."""
+
+    def test_answers_tag_follows_its_question(self, client):
+        """Test that only answers to the same question invalidate its tag."""
+        first = create_question(client, "EA1")
+        create_question(client, "EA2")
+        submit_answer(client, "EA1")
+        etag = client.get(f"/api/v1/questions/{first}/answers").headers["etag"]
+
+        submit_answer(client, "EA2")
+        assert client.get(f"/api/v1/questions/{first}/answers", headers={"If-None-Match": etag}).status_code == 304
+
+        submit_answer(client, "EA1", text="Updated answer")
+        response = client.get(f"/api/v1/questions/{first}/answers", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["answers"][0]["text"] == "Updated answer"
+
+    def test_close_changes_the_tag(self, client):
+        """Test that closing the question invalidates its answer view."""
+        question_id = create_question(client, "EA3")
+        etag = client.get(f"/api/v1/questions/{question_id}/answers").headers["etag"]
+
+        client.patch(f"/api/v1/questions/{question_id}/close")
+        response = client.get(f"/api/v1/questions/{question_id}/answers", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.json()["question"]["is_closed"] is True
+
+
+class TestStudentsEtag:
+    """Test cases for conditional GET of the student roster."""
+
+    @pytest.fixture
+    def roster(self, client, tmp_path):
+        """Student service reading a temporary roster file."""
+        path = tmp_path / "students.json"
+        path.write_text(json.dumps([{"id": "STU1", "name": "Ada"}]), encoding="utf-8")
+        app.dependency_overrides[get_student_service] = lambda: StudentService(str(path))
+        yield path
+        app.dependency_overrides.pop(get_student_service, None)
+
+    def test_roster_tag_changes_with_the_file(self, client, roster):
+        """Test 304 for an unchanged roster and 200 once the file changes."""
+        etag = client.get("/api/v1/students/").headers["etag"]
+        assert client.get("/api/v1/students/", headers={"If-None-Match": etag}).status_code == 304
+
+        roster.write_text(json.dumps([{"id": "STU1", "name": "Ada"}, {"id": "STU2", "name": "Grace"}]), encoding="utf-8")
+        response = client.get("/api/v1/students/", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert [student["id"] for student in response.json()] == ["STU1", "STU2"]
@@ -0,0 +1,57 @@
+"""
+Tests for the fast JSON response class.
+"""
+
+from datetime import datetime
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    from app.utils import json_response
+    from app.utils.json_response import FastJSONResponse, dumps_json
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.utils import json_response
+    from app.utils.json_response import FastJSONResponse, dumps_json
+
+
+PAYLOAD = {
+    "question": {"id": 1, "title": "שאלה", "is_closed": True, "close_date": None},
+    "answers": [{"id": 2, "text": "Light — energy \"quoted\"", "score": 0.25, "timestamp": "2024-01-01T10:00:00"}],
+    "answer_count": 1
+}
+
+
+class TestFastJSONResponse:
+    """Test cases for FastJSONResponse."""
+
+    def test_bytes_match_starlette(self):
+        """Test that responses are byte-for-byte wire-compatible with JSONResponse."""
+        assert FastJSONResponse(PAYLOAD).body == JSONResponse(PAYLOAD).body
+
+    def test_stdlib_fallback_matches(self, monkeypatch):
+        """Test that the fallback without orjson produces the same bytes."""
+        monkeypatch.setattr(json_response, "orjson", None)
+
+        assert dumps_json(PAYLOAD) == JSONResponse(PAYLOAD).body
+
+    def test_non_primitive_values_are_encoded(self):
+        """Test that values outside JSON primitives go through jsonable_encoder."""
+        content = {"at": datetime(2024, 1, 1, 10, 0), 3: "int key"}
+
+        assert dumps_json(content) == JSONResponse(jsonable_encoder(content)).body
+
+    def test_answers_endpoint_is_unchanged(self, client, sample_question_data, sample_answer_data):
+        """Test that the answer list keeps its shape and content type."""
+        question_id = client.post("/api/v1/questions/open", json=sample_question_data).json()["id"]
+        client.post("/api/v1/answers/submit", json={**sample_answer_data, "student_id": "STU1001"})
+
+        response = client.get(f"/api/v1/questions/{question_id}/answers")
+
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert data["answer_count"] == 1
+        assert data["answers"][0]["student_name"] == "Shaked Grunfeld"
+        assert data["question"]["access_code"] == sample_question_data["access_code"]
@@ -0,0 +1,105 @@
+"""
+Tests for the LLM provider layer against the bundled mock LLM server.
+"""
+
+import pytest
+
+try:
+    from app.config.ai_config import AIConfig
+    from app.services.llm_provider import LLMProvider, LocalProvider, OpenAICompatibleProvider, create_provider
+    from app.utils.resilience import UpstreamError, ProviderNotConfiguredError
+    from tools.mock_llm_server import MockLLMServer
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.config.ai_config import AIConfig
+    from app.services.llm_provider import LLMProvider, LocalProvider, OpenAICompatibleProvider, create_provider
+    from app.utils.resilience import UpstreamError, ProviderNotConfiguredError
+    from tools.mock_llm_server import MockLLMServer
+
+
+MESSAGES = [{"role": "user", "content": "Available questions, one per line as id|text:\n7|What is photosynthesis?"}]
+
+
+@pytest.fixture
+def mock_server():
+    """Start the mock LLM server."""
+    with MockLLMServer(reply_tokens=5) as server:
+        yield server
+
+
+@pytest.fixture
+def config(mock_server):
+    """AI configuration pointed at the mock server."""
+    config = AIConfig()
+    config.OPENAI_BASE_URL = mock_server.url
+    config.OPENAI_API_KEY = "mock"
+    return config
+
+
+class TestOpenAICompatibleProvider:
+    """Test cases for OpenAICompatibleProvider."""
+    
+    def test_complete(self, config):
+        """Test a plain chat completion."""
+        assert create_provider(config).complete(MESSAGES) == "Students mostly agreed on the"
+    
+    def test_complete_json(self, config):
+        """Test a JSON object completion."""
+        assert create_provider(config).complete(MESSAGES, json_response=True) == {"matching_question_ids": [7]}
+    
+    def test_stream(self, config):
+        """Test that streamed deltas reassemble the reply."""
+        provider = create_provider(config)
+        
+        deltas = list(provider.iter_stream(provider.open_stream(MESSAGES)))
+        
+        assert len(deltas) == 5
+        assert "".join(deltas) == "Students mostly agreed on the"
+    
+    def test_injected_errors(self, config, mock_server):
+        """Test that injected failures surface as retryable upstream errors."""
+        mock_server.error_rate = 1.0
+        mock_server.retry_after = 2
+        
+        with pytest.raises(UpstreamError) as exc_info:
+            create_provider(config).complete(MESSAGES)
+        
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.retry_after == 2.0
+        assert exc_info.value.retryable
+    
+    def test_missing_api_key(self, config):
+        """Test that a missing key fails before any request."""
+        config.OPENAI_API_KEY = ""
+        
+        with pytest.raises(ProviderNotConfiguredError):
+            OpenAICompatibleProvider(config).complete(MESSAGES)
+    
+    def test_unknown_provider(self, config):
+        """Test that an unknown provider name is rejected."""
+        config.AI_PROVIDER = "carrier-pigeon"
+        
+        with pytest.raises(ValueError):
+            create_provider(config)
+    
+    def test_interface_is_abstract(self, config):
+        """Test that a provider must implement the whole interface."""
+        class CompletionOnly(LLMProvider):
+            def complete(self, messages, json_response=False):
+                return "ok"
+        
+        with pytest.raises(TypeError):
+            LLMProvider(config)
+        with pytest.raises(TypeError):
+            CompletionOnly(config)
+    
+    def test_local_provider_is_registered(self, config):
+        """Test that AI_PROVIDER=local selects the local provider, whose chat calls fail as unconfigured."""
+        config.AI_PROVIDER = "local"
+        provider = create_provider(config)
+        
+        assert isinstance(provider, LocalProvider)
+        with pytest.raises(ProviderNotConfiguredError):
+            provider.complete(MESSAGES)
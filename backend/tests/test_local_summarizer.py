@@ -0,0 +1,148 @@
+"""
+Tests for the local extractive summarizer and the summary fallback.
+"""
+
+import threading
+import time
+import pytest
+
+try:
+    from app.services.local_summarizer import LocalSummarizer, split_sentences
+    from app.services.ai_service import AISummarizationService
+    from app.models.ai_models import SummarizationRequest
+    from app.utils.resilience import CircuitOpenError
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.services.local_summarizer import LocalSummarizer, split_sentences
+    from app.services.ai_service import AISummarizationService
+    from app.models.ai_models import SummarizationRequest
+    from app.utils.resilience import CircuitOpenError
+
+
+ANSWERS = [
+    "Plants use sunlight to make sugar.",
+    "Plants use sunlight to make sugar!",
+    "plants use sunlight to make sugar",
+    "Chlorophyll absorbs light. I think.",
+    "Plants eat soil.",
+]
+
+
+def make_request(texts, provider=None):
+    """Build a summarization request from answer texts."""
+    return SummarizationRequest(
+        context={"question_id": 1, "question_text": "What is photosynthesis?", "summary_instructions": "Summarize"},
+        student_answers=[
+            {"student_id": f"STU{i}", "student_name": f"Student {i}", "answer_text": text, "submitted_at": "2024-01-01T10:00:00"}
+            for i, text in enumerate(texts)
+        ],
+        provider=provider
+    )
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """Summarization service with a configured provider key."""
+    service = AISummarizationService()
+    monkeypatch.setattr(service.config, "OPENAI_API_KEY", "test-key")
+    return service
+
+
+class TestLocalSummarizer:
+    """Test cases for LocalSummarizer."""
+    
+    def test_split_sentences(self):
+        """Test sentence splitting on terminal punctuation."""
+        assert split_sentences("One idea.  Two ideas!\nThree?") == ["One idea.", "Two ideas!", "Three?"]
+    
+    def test_main_points_weighted_by_students(self):
+        """Test that the most common answer leads and filler sentences are skipped."""
+        points = LocalSummarizer().main_points(make_request(ANSWERS).student_answers)
+        
+        assert points[0] == ("Plants use sunlight to make sugar.", 3)
+        assert all(sentence != "I think." for sentence, _ in points)
+    
+    def test_keywords_count_answers(self):
+        """Test that keywords count the answers using each term."""
+        keywords = dict(LocalSummarizer().keywords(make_request(ANSWERS).student_answers))
+        
+        assert keywords["plants"] == 4
+        assert "i" not in keywords
+    
+    def test_summarizes_hundreds_of_answers_quickly(self):
+        """Test that the summarizer stays fast for a large class."""
+        texts = [f"{ANSWERS[i % len(ANSWERS)]} Reason number {i % 40} is water." for i in range(500)]
+        answers = make_request(texts).student_answers
+        summarizer = LocalSummarizer()
+        
+        started = time.perf_counter()
+        summary = summarizer.summarize(answers)
+        
+        assert time.perf_counter() - started < 1.0
+        assert summary.startswith("Summary of 500 answers")
+
+
+class TestSummaryFallback:
+    """Test cases for choosing the local summarizer."""
+    
+    def test_local_provider_skips_upstream(self, service, monkeypatch):
+        """Test that provider=local never calls the AI provider."""
+        monkeypatch.setattr(service, "_make_openai_request", lambda *args, **kwargs: pytest.fail("upstream called"))
+        
+        summary = service.generate_summary(make_request(ANSWERS, provider="local"))
+        
+        assert "generated locally" in summary
+        assert service.get_stats().local_summaries == 1
+    
+    def test_missing_api_key_falls_back(self, service, monkeypatch):
+        """Test that an unconfigured provider answers locally instead of failing."""
+        monkeypatch.setattr(service.config, "OPENAI_API_KEY", "")
+        
+        assert "generated locally" in service.generate_summary(make_request(ANSWERS))
+    
+    def test_open_circuit_falls_back(self, service, monkeypatch):
+        """Test that an open circuit answers locally."""
+        def open_circuit(messages, json_response=False, **kwargs):
+            raise CircuitOpenError("AI provider is unavailable")
+        monkeypatch.setattr(service, "_make_openai_request", open_circuit)
+        
+        assert "generated locally" in service.generate_summary(make_request(ANSWERS))
+    
+    def test_fallback_disabled_raises(self, service, monkeypatch):
+        """Test that the provider error surfaces when the fallback is off."""
+        monkeypatch.setattr(service.config, "OPENAI_API_KEY", "")
+        monkeypatch.setattr(service.config, "AI_LOCAL_FALLBACK", False)
+        
+        with pytest.raises(ValueError):
+            service.generate_summary(make_request(ANSWERS))
+    
+    def test_latency_budget_falls_back_and_caches_late_result(self, service, monkeypatch):
+        """Test that a slow provider is not waited for, and its late summary serves later requests."""
+        monkeypatch.setattr(service.config, "AI_LATENCY_BUDGET_SECONDS", 0.05)
+        release = threading.Event()
+        finished = threading.Event()
+        
+        def slow_request(messages, json_response=False, **kwargs):
+            release.wait(5)
+            finished.set()
+            return "Provider summary"
+        monkeypatch.setattr(service, "_make_openai_request", slow_request)
+        request = make_request(ANSWERS)
+        
+        assert "generated locally" in service.generate_summary(request)
+        
+        release.set()
+        finished.wait(5)
+        time.sleep(0.05)
+        assert service.generate_summary(request) == "Provider summary"
+    
+    def test_local_summary_is_not_stored(self, service, db_session, monkeypatch):
+        """Test that fallback summaries do not become the question's stored summary."""
+        monkeypatch.setattr(service.config, "OPENAI_API_KEY", "")
+        request = make_request(ANSWERS)
+        request.incremental = True
+        
+        assert "generated locally" in service.generate_incremental_summary(db_session, request)
+        assert service.summary_repo.get_all(db_session) == []
@@ -0,0 +1,127 @@
+"""
+Unit tests for the AI prompt builder.
+"""
+
+import pytest
+
+try:
+    from app.services.prompt_builder import PromptBuilder, TokenCounter, compact_text
+    from app.models.ai_models import SummarizationRequest, SmartSearchRequest, QuestionItem
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.services.prompt_builder import PromptBuilder, TokenCounter, compact_text
+    from app.models.ai_models import SummarizationRequest, SmartSearchRequest, QuestionItem
+
+
+def make_summary_request(answer_count: int, answer_text: str = "Photosynthesis turns light into energy") -> SummarizationRequest:
+    """Build a summarization request with the given number of answers."""
+    return SummarizationRequest(
+        context={
+            "question_id": 1,
+            "question_text": "What is photosynthesis?",
+            "summary_instructions": "List the main ideas"
+        },
+        student_answers=[
+            {
+                "student_id": f"STU{i:04d}",
+                "student_name": f"Student {i}",
+                "answer_text": f"{answer_text} {i}",
+                "submitted_at": "2024-01-01T10:00:00+02:00"
+            }
+            for i in range(answer_count)
+        ]
+    )
+
+
+class TestPromptBuilder:
+    """Test cases for PromptBuilder."""
+
+    def test_token_counter_counts_words_and_punctuation(self):
+        """Test the token counter on simple text."""
+        counter = TokenCounter()
+
+        assert counter.count("") == 0
+        assert counter.count("hello world!") >= 3
+
+    def test_token_counter_loads_encoding_on_first_count(self, monkeypatch):
+        """Test that the tiktoken encoding is resolved by the first count, not by the constructor."""
+        import sys
+        from types import SimpleNamespace
+
+        loaded = []
+        encoding = SimpleNamespace(encode=lambda text: text.split())
+        monkeypatch.setitem(sys.modules, "tiktoken", SimpleNamespace(
+            encoding_for_model=lambda model: loaded.append(model) or encoding
+        ))
+
+        counter = TokenCounter("gpt-4o-mini")
+        assert loaded == []
+
+        assert counter.count("one two three") == 3
+        assert counter.count("four five") == 2
+        assert loaded == ["gpt-4o-mini"]
+
+    def test_compact_text_escapes_delimiter(self):
+        """Test that row text is flattened and the delimiter is escaped."""
+        assert compact_text("a |  b\nc") == "a / b c"
+
+    def test_summary_prompt_prunes_redundant_fields(self):
+        """Test that IDs and timestamps are not sent to the model."""
+        builder = PromptBuilder(token_budget=2000, max_answer_tokens=50)
+
+        messages, usage = builder.build_summary_messages("system", make_summary_request(3))
+
+        user_prompt = messages[1]["content"]
+        assert "Student 0|Photosynthesis turns light into energy 0" in user_prompt
+        assert "STU0000" not in user_prompt
+        assert "2024-01-01" not in user_prompt
+        assert usage.items_sent == 3
+        assert usage.truncated is False
+
+    def test_summary_prompt_respects_budget(self):
+        """Test that answers are sampled when the prompt exceeds the budget."""
+        builder = PromptBuilder(token_budget=300, max_answer_tokens=10)
+
+        messages, usage = builder.build_summary_messages("system", make_summary_request(200))
+
+        assert usage.prompt_tokens <= 300
+        assert 0 < usage.items_sent < 200
+        assert usage.truncated is True
+
+    def test_budget_sampling_is_deterministic(self):
+        """Test that the same request always produces the same prompt."""
+        builder = PromptBuilder(token_budget=300, max_answer_tokens=10)
+        request = make_summary_request(200)
+
+        first, _ = builder.build_summary_messages("system", request)
+        second, _ = builder.build_summary_messages("system", request)
+
+        assert first == second
+
+    def test_search_prompt_uses_id_rows(self):
+        """Test the compact encoding of smart search prompts."""
+        builder = PromptBuilder(token_budget=2000, max_answer_tokens=50)
+        request = SmartSearchRequest(
+            query="plants",
+            available_questions=[{"id": 7, "text": "What is\nphotosynthesis?"}]
+        )
+
+        messages, usage = builder.build_search_messages("system", request)
+
+        assert "7|What is photosynthesis?" in messages[1]["content"]
+        assert usage.items_total == 1
+
+    def test_batch_search_prompt_numbers_queries(self):
+        """Test that batch prompts list every query once, apart from the question rows."""
+        builder = PromptBuilder(token_budget=2000, max_answer_tokens=50)
+
+        messages, usage = builder.build_batch_search_messages(
+            "system", ["plants", "capital  cities"], [QuestionItem(id=7, text="Photosynthesis?")]
+        )
+
+        content = messages[1]["content"]
+        assert "q1|plants\nq2|capital cities" in content
+        assert "7|Photosynthesis?" in content
+        assert usage.items_total == 1
@@ -0,0 +1,153 @@
+"""
+Tests for the per-access-code question status channel.
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+try:
+    from app.api.dependencies import container
+    from app.services.question_status_feed_service import QuestionStatusFeedService
+    from app.utils.broker import EventBroker
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.api.dependencies import container
+    from app.services.question_status_feed_service import QuestionStatusFeedService
+    from app.utils.broker import EventBroker
+
+
+def create_question(client, code):
+    """Create an open question through the API and return its ID."""
+    return client.post("/api/v1/questions/open", json={
+        "title": f"Question {code}", "text": "What is photosynthesis?", "access_code": code
+    }).json()["id"]
+
+
+def parse_events(text):
+    """Parse an SSE body into (event, data) tuples, skipping comments."""
+    parsed = []
+    for block in text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if fields:
+            parsed.append((fields.get("event"), json.loads(fields["data"])))
+    return parsed
+
+
+def stream_while(client, code, writer, headers=None):
+    """Read a code's status stream to its end while writer runs once the stream is subscribed."""
+    topic = container.question_status_feed.topic(code)
+
+    def run():
+        deadline = time.monotonic() + 5
+        while container.question_status_feed.broker.subscriber_count(topic) == 0:
+            assert time.monotonic() < deadline, "timed out"
+            time.sleep(0.01)
+        writer()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    response = client.get(f"/api/v1/answers/question/{code}/events", headers=headers or {})
+    thread.join()
+    return response, parse_events(response.text)
+
+
+class TestQuestionStatusFeedService:
+    """Test cases for QuestionStatusFeedService."""
+
+    def test_one_close_reaches_thousands_of_waiting_students(self):
+        """Test fan-out of a close event to many idle subscriptions on one loop."""
+        async def run():
+            feed = QuestionStatusFeedService(EventBroker(max_queue=8, history_size=4))
+            subscriptions = [feed.subscribe("ROOM1") for _ in range(3000)]
+            other = feed.subscribe("ROOM2")
+            feed.on_question_closed(question_id=1, access_code="ROOM1")
+            messages = await asyncio.gather(*(subscription.get(timeout=1) for subscription in subscriptions))
+            other_pending = other._queue.qsize()
+            for subscription in subscriptions + [other]:
+                subscription.close()
+            return messages, other_pending, feed.broker.subscriber_count()
+
+        messages, other_pending, remaining = asyncio.run(run())
+        assert {message.event for message in messages} == {"question.closed"}
+        assert messages[0].data == {"access_code": "ROOM1", "question_id": 1}
+        assert other_pending == 0
+        assert remaining == 0
+
+    def test_codes_without_listeners_publish_nothing(self):
+        """Test that closing a question no one waits on skips the broker."""
+        feed = QuestionStatusFeedService(EventBroker())
+
+        feed.on_question_closed(question_id=1, access_code="NOBODY")
+
+        assert feed.broker.published == 0
+
+
+class TestQuestionStatusEndpoint:
+    """Test cases for GET /api/v1/answers/question/{access_code}/events."""
+
+    def test_close_is_pushed_and_ends_the_stream(self, client):
+        """Test that students see the close without polling."""
+        question_id = create_question(client, "ST1")
+
+        response, events = stream_while(client, "ST1", lambda: client.patch(f"/api/v1/questions/{question_id}/close"))
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert events == [
+            ("ready", {"access_code": "ST1", "question_id": question_id, "is_closed": False}),
+            ("question.closed", {"access_code": "ST1", "question_id": question_id})
+        ]
+
+    def test_delete_is_pushed_and_ends_the_stream(self, client):
+        """Test that students see the deletion."""
+        question_id = create_question(client, "ST2")
+
+        _, events = stream_while(client, "ST2", lambda: client.delete(f"/api/v1/questions/{question_id}"))
+
+        assert [event for event, _ in events] == ["ready", "question.deleted"]
+        assert not container.question_status_feed.broker.has_topic(container.question_status_feed.topic("ST2"))
+
+    def test_other_codes_are_not_notified(self, client):
+        """Test that closing another question does not reach this channel."""
+        first = create_question(client, "ST3")
+        second = create_question(client, "ST4")
+
+        def writer():
+            client.patch(f"/api/v1/questions/{second}/close")
+            client.patch(f"/api/v1/questions/{first}/close")
+
+        _, events = stream_while(client, "ST3", writer)
+
+        assert [data["question_id"] for _, data in events] == [first, first]
+
+    def test_already_closed_question_ends_at_once(self, client):
+        """Test that a closed question answers with its close event and no subscription is kept."""
+        question_id = create_question(client, "ST5")
+        client.patch(f"/api/v1/questions/{question_id}/close")
+
+        response = client.get("/api/v1/answers/question/ST5/events")
+
+        assert parse_events(response.text) == [("question.closed", {"access_code": "ST5", "question_id": question_id})]
+        assert container.question_status_feed.broker.subscriber_count() == 0
+
+    def test_streams_are_uncompressed(self, client):
+        """Test that idle streams skip per-connection compression."""
+        question_id = create_question(client, "ST6")
+
+        response, _ = stream_while(
+            client, "ST6", lambda: client.patch(f"/api/v1/questions/{question_id}/close"),
+            headers={"Accept-Encoding": "gzip, br"}
+        )
+
+        assert "content-encoding" not in response.headers
+        assert "no-transform" in response.headers["cache-control"]
+
+    def test_unknown_code_is_not_found(self, client):
+        """Test that an unknown access code fails with 404 and leaves no subscription."""
+        response = client.get("/api/v1/answers/question/NOPE/events")
+
+        assert response.status_code == 404
+        assert container.question_status_feed.broker.subscriber_count() == 0
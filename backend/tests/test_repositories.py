@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 try:
     from app.database.repositories.question_repository import QuestionRepository
     from app.database.repositories.answer_repository import AnswerRepository
+    from app.database.repositories.question_summary_repository import QuestionSummaryRepository
     from app.database.models.question import Question
     from app.database.models.answer import Answer
 except ImportError:
@@ -17,6 +18,7 @@ except ImportError:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from app.database.repositories.question_repository import QuestionRepository
     from app.database.repositories.answer_repository import AnswerRepository
+    from app.database.repositories.question_summary_repository import QuestionSummaryRepository
     from app.database.models.question import Question
     from app.database.models.answer import Answer
 
@@ -128,3 +130,47 @@ class TestAnswerRepository:
         # Assert
         assert result == mock_answer
         self.mock_db.query.assert_called_once()
+
+
+class TestQuestionSummaryRepository:
+    """Test cases for QuestionSummaryRepository against the test database."""
+    
+    @staticmethod
+    def summary(text):
+        return {
+            "question_id": 1, "instructions_hash": "hash", "summary_instructions": "Summarize",
+            "summary": text, "answer_count": 1
+        }
+    
+    def test_upsert_after_a_concurrent_insert_updates_the_row(self, db_session, monkeypatch):
+        """Test that a summary inserted by another request after this one looked is updated, not re-inserted."""
+        db_session.add(Question(title="Q", text="Text", access_code="SUM1"))
+        db_session.commit()
+        repo = QuestionSummaryRepository()
+        repo.upsert(db_session, self.summary("first"))
+        
+        # The lookup ran before the other request committed its insert
+        lookup = repo.get_by_question_and_instructions
+        calls = []
+        
+        def stale_lookup(*args):
+            calls.append(args)
+            return None if len(calls) == 1 else lookup(*args)
+        
+        monkeypatch.setattr(repo, "get_by_question_and_instructions", stale_lookup)
+        repo.upsert(db_session, self.summary("second"))
+        
+        assert [row.summary for row in repo.get_all(db_session)] == ["second"]
+    
+    def test_upsert_returns_the_stored_summary(self, db_session):
+        """Test that upsert returns the row as stored."""
+        db_session.add(Question(title="Q", text="Text", access_code="SUM2"))
+        db_session.commit()
+        repo = QuestionSummaryRepository()
+        
+        created = repo.upsert(db_session, self.summary("first"))
+        updated = repo.upsert(db_session, self.summary("second"))
+        
+        assert created.id == updated.id
+        assert updated.summary == "second"
+        assert updated.created_at is not None
@@ -0,0 +1,229 @@
+"""
+Tests for the in-process HTTP response cache.
+"""
+
+import gzip
+import pytest
+from unittest.mock import Mock
+
+try:
+    from app.main import app
+    from app.database.config import get_db
+    from app.api.dependencies import container
+    from app.utils.response_cache import ResponseCache, CachedResponse, _stored_headers
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.main import app
+    from app.database.config import get_db
+    from app.api.dependencies import container
+    from app.utils.response_cache import ResponseCache, CachedResponse, _stored_headers
+
+
+def create_question(client, code, text="What is photosynthesis?"):
+    """Create an open question through the API and return its ID."""
+    return client.post("/api/v1/questions/open", json={
+        "title": f"Question {code}", "text": text, "access_code": code
+    }).json()["id"]
+
+
+def submit_answer(client, code, student_id="STU1001", text="Light to energy"):
+    """Submit an answer through the API."""
+    return client.post("/api/v1/answers/submit", json={"access_code": code, "student_id": student_id, "answer_text": text})
+
+
+def failing_session():
+    """Database session that fails the test if it is queried."""
+    session = Mock()
+    session.query.side_effect = AssertionError("database queried")
+    return session
+
+
+class TestResponseCache:
+    """Test cases for the ResponseCache store."""
+
+    def test_evicts_least_recently_used_by_size(self):
+        """Test that the byte bound evicts the entry used longest ago."""
+        cache = ResponseCache(max_bytes=25, max_entry_bytes=20)
+        cache.set("a", CachedResponse([], b"x" * 10))
+        cache.set("b", CachedResponse([], b"x" * 10))
+        cache.get("a")
+
+        cache.set("c", CachedResponse([], b"x" * 10))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.stats()["bytes"] == 20
+        assert cache.stats()["evictions"] == 1
+
+    def test_oversized_entries_are_not_stored(self):
+        """Test that a body above the per-entry bound is skipped."""
+        cache = ResponseCache(max_bytes=100, max_entry_bytes=5)
+
+        assert cache.set("a", CachedResponse([], b"x" * 6)) is False
+        assert len(cache) == 0
+
+    def test_invalidate_drops_tagged_entries_only(self):
+        """Test that invalidation is limited to the given tags."""
+        cache = ResponseCache()
+        cache.set("list", CachedResponse([], b"[]"), tags=["questions"])
+        cache.set("answers:1", CachedResponse([], b"{}"), tags=["answers:1"])
+        cache.set("answers:2", CachedResponse([], b"{}"), tags=["answers:2"])
+
+        assert cache.invalidate("questions", "answers:1") == 2
+        assert cache.get("answers:2") is not None
+        assert len(cache) == 1
+
+    def test_variants_count_towards_the_size(self):
+        """Test that compressed variants are included in the byte total."""
+        cache = ResponseCache()
+        entry = CachedResponse([], b"x" * 10)
+        cache.set("a", entry)
+
+        cache.add_variant("a", entry, "gzip", b"z" * 4)
+
+        assert cache.stats()["bytes"] == 14
+
+
+class TestResponseCacheMiddleware:
+    """Test cases for cached teacher read endpoints."""
+
+    def test_repeated_read_is_served_from_cache(self, client):
+        """Test that the second read is a hit that skips the database."""
+        create_question(client, "RC1")
+        first = client.get("/api/v1/questions/")
+        app.dependency_overrides[get_db] = failing_session
+
+        second = client.get("/api/v1/questions/")
+
+        assert first.headers["x-cache"] == "MISS"
+        assert second.headers["x-cache"] == "HIT"
+        assert second.content == first.content
+        assert second.headers["etag"] == first.headers["etag"]
+
+    def test_cors_headers_follow_each_requests_origin(self, client):
+        """Test that a hit answers the caller's Origin rather than replaying the first caller's CORS headers."""
+        create_question(client, "RCORS")
+        first = client.get("/api/v1/questions/")
+        assert "access-control-allow-origin" not in first.headers
+
+        for origin in ("http://localhost:5173", "http://b.example"):
+            response = client.get("/api/v1/questions/", headers={"Origin": origin})
+
+            assert response.headers["x-cache"] == "HIT"
+            assert response.headers["access-control-allow-origin"] == origin
+            assert "origin" in response.headers["vary"].lower()
+            assert "accept-encoding" in response.headers["vary"].lower()
+
+    def test_stored_headers_drop_cors_and_keep_vary(self):
+        """Test that per-origin headers are not stored and other Vary fields are kept."""
+        headers = _stored_headers([
+            (b"etag", b'"abc"'), (b"access-control-allow-origin", b"http://a.example"),
+            (b"vary", b"Origin, Accept-Encoding"), (b"content-length", b"10")
+        ])
+
+        assert headers == [(b"etag", b'"abc"'), (b"vary", b"Origin")]
+
+    def test_query_strings_are_cached_separately(self, client):
+        """Test that each status filter has its own entry."""
+        create_question(client, "RC2")
+        client.get("/api/v1/questions/", params={"status": "open"})
+
+        response = client.get("/api/v1/questions/", params={"status": "closed"})
+
+        assert response.headers["x-cache"] == "MISS"
+        assert response.json() == []
+
+    def test_answer_invalidates_the_affected_views(self, client):
+        """Test that an answer drops the list and that question's answers, but not other questions'."""
+        first = create_question(client, "RC3")
+        second = create_question(client, "RC4")
+        client.get("/api/v1/questions/")
+        client.get(f"/api/v1/questions/{first}/answers")
+        client.get(f"/api/v1/questions/{second}/answers")
+
+        submit_answer(client, "RC3")
+
+        assert len(container.response_cache) == 1
+        assert client.get(f"/api/v1/questions/{second}/answers").headers["x-cache"] == "HIT"
+        answers = client.get(f"/api/v1/questions/{first}/answers")
+        assert answers.headers["x-cache"] == "MISS"
+        assert len(answers.json()["answers"]) == 1
+        assert client.get("/api/v1/questions/").json()[0]["answer_count"] == 1
+
+    def test_close_and_delete_invalidate(self, client):
+        """Test that closing and deleting a question refresh the cached list."""
+        question_id = create_question(client, "RC5")
+        client.get("/api/v1/questions/")
+
+        client.patch(f"/api/v1/questions/{question_id}/close")
+        assert client.get("/api/v1/questions/").json()[0]["is_closed"] is True
+
+        client.delete(f"/api/v1/questions/{question_id}")
+        assert client.get("/api/v1/questions/").json() == []
+
+    def test_hit_honors_if_none_match(self, client):
+        """Test that a cached response answers conditional requests with 304."""
+        create_question(client, "RC6")
+        etag = client.get("/api/v1/questions/").headers["etag"]
+
+        response = client.get("/api/v1/questions/", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.headers["x-cache"] == "HIT"
+        assert response.content == b""
+
+    def test_hit_is_compressed_once_for_gzip_clients(self, client):
+        """Test that a large cached body is sent gzipped and the variant is kept."""
+        for i in range(20):
+            create_question(client, f"RZ{i}", text="Describe the water cycle in detail. " * 5)
+        identity = client.get("/api/v1/questions/", headers={"Accept-Encoding": "identity"})
+
+        compressed = client.get("/api/v1/questions/", headers={"Accept-Encoding": "gzip"})
+        size_with_variant = container.response_cache.stats()["bytes"]
+        client.get("/api/v1/questions/", headers={"Accept-Encoding": "gzip"})
+
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in [field.strip() for field in compressed.headers["vary"].split(",")]
+        assert compressed.content == identity.content
+        assert int(compressed.headers["content-length"]) < len(identity.content)
+        assert container.response_cache.stats()["bytes"] == size_with_variant > len(identity.content)
+
+    def test_each_encoding_is_compressed_once(self, client, monkeypatch):
+        """Test that the miss stores the compressed bytes that later hits reuse."""
+        import app.utils.response_cache as response_cache_module
+        for i in range(20):
+            create_question(client, f"RB{i}", text="Describe the water cycle in detail. " * 5)
+        calls = []
+        original = response_cache_module.compress
+        monkeypatch.setattr(response_cache_module, "compress",
+                            lambda body, encoding, level=None: calls.append(encoding) or original(body, encoding, level))
+
+        responses = [client.get("/api/v1/questions/", headers={"Accept-Encoding": "br"}) for _ in range(3)]
+        client.get("/api/v1/questions/", headers={"Accept-Encoding": "gzip"})
+        client.get("/api/v1/questions/", headers={"Accept-Encoding": "gzip"})
+
+        assert calls == ["br", "gzip"]
+        assert [response.headers["x-cache"] for response in responses] == ["MISS", "HIT", "HIT"]
+        assert all(response.headers["content-encoding"] == "br" for response in responses)
+        assert responses[0].json() == responses[2].json()
+
+    def test_error_responses_are_not_cached(self, client):
+        """Test that a 404 is passed through without being stored."""
+        response = client.get("/api/v1/questions/999/answers")
+
+        assert response.status_code == 404
+        assert "x-cache" not in response.headers
+        assert len(container.response_cache) == 0
+
+    def test_stats_endpoint(self, client):
+        """Test that the stats endpoint reports hits and misses."""
+        client.get("/api/v1/questions/")
+        client.get("/api/v1/questions/")
+
+        stats = client.get("/cache/stats").json()
+
+        assert stats["entries"] == 1
+        assert stats["hits"] >= 1 and stats["misses"] >= 1
+        assert 0 < stats["hit_rate"] <= 1
@@ -0,0 +1,313 @@
+"""
+Tests for background summarization jobs.
+"""
+
+import threading
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock
+from fastapi.testclient import TestClient
+
+try:
+    from app.api.endpoints.ai import get_summary_job_service
+    from app.main import app
+    from app.models.ai_models import SummarizationRequest
+    from app.services.summary_job_service import SummaryJobService
+    from app.services.ai_service import AISummarizationService
+    from app.services.question_service import QuestionService
+    from app.services.question_summary_service import QuestionSummaryService
+    from app.database.repositories.question_repository import QuestionRepository
+    from app.database.repositories.answer_repository import AnswerRepository
+    from app.database.models.question_summary import QuestionSummary
+    from app.config.ai_config import AIConfig
+    from app.utils.events import events, QUESTION_CLOSED
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.api.endpoints.ai import get_summary_job_service
+    from app.main import app
+    from app.models.ai_models import SummarizationRequest
+    from app.services.summary_job_service import SummaryJobService
+    from app.services.ai_service import AISummarizationService
+    from app.services.question_service import QuestionService
+    from app.services.question_summary_service import QuestionSummaryService
+    from app.database.repositories.question_repository import QuestionRepository
+    from app.database.repositories.answer_repository import AnswerRepository
+    from app.database.models.question_summary import QuestionSummary
+    from app.config.ai_config import AIConfig
+    from app.utils.events import events, QUESTION_CLOSED
+
+
+REQUEST_BODY = {
+    "context": {"question_id": 1, "question_text": "What is photosynthesis?", "summary_instructions": "Summarize"},
+    "student_answers": [
+        {"student_id": "STU1001", "student_name": "Shaked Grunfeld", "answer_text": "Light to energy", "submitted_at": "2024-01-01T10:00:00"}
+    ]
+}
+
+
+def wait_for_status(service, db, job_id, expected, timeout=5.0):
+    """Poll a job until it reaches the expected status."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        db.expire_all()
+        job = service.get_job(db, job_id)
+        if job["status"] == expected:
+            return job
+        time.sleep(0.02)
+    pytest.fail(f"Job {job_id} did not reach status {expected}")
+
+
+@pytest.fixture
+def summarizer():
+    """Summarization service stub."""
+    summarizer = Mock()
+    summarizer.generate_summary.return_value = "Students described photosynthesis"
+    return summarizer
+
+
+@pytest.fixture
+def job_service(summarizer, session_factory):
+    """Job service using the test database."""
+    service = SummaryJobService(summarizer, session_factory=session_factory, max_workers=1)
+    yield service
+    service.shutdown(wait=True)
+
+
+class TestSummaryJobService:
+    """Test cases for SummaryJobService."""
+    
+    def test_submit_runs_job_to_completion(self, job_service, db_session):
+        """Test that a submitted job is processed in the background."""
+        job = job_service.submit(db_session, SummarizationRequest(**REQUEST_BODY))
+        
+        assert job["status"] in ("pending", "running", "completed")
+        done = wait_for_status(job_service, db_session, job["job_id"], "completed")
+        assert done["summary"] == "Students described photosynthesis"
+        assert done["question_id"] == 1
+    
+    def test_identical_requests_are_deduplicated(self, job_service, summarizer, db_session):
+        """Test that an identical request returns the existing job."""
+        first = job_service.submit(db_session, SummarizationRequest(**REQUEST_BODY))
+        second = job_service.submit(db_session, SummarizationRequest(**REQUEST_BODY))
+        
+        assert first["job_id"] == second["job_id"]
+        wait_for_status(job_service, db_session, first["job_id"], "completed")
+        assert summarizer.generate_summary.call_count == 1
+    
+    def test_concurrent_identical_requests_share_one_job(self, summarizer):
+        """Test that identical submissions racing between the duplicate check and the insert create one job."""
+        jobs = []
+        
+        def get_active_by_content_hash(db, content_hash):
+            found = next((job for job in jobs if job.content_hash == content_hash), None)
+            time.sleep(0.05)  # Widens the window between the check and the insert
+            return found
+        
+        def create(db, values):
+            job = SimpleNamespace(result=None, error=None, created_at=None, updated_at=None, **values)
+            jobs.append(job)
+            return job
+        
+        job_repo = Mock(get_active_by_content_hash=get_active_by_content_hash, create=create)
+        job_repo.count_by_status.return_value = 0
+        service = SummaryJobService(summarizer, job_repo=job_repo, session_factory=Mock(), max_workers=1)
+        service._run_job = lambda job_id: None
+        results = []
+        
+        threads = [
+            threading.Thread(target=lambda: results.append(service.submit(None, SummarizationRequest(**REQUEST_BODY))))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        service.shutdown(wait=True)
+        
+        assert len(jobs) == 1
+        assert {result["job_id"] for result in results} == {jobs[0].id}
+    
+    def test_failed_job_records_error(self, job_service, summarizer, db_session):
+        """Test that a failing summary marks the job as failed."""
+        summarizer.generate_summary.side_effect = ValueError("upstream down")
+        
+        job = job_service.submit(db_session, SummarizationRequest(**REQUEST_BODY))
+        
+        failed = wait_for_status(job_service, db_session, job["job_id"], "failed")
+        assert "upstream down" in failed["error"]
+    
+    def test_failure_that_breaks_the_session_records_error(self, job_service, summarizer, db_session):
+        """Test that a job whose failed flush leaves the session needing a rollback is still marked as failed."""
+        def break_session(db, request):
+            db.add(QuestionSummary())  # Violates NOT NULL constraints on flush
+            db.flush()
+        
+        summarizer.generate_incremental_summary.side_effect = break_session
+        
+        job = job_service.submit(db_session, SummarizationRequest(**REQUEST_BODY, incremental=True))
+        
+        failed = wait_for_status(job_service, db_session, job["job_id"], "failed")
+        assert "IntegrityError" in failed["error"]
+    
+    def test_resume_pending_jobs(self, job_service, db_session):
+        """Test that jobs persisted as pending are re-queued on startup."""
+        job_service.job_repo.create(db_session, {
+            "id": "resumed-job",
+            "content_hash": "hash",
+            "question_id": 1,
+            "status": "pending",
+            "request_payload": SummarizationRequest(**REQUEST_BODY).model_dump_json()
+        })
+        
+        assert job_service.resume_pending_jobs() == 1
+        wait_for_status(job_service, db_session, "resumed-job", "completed")
+    
+    def test_get_missing_job(self, job_service, db_session):
+        """Test that an unknown job ID raises 404."""
+        from fastapi import HTTPException
+        
+        with pytest.raises(HTTPException) as exc_info:
+            job_service.get_job(db_session, "missing")
+        
+        assert exc_info.value.status_code == 404
+
+
+class TestSummaryJobsAPI:
+    """Test cases for the summary jobs endpoints."""
+    
+    def test_create_and_poll_job(self, client: TestClient, job_service):
+        """Test that the job endpoint returns an ID immediately and the result later."""
+        app.dependency_overrides[get_summary_job_service] = lambda: job_service
+        
+        response = client.post("/api/v1/ai/summarize/jobs", json=REQUEST_BODY)
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            job = client.get(f"/api/v1/ai/summarize/jobs/{job_id}").json()
+            if job["status"] == "completed":
+                break
+            time.sleep(0.02)
+        
+        assert job["summary"] == "Students described photosynthesis"
+        assert client.get("/api/v1/ai/summarize/jobs/missing").status_code == 404
+
+
+class TestPrecomputeOnClose:
+    """Test cases for the summary precomputed when a question closes."""
+    
+    @pytest.fixture
+    def setup(self, db_session, session_factory, monkeypatch):
+        """Summary services on the test database with a stubbed AI provider."""
+        summarizer = AISummarizationService()
+        summarizer.config = AIConfig()
+        summarizer.config.OPENAI_API_KEY = "test-key"
+        prompts = []
+        monkeypatch.setattr(
+            summarizer, "_make_openai_request",
+            lambda messages, json_response=False, **kwargs: prompts.append(messages) or f"summary v{len(prompts)}"
+        )
+        job_service = SummaryJobService(summarizer, session_factory=session_factory, max_workers=1)
+        summary_service = QuestionSummaryService(summarizer, job_service=job_service)
+        events.subscribe(QUESTION_CLOSED, summary_service.precompute_summary)
+        
+        question = QuestionRepository().create(db_session, {
+            "title": "Photosynthesis", "text": "What is photosynthesis?", "access_code": "PRE1", "is_closed": 0
+        })
+        AnswerRepository().upsert(db_session, {"question_id": question.id, "student_id": "STU1001", "text": "Light to energy"})
+        
+        yield summary_service, job_service, prompts, question.id
+        
+        events.unsubscribe(QUESTION_CLOSED, summary_service.precompute_summary)
+        job_service.shutdown(wait=True)
+    
+    def test_close_stores_summary_served_without_upstream(self, setup, db_session):
+        """Test that closing queues the default summary and the first view reuses it."""
+        summary_service, job_service, prompts, question_id = setup
+        
+        QuestionService(QuestionRepository()).close_question(db_session, question_id)
+        
+        jobs = job_service.job_repo.get_by_statuses(db_session, ["pending", "running", "completed"])
+        assert len(jobs) == 1
+        wait_for_status(job_service, db_session, jobs[0].id, "completed")
+        db_session.expire_all()
+        
+        result = summary_service.summarize_question(
+            db_session, question_id, summary_service.summarization_service.config.AI_DEFAULT_SUMMARY_INSTRUCTIONS
+        )
+        
+        assert result["summary"] == "summary v1"
+        assert len(prompts) == 1
+    
+    def test_view_during_precompute_shares_the_stored_summary(self, setup, db_session, monkeypatch):
+        """Test that viewing a summary while the close job is still generating it waits for that job."""
+        summary_service, job_service, _, question_id = setup
+        summarizer = summary_service.summarization_service
+        started = threading.Event()
+        prompts = []
+        
+        def slow_request(messages, json_response=False, **kwargs):
+            prompts.append(messages)
+            started.set()
+            time.sleep(0.3)
+            return "precomputed summary"
+        
+        monkeypatch.setattr(summarizer, "_make_openai_request", slow_request)
+        
+        QuestionService(QuestionRepository()).close_question(db_session, question_id)
+        assert started.wait(5)
+        result = summary_service.summarize_question(db_session, question_id, summarizer.config.AI_DEFAULT_SUMMARY_INSTRUCTIONS)
+        
+        job = job_service.job_repo.get_by_statuses(db_session, ["pending", "running", "completed", "failed"])[0]
+        job = wait_for_status(job_service, db_session, job.id, "completed")
+        assert result["summary"] == job["summary"] == "precomputed summary"
+        assert len(prompts) == 1
+        assert len(summarizer.summary_repo.get_all(db_session)) == 1
+    
+    def test_deleting_the_question_drops_a_running_job_and_its_summary(self, setup, db_session, monkeypatch):
+        """Test that a job still running when its question is deleted leaves no stored summary behind."""
+        summary_service, job_service, _, question_id = setup
+        summarizer = summary_service.summarization_service
+        started, release = threading.Event(), threading.Event()
+        
+        def slow_request(messages, json_response=False, **kwargs):
+            started.set()
+            release.wait(5)
+            return "summary of a deleted question"
+        
+        monkeypatch.setattr(summarizer, "_make_openai_request", slow_request)
+        
+        QuestionService(QuestionRepository()).close_question(db_session, question_id)
+        assert started.wait(5)
+        summary_service.forget_question(db_session, question_id)
+        release.set()
+        job_service.shutdown(wait=True)
+        
+        assert job_service.job_repo.get_all(db_session) == []
+        assert summarizer.summary_repo.get_all(db_session) == []
+    
+    def test_other_instructions_regenerate(self, setup, db_session):
+        """Test that instructions not precomputed trigger a new summary."""
+        summary_service, job_service, prompts, question_id = setup
+        
+        QuestionService(QuestionRepository()).close_question(db_session, question_id)
+        job = job_service.job_repo.get_by_statuses(db_session, ["pending", "running", "completed"])[0]
+        wait_for_status(job_service, db_session, job.id, "completed")
+        
+        result = summary_service.summarize_question(db_session, question_id, "List misconceptions only")
+        
+        assert result["summary"] == "summary v2"
+        assert len(prompts) == 2
+    
+    def test_question_without_answers_is_skipped(self, setup, db_session):
+        """Test that closing an unanswered question queues nothing."""
+        summary_service, job_service, prompts, _ = setup
+        question = QuestionRepository().create(db_session, {
+            "title": "Empty", "text": "Nobody answered", "access_code": "PRE2", "is_closed": 0
+        })
+        
+        assert summary_service.precompute_summary(db_session, question.id) is None
@@ -0,0 +1,178 @@
+"""
+Tests for the startup cache warm-up, the readiness endpoint and the caches it fills.
+"""
+
+import asyncio
+import threading
+import pytest
+
+try:
+    from app import main
+    from app.api.dependencies import container
+    from app.database.models.question import Question
+    from app.utils.warmup import WarmUp
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app import main
+    from app.api.dependencies import container
+    from app.database.models.question import Question
+    from app.utils.warmup import WarmUp
+
+
+def create_question(client, access_code, text="What do plants need to grow?"):
+    """Create a question through the API and return its ID."""
+    response = client.post("/api/v1/questions/open", json={"title": "Q", "text": text, "access_code": access_code})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+class TestWarmUp:
+    """Test cases for running the preload tasks."""
+
+    def test_tasks_run_in_parallel(self):
+        """Test that each task runs in its own thread, so the slowest one bounds the warm-up."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def task(items):
+            def run():
+                barrier.wait()
+                return items
+            return run
+
+        warm_up = WarmUp({"a": task(1), "b": task(2)})
+
+        status = asyncio.run(warm_up.run())
+
+        assert status["ready"]
+        assert {name: task["items"] for name, task in status["tasks"].items()} == {"a": 1, "b": 2}
+        assert all(task["duration_ms"] >= 0 for task in status["tasks"].values())
+
+    def test_failed_task_is_reported_without_blocking_readiness(self):
+        """Test that a failing preload is reported and the instance still becomes ready."""
+        def fail():
+            raise RuntimeError("database unavailable")
+
+        warm_up = WarmUp({"roster": lambda: 3, "search_index": fail})
+        status = asyncio.run(warm_up.run())
+
+        assert status["ready"]
+        assert status["tasks"]["search_index"] == {
+            "status": WarmUp.FAILED, "error": "database unavailable",
+            "duration_ms": status["tasks"]["search_index"]["duration_ms"]
+        }
+        assert "roster" in warm_up.format() and "failed" in warm_up.format()
+
+    def test_status_before_running(self):
+        """Test that tasks are pending and the instance not ready before the warm-up."""
+        status = WarmUp({"roster": lambda: 0}).status()
+
+        assert status == {"ready": False, "duration_ms": None, "tasks": {"roster": {"status": WarmUp.PENDING}}}
+
+    def test_container_tasks_fill_the_caches(self, client, session_factory):
+        """Test that the application's preloads load the roster, open questions and search index."""
+        create_question(client, "WARM1")
+        closed_id = create_question(client, "WARM2", "Why is the sky blue?")
+        client.patch(f"/api/v1/questions/{closed_id}/close")
+
+        status = asyncio.run(WarmUp(container.warm_up_tasks(session_factory)).run())
+
+        items = {name: task["items"] for name, task in status["tasks"].items()}
+        assert items["roster"] == len(container.student_service.get_all_students())
+        assert items["open_questions"] == 1
+        assert items["search_index"] == 2
+        assert list(container.question_service._open_by_code[1]) == ["WARM1"]
+
+
+class TestReadinessEndpoint:
+    """Test cases for /ready."""
+
+    def test_not_ready_until_warm_up_completes(self, client, session_factory, monkeypatch):
+        """Test that /ready answers 503 before the warm-up and 200 with its timings afterwards."""
+        warm_up = WarmUp(container.warm_up_tasks(session_factory))
+        monkeypatch.setattr(main, "warm_up", warm_up)
+
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "warming_up"
+        assert client.get("/health").json()["status"] == "healthy"
+
+        asyncio.run(warm_up.run())
+
+        response = client.get("/ready")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "ready"
+        assert set(body["tasks"]) == {"roster", "open_questions", "search_index"}
+        assert body["duration_ms"] >= 0
+
+
+class TestOpenQuestionCache:
+    """Test cases for the access code cache used by answer submissions."""
+
+    def test_lookup_is_served_from_the_cache(self, client, db_session, monkeypatch):
+        """Test that a preloaded open question is found without querying the database."""
+        create_question(client, "CACHE1")
+        service = container.question_service
+        service.preload_open_questions(db_session)
+
+        monkeypatch.setattr(service.question_repo, "get_by_access_code",
+                            lambda *args: pytest.fail("database queried"))
+
+        assert service.get_question_by_code(db_session, "CACHE1")["access_code"] == "CACHE1"
+
+    def test_closing_a_question_invalidates_the_cache(self, client, db_session):
+        """Test that a closed question is no longer accepted once closed."""
+        question_id = create_question(client, "CACHE2")
+        container.question_service.preload_open_questions(db_session)
+
+        client.patch(f"/api/v1/questions/{question_id}/close")
+        response = client.post("/api/v1/answers/submit", json={
+            "access_code": "CACHE2", "student_id": "STU1002", "answer_text": "Sunlight"
+        })
+
+        assert container.question_service.get_question_by_code(db_session, "CACHE2")["is_closed"]
+        assert response.status_code == 400
+
+    def test_returned_questions_are_copies(self, client, db_session):
+        """Test that callers cannot change the cached question."""
+        create_question(client, "CACHE3")
+        service = container.question_service
+        service.get_question_by_code(db_session, "CACHE3")["title"] = "Changed"
+
+        assert service.get_question_by_code(db_session, "CACHE3")["title"] == "Q"
+
+
+class TestSearchIndexCache:
+    """Test cases for the cached search index."""
+
+    def test_index_is_reused_until_the_question_bank_changes(self, client, db_session, monkeypatch):
+        """Test that searches reuse the index and a new question triggers a rebuild."""
+        create_question(client, "FIND1", "How does photosynthesis work?")
+        service = container.question_search_service
+        assert [result["id"] for result in service.search(db_session, "photosynthesis")]
+
+        calls = []
+        get_search_rows = service.question_repo.get_search_rows
+        monkeypatch.setattr(service.question_repo, "get_search_rows",
+                            lambda *args: calls.append(args) or get_search_rows(*args))
+
+        service.search(db_session, "photosynthesis")
+        assert calls == []
+
+        create_question(client, "FIND2", "Why do leaves change colour?")
+        assert len(service.search(db_session, "leaves colour")) == 1
+        assert len(calls) == 1
+
+    def test_reset_drops_the_cached_data(self, client, db_session):
+        """Test that resetting the container empties the access code and search caches."""
+        db_session.add(Question(title="Q", text="Seeded", access_code="SEED1"))
+        db_session.commit()
+        container.question_service.preload_open_questions(db_session)
+        container.question_search_service.preload(db_session)
+
+        container.reset()
+
+        assert container.question_service._open_by_code[1] == {}
+        assert container.question_search_service._indexes == {}
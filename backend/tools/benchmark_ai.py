@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Benchmark the AI endpoints against the bundled mock LLM server.
+
+Starts the mock provider and the backend (uvicorn) in-process, drives an
+endpoint with concurrent clients and reports throughput and latency
+percentiles. Example:
+
+    python tools/benchmark_ai.py --endpoint summarize --requests 200 --concurrency 16 --latency 0.3
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from tools.mock_llm_server import MockLLMServer  # noqa: E402
+
+
+def free_port() -> int:
+    """Find a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+def summarization_body(index: int, answers: int, unique: bool) -> Dict:
+    """Build a summarization request; unique requests defeat the summary cache."""
+    suffix = f" (variant {index})" if unique else ""
+    return {
+        "context": {
+            "question_id": 1,
+            "question_text": "What is photosynthesis?",
+            "summary_instructions": f"List the main ideas{suffix}"
+        },
+        "student_answers": [
+            {
+                "student_id": f"STU{i:04d}",
+                "student_name": f"Student {i}",
+                "answer_text": f"Plants turn light into chemical energy, point {i % 25}",
+                "submitted_at": "2024-01-01T10:00:00"
+            }
+            for i in range(answers)
+        ]
+    }
+
+
+def search_body(index: int, unique: bool) -> Dict:
+    """Build a smart search request."""
+    return {
+        "query": f"plants and energy {index if unique else ''}".strip(),
+        "available_questions": [{"id": i, "text": f"Question about topic {i}"} for i in range(1, 51)]
+    }
+
+
+def batch_search_body(index: int, unique: bool, queries: int = 8) -> Dict:
+    """Build a batch smart search request."""
+    body = search_body(index, unique)
+    return {
+        "queries": [f"{body['query']} part {i}" for i in range(queries)],
+        "available_questions": body["available_questions"]
+    }
+
+
+def run_request(base_url: str, endpoint: str, index: int, args) -> Tuple[float, float, int]:
+    """
+    Send one request.
+
+    Returns:
+        Total latency, time to first byte and status code
+    """
+    if endpoint == "smart-search":
+        url, body = f"{base_url}/api/v1/ai/smart-search", search_body(index, args.unique)
+    elif endpoint == "smart-search-batch":
+        url, body = f"{base_url}/api/v1/ai/smart-search/batch", batch_search_body(index, args.unique)
+    elif endpoint == "stream":
+        url, body = f"{base_url}/api/v1/ai/summarize/stream", summarization_body(index, args.answers, args.unique)
+    else:
+        url, body = f"{base_url}/api/v1/ai/summarize", summarization_body(index, args.answers, args.unique)
+
+    started = time.perf_counter()
+    try:
+        with requests.post(url, json=body, stream=True, timeout=120) as response:
+            first_byte = None
+            for _ in response.iter_content(chunk_size=None):
+                if first_byte is None:
+                    first_byte = time.perf_counter() - started
+            total = time.perf_counter() - started
+            return total, first_byte if first_byte is not None else total, response.status_code
+    except requests.exceptions.RequestException:
+        elapsed = time.perf_counter() - started
+        return elapsed, elapsed, 0
+
+
+def start_backend(port: int):
+    """Start the backend app with uvicorn on a background thread."""
+    import uvicorn
+    from app.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="backend", daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"{base_url}/health", timeout=1)
+            return server, thread, base_url
+        except requests.exceptions.RequestException:
+            time.sleep(0.1)
+    raise RuntimeError("Backend did not start")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark AI endpoints against the mock LLM server")
+    parser.add_argument("--endpoint", choices=["summarize", "stream", "smart-search", "smart-search-batch"], default="summarize")
+    parser.add_argument("--requests", type=int, default=200, help="Total requests to send")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--answers", type=int, default=100, help="Answers per summarization request")
+    parser.add_argument("--unique", action=argparse.BooleanOptionalAction, default=True,
+                        help="Make every request unique so caches and coalescing do not apply")
+    parser.add_argument("--latency", type=float, default=0.3, help="Mock provider latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Mock provider latency jitter in seconds")
+    parser.add_argument("--token-rate", type=float, default=200.0, help="Mock provider tokens per second")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Mock provider error rate")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    mock = MockLLMServer(latency=args.latency, jitter=args.jitter, token_rate=args.token_rate,
+                         error_rate=args.error_rate, seed=1)
+
+    # Configuration is read at import time, so it must be set before importing the app
+    database_dir = tempfile.mkdtemp(prefix="ai-benchmark-")
+    os.environ.update({
+        "OPENAI_BASE_URL": mock.url,
+        "OPENAI_API_KEY": "mock",
+        "DATABASE_PATH": os.path.join(database_dir, "benchmark.db"),
+        "AI_PRECOMPUTE_ON_CLOSE": "false",
+    })
+    server, thread, base_url = start_backend(free_port())
+
+    # Warm up connections and lazy initialization outside the measurement
+    run_request(base_url, args.endpoint, -1, args)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda i: run_request(base_url, args.endpoint, i, args), range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    server.should_exit = True
+    thread.join(timeout=10)
+    mock.close()
+
+    latencies = [total for total, _, status in results if status == 200]
+    first_bytes = [ttfb for _, ttfb, status in results if status == 200]
+    report = {
+        "endpoint": args.endpoint,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(args.requests / elapsed, 2) if elapsed else 0.0,
+        "status_codes": dict(Counter(status for _, _, status in results)),
+        "upstream_calls": mock.hits,
+        "latency_ms": {
+            name: round(percentile(latencies, fraction) * 1000, 1)
+            for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0))
+        },
+        "ttfb_ms": {
+            name: round(percentile(first_bytes, fraction) * 1000, 1)
+            for name, fraction in (("p50", 0.5), ("p99", 0.99))
+        },
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['endpoint']}: {report['requests']} requests, concurrency {report['concurrency']}")
+        print(f"  throughput   {report['throughput_rps']} req/s over {report['duration_s']} s")
+        print(f"  latency ms   " + "  ".join(f"{k}={v}" for k, v in report["latency_ms"].items()))
+        print(f"  ttfb ms      " + "  ".join(f"{k}={v}" for k, v in report["ttfb_ms"].items()))
+        print(f"  status codes {report['status_codes']}  upstream calls {report['upstream_calls']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
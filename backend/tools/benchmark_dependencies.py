@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-request cost of resolving the answer submission's services.
+
+Compares the previous dependencies, which built a fresh object graph on every
+request (repositories, services and a StudentService rereading the roster file),
+with the application's service container. Both variants resolve the services
+an answer submission depends on and look the student up, as the endpoint does.
+Example:
+
+    python tools/benchmark_dependencies.py --students 500 --requests 5000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from app.api.dependencies import ServiceContainer  # noqa: E402
+from app.database.repositories.answer_repository import AnswerRepository  # noqa: E402
+from app.database.repositories.question_repository import QuestionRepository  # noqa: E402
+from app.services.answer_service import AnswerService  # noqa: E402
+from app.services.question_service import QuestionService  # noqa: E402
+from app.services.student_service import StudentService  # noqa: E402
+
+
+def write_roster(directory: str, count: int) -> str:
+    """Write a roster of count students and return its path."""
+    path = os.path.join(directory, "students.json")
+    students: List[Dict] = [{"id": f"STU{i:05d}", "name": f"Student {i}"} for i in range(count)]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(students, f)
+    return path
+
+
+def per_request_graph(roster_path: str) -> Callable[[str], str]:
+    """The previous dependencies: every request builds its own services."""
+    def handle(student_id: str) -> str:
+        question_service = QuestionService(QuestionRepository())
+        student_service = StudentService(roster_path)
+        answer_service = AnswerService(AnswerRepository(), question_service, student_service)
+        assert answer_service.student_service.validate_student_id(student_id)
+        return student_service.get_student_by_id(student_id)["name"]
+    return handle
+
+
+def container_graph(roster_path: str) -> Callable[[str], str]:
+    """The service container: every request reuses the process's services."""
+    container = ServiceContainer(StudentService(roster_path))
+
+    def handle(student_id: str) -> str:
+        question_service = container.question_service
+        student_service = container.student_service
+        answer_service = container.answer_service
+        assert question_service is answer_service.question_service
+        assert answer_service.student_service.validate_student_id(student_id)
+        return student_service.get_student_by_id(student_id)["name"]
+    return handle
+
+
+def measure(handle: Callable[[str], str], student_ids: List[str], repeat: int) -> Dict[str, float]:
+    """Time a request handler over all student IDs, returning microseconds per request and allocations."""
+    handle(student_ids[0])
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for student_id in student_ids:
+            handle(student_id)
+        timings.append((time.perf_counter() - started) * 1e6 / len(student_ids))
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for student_id in student_ids[:100]:
+        handle(student_id)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename") if stat.size_diff > 0)
+    return {
+        "median_us": round(statistics.median(timings), 2),
+        "best_us": round(min(timings), 2),
+        "alloc_bytes": allocated // min(len(student_ids), 100)
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark per-request service resolution")
+    parser.add_argument("--students", type=int, default=500, help="Students in the roster")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per timed run")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per variant")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        roster_path = write_roster(directory, args.students)
+        student_ids = [f"STU{i % args.students:05d}" for i in range(args.requests)]
+        results = {
+            "per-request object graph": measure(per_request_graph(roster_path), student_ids, args.repeat),
+            "service container": measure(container_graph(roster_path), student_ids, args.repeat),
+        }
+
+    print(f"{args.students} students, {args.requests} requests per run")
+    for name, timing in results.items():
+        print(f"  {name:<26} median {timing['median_us']:>9} us/request   best {timing['best_us']:>9} us"
+              f"   ~{timing['alloc_bytes']} B retained/request")
+    speedup = results["per-request object graph"]["median_us"] / max(results["service container"]["median_us"], 1e-6)
+    print(f"  speedup {speedup:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON encoding of a large answer list response.
+
+Compares the previous path (FastAPI's jsonable_encoder followed by Starlette's
+stdlib JSONResponse) with FastJSONResponse rendering the service output directly.
+Example:
+
+    python tools/benchmark_json.py --answers 10000 --repeat 20
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from app.utils import json_response  # noqa: E402
+from app.utils.json_response import FastJSONResponse  # noqa: E402
+
+
+def answers_payload(count: int) -> Dict:
+    """Build a /questions/{id}/answers payload shaped like the service output."""
+    start = datetime(2024, 1, 1, 10, 0, 0)
+    answers: List[Dict] = [
+        {
+            "id": i,
+            "question_id": 1,
+            "student_id": f"STU{i:05d}",
+            "student_name": f"Student {i}",
+            "text": f"Plants turn light into chemical energy, point {i % 25} — with some detail",
+            "timestamp": (start + timedelta(seconds=i)).isoformat()
+        }
+        for i in range(count)
+    ]
+    question = {
+        "id": 1, "title": "Photosynthesis", "text": "What is photosynthesis?", "access_code": "PHOTO1",
+        "is_closed": True, "created_at": start.isoformat(), "close_date": None
+    }
+    return {"question": question, "answers": answers, "answer_count": len(answers)}
+
+
+def measure(encode: Callable[[], bytes], repeat: int) -> Dict[str, float]:
+    """Time an encoder, returning the median and best run in milliseconds."""
+    encode()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        encode()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": round(statistics.median(timings), 2), "best_ms": round(min(timings), 2)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark JSON encoding of answer list responses")
+    parser.add_argument("--answers", type=int, default=10000, help="Answers in the response")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per encoder")
+    args = parser.parse_args()
+
+    payload = answers_payload(args.answers)
+    baseline = JSONResponse(jsonable_encoder(payload)).body
+    fast = FastJSONResponse(payload).body
+    if baseline != fast:
+        print("Encoders disagree: responses are not wire-compatible")
+        return 1
+
+    results = {
+        "jsonable_encoder + json": measure(lambda: JSONResponse(jsonable_encoder(payload)).body, args.repeat),
+        "FastJSONResponse": measure(lambda: FastJSONResponse(payload).body, args.repeat),
+    }
+    backend = "orjson" if json_response.orjson is not None else "json (orjson not installed)"
+
+    print(f"{args.answers} answers, {len(fast) / 1024:.0f} KiB, FastJSONResponse backend: {backend}")
+    for name, timing in results.items():
+        print(f"  {name:<26} median {timing['median_ms']:>8} ms   best {timing['best_ms']:>8} ms")
+    speedup = results["jsonable_encoder + json"]["median_ms"] / max(results["FastJSONResponse"]["median_ms"], 1e-6)
+    print(f"  speedup {speedup:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
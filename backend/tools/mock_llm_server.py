@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Mock OpenAI-compatible chat completions server for load tests and benchmarks.
+
+Simulates provider latency, streaming at a fixed token rate and injected error
+rates, without network access or API costs. Point the backend at it with:
+
+    python tools/mock_llm_server.py --port 8001 --latency 0.5 --token-rate 80 --error-rate 0.02
+    OPENAI_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=mock uvicorn app.main:app
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+# Question rows in smart search prompts look like "12|question text"
+_ID_ROW_PATTERN = re.compile(r"^(\d+)\|", re.MULTILINE)
+# Query rows in batch smart search prompts look like "q1|query text"
+_QUERY_ROW_PATTERN = re.compile(r"^q(\d+)\|", re.MULTILINE)
+
+
+class MockLLMServer:
+    """In-process mock of the chat completions API.
+
+    Faults come from two sources: an optional script of (status, headers)
+    responses replayed first, then random errors at error_rate.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 token_rate: float = 0.0, reply_tokens: int = 40, reply: Optional[str] = None, error_rate: float = 0.0,
+                 error_status: int = 503, retry_after: Optional[float] = None, seed: Optional[int] = None):
+        """
+        Initialize and start the server on a background thread.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind; 0 picks a free port
+            latency: Seconds before the first token
+            jitter: Maximum extra random latency in seconds
+            token_rate: Generated tokens per second; 0 sends the whole reply at once
+            reply_tokens: Number of tokens (words) in each generated reply
+            reply: Fixed reply text for non-JSON requests, instead of generated words
+            error_rate: Fraction of requests failing with error_status
+            error_status: Status code of injected errors
+            retry_after: Retry-After seconds sent with injected errors, if any
+            seed: Random seed for reproducible error and jitter sequences
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.token_rate = token_rate
+        self.reply_tokens = reply_tokens
+        self.reply = reply
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.script: List[Tuple[int, Dict[str, str]]] = []
+        self.hits = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.url = f"http://{host}:{self.httpd.server_address[1]}/v1"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-llm", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop the server."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _next_outcome(self) -> Tuple[int, Dict[str, str], float]:
+        """Pick the status, headers and delay of the next response."""
+        with self._lock:
+            self.hits += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            if self.script:
+                status, headers = self.script.pop(0)
+                return status, headers, delay
+            if self.error_rate and self._random.random() < self.error_rate:
+                headers = {"Retry-After": str(self.retry_after)} if self.retry_after is not None else {}
+                return self.error_status, headers, delay
+            return 200, {}, delay
+
+    def _reply(self, body: dict) -> str:
+        """Generate the reply content for a request."""
+        prompt = "\n".join(str(message.get("content", "")) for message in body.get("messages", []))
+        if (body.get("response_format") or {}).get("type") == "json_object":
+            ids = [int(match) for match in _ID_ROW_PATTERN.findall(prompt)][:3]
+            queries = _QUERY_ROW_PATTERN.findall(prompt)
+            if queries:
+                return json.dumps({"results": {f"q{number}": ids for number in queries}})
+            return json.dumps({"matching_question_ids": ids})
+        if self.reply is not None:
+            return self.reply
+        words = ["Students", "mostly", "agreed", "on", "the", "main", "idea", "while", "a", "few", "differed."]
+        return " ".join(words[i % len(words)] for i in range(self.reply_tokens))
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if self.path.rstrip("/") == "/health":
+                    self._send_json(200, {"status": "ok", "hits": server.hits})
+                else:
+                    self._send_json(404, {"error": {"message": "Not found"}})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                raw = self.rfile.read(length) if length else b""
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": "Not found"}})
+                    return
+                try:
+                    body = json.loads(raw or b"{}")
+                except json.JSONDecodeError:
+                    self._send_json(400, {"error": {"message": "Invalid JSON"}})
+                    return
+
+                status, headers, delay = server._next_outcome()
+                if delay:
+                    time.sleep(delay)
+                if status != 200:
+                    self._send_json(status, {"error": {"message": "Injected failure"}}, headers)
+                    return
+
+                content = server._reply(body)
+                if body.get("stream"):
+                    self._stream(body, content)
+                else:
+                    if server.token_rate:
+                        time.sleep(len(content.split()) / server.token_rate)
+                    self._send_json(200, {
+                        "id": "chatcmpl-mock",
+                        "object": "chat.completion",
+                        "model": body.get("model", "mock"),
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                        "usage": {"completion_tokens": len(content.split())}
+                    })
+
+            def _stream(self, body: dict, content: str):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                interval = 1 / server.token_rate if server.token_rate else 0
+                try:
+                    for index, word in enumerate(content.split(" ")):
+                        chunk = {
+                            "id": "chatcmpl-mock",
+                            "object": "chat.completion.chunk",
+                            "model": body.get("model", "mock"),
+                            "choices": [{"index": 0, "delta": {"content": word if index == 0 else f" {word}"}}]
+                        }
+                        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                        self.wfile.flush()
+                        if interval:
+                            time.sleep(interval)
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client cancelled the stream
+                    pass
+
+            def _send_json(self, status: int, payload: dict, headers: Optional[Dict[str, str]] = None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main() -> None:
+    """Run the mock server from the command line."""
+    parser = argparse.ArgumentParser(description="Mock OpenAI-compatible chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds before the first token")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Maximum extra random latency in seconds")
+    parser.add_argument("--token-rate", type=float, default=80.0, help="Tokens per second (0 = instant)")
+    parser.add_argument("--reply-tokens", type=int, default=40, help="Tokens per reply")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503, help="Status code of injected failures")
+    parser.add_argument("--retry-after", type=float, default=None, help="Retry-After seconds on injected failures")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = MockLLMServer(
+        host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+        token_rate=args.token_rate, reply_tokens=args.reply_tokens, error_rate=args.error_rate,
+        error_status=args.error_status, retry_after=args.retry_after, seed=args.seed
+    )
+    print(f"Mock LLM server listening on {server.url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
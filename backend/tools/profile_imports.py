@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Profile the import time of the application.
+
+Runs `python -X importtime -c "import app.main"` in a fresh interpreter, as a new
+worker would, and lists the slowest imports so a cold-start regression can be
+traced to the module that caused it. Example:
+
+    python tools/profile_imports.py --top 25
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries only some requests need; importing the application must not load them
+DEFERRED_MODULES = ("numpy", "requests", "tiktoken")
+
+
+class ImportRecord(NamedTuple):
+    """One line of -X importtime output."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """
+    Parse -X importtime output.
+
+    Args:
+        output: The interpreter's stderr
+
+    Returns:
+        One record per imported module, in completion order
+    """
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # The header line
+        name = fields[2].rstrip()
+        module = name.lstrip()
+        records.append(ImportRecord(module, int(fields[0]), int(fields[1]), (len(name) - len(module)) // 2))
+    return records
+
+
+def profile_imports(module: str = "app.main", env: Optional[Dict[str, str]] = None) -> Tuple[List[ImportRecord], str]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Args:
+        module: Module to import
+        env: Environment of the interpreter (defaults to this process's)
+
+    Returns:
+        The import records and anything the import printed to stdout
+
+    Raises:
+        RuntimeError: If the import fails
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr), result.stdout
+
+
+def app_self_us(records: List[ImportRecord]) -> int:
+    """Total time spent in the application's own modules, excluding their dependencies."""
+    return sum(record.self_us for record in records if record.module == "app" or record.module.startswith("app."))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Profile the application's import time")
+    parser.add_argument("--module", default="app.main", help="Module to import")
+    parser.add_argument("--top", type=int, default=20, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    records, _ = profile_imports(args.module)
+    total = next((record.cumulative_us for record in records if record.module == args.module), 0)
+    print(f"import {args.module}: {total / 1000:.0f} ms, of which {app_self_us(records) / 1000:.0f} ms in app modules")
+
+    print("\nSlowest top-level imports (cumulative):")
+    top_level = sorted((record for record in records if record.depth == 1), key=lambda record: -record.cumulative_us)
+    for record in top_level[:args.top]:
+        print(f"  {record.cumulative_us / 1000:>8.1f} ms  {record.module}")
+
+    print("\nSlowest modules (self):")
+    for record in sorted(records, key=lambda record: -record.self_us)[:args.top]:
+        print(f"  {record.self_us / 1000:>8.1f} ms  {record.module}")
+
+    loaded = sorted({record.module.split(".")[0] for record in records} & set(DEFERRED_MODULES))
+    if loaded:
+        print(f"\nDeferred libraries imported at startup: {', '.join(loaded)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())